@@ -3,69 +3,261 @@
 import argparse
 import logging
 import unittest
-import importlib
+import os
+import sys
 import time
-from tests.test_general import GeneralGraphTestCase
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
 # from dipper.utils.TestUtils import TestUtils
-from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils import Compression
+from dipper import source_registry
 
 logging.basicConfig()
 LOG = logging.getLogger(__name__)
 
-TEST_SUITE = unittest.TestLoader().loadTestsFromTestCase(GeneralGraphTestCase)
+LOG_FORMAT = '%(asctime)s %(levelname)s:%(name)s:%(message)s'
+
+# a source run ending in any other status counts as a failure
+SUCCESS = ('ok', 'unchanged')
+
+SPECIES_SPECIFIC = [
+    'Panther', 'NCBIGene', 'BioGrid', 'UCSCBands',
+    'GeneOntology', 'Bgee', 'StringDB', 'Ensembl']
+
+
+def run_source(source, args, tax_ids=None, stats=None):
+    """
+    Fetch, parse, write and (optionally) test a single source
+    with the options parsed by dipper-etl.py
+
+    :param source: str name of the source, see dipper.source_registry
+    :param args: argparse.Namespace as parsed in main()
+    :param tax_ids: list of NCBITaxon numbers (as str) to constrain to
+    :param stats: optional dict to collect triple counts and timings in
+    :return: stats dict
+    """
+    if stats is None:
+        stats = {}
+    LOG.info("\n******* %s *******", source)
+    source = source.lower()
+    # import source lib, and no other
+    source_class = source_registry.get_class(source)
+    src = source_class.__name__
+    mysource = None
+
+    LOG.info(
+        'Command line arguments available to dipper-etl:\n%s',
+        "\n".join(['\t{}: {}'.format(k, v) for k, v in vars(args).items()]))
+
+    source_args = dict(graph_type=args.graph)
+    source_args['are_bnodes_skolemized'] = not args.use_bnodes
+    if src in SPECIES_SPECIFIC:
+        source_args['tax_ids'] = tax_ids
+    if args.version:
+        source_args['version'] = args.version
+    if args.data_release_version:
+        source_args['data_release_version'] = args.data_release_version
+    # cli args are available to the source, i.e. the output format and
+    # compression in the dataset description made as it is constructed
+    source_args['argv'] = vars(args)
+
+    mysource = source_class(**source_args)
+
+    if args.parse_only is False:
+        start_fetch = time.perf_counter()
+        mysource.fetch(args.force)
+
+        end_fetch = time.perf_counter()
+        stats['fetch'] = end_fetch - start_fetch
+        LOG.info("Fetching time: %d sec", end_fetch - start_fetch)
+
+    mysource.settestonly(args.test_only)
+
+    # what besides the inputs the output depends on
+    params = {
+        key: vars(args).get(key) for key in (
+            'graph', 'limit', 'taxon', 'use_bnodes', 'version',
+            'data_release_version', 'compress', 'keep_shards')}
+
+    if args.incremental and args.test_only is False and args.fetch_only is False \
+            and mysource.inputs_unchanged(args.dest_fmt, params):
+        stats['status'] = 'unchanged'
+        stats['triples'] = mysource.triple_count
+        LOG.info(
+            "Inputs unchanged, reusing %s", mysource.outfile_name(args.dest_fmt))
+
+    # create source ingest graph first (with pristine arguments)
+    elif args.test_only is False and args.fetch_only is False:
+        start_parse = time.perf_counter()
+        mysource.parse(args.limit)
+
+        end_parse = time.perf_counter()
+        stats['parse'] = end_parse - start_parse
+        LOG.info("Parsing time: %d sec", end_parse - start_parse)
+
+        stats['triples'] = len(mysource.graph)
+        LOG.info("Found %d nodes", len(mysource.graph))
+        LOG.info("CURIE expansion cache: %s", mysource.graph.curie_util.cache_info())
+
+        if args.graph == 'rdf_graph':
+            from dipper.utils.GraphUtils import GraphUtils
+            # Add property axioms
+            start_axiom_exp = time.perf_counter()
+            LOG.info("Adding property axioms")
+
+            properties = GraphUtils.get_properties_from_graph(mysource.graph)
+            GraphUtils.add_property_axioms(
+                mysource.graph, properties, args.offline_axioms)
+            LOG.info(
+                "Property axioms added: %d sec",
+                time.perf_counter() - start_axiom_exp)
+        # property axioms need the whole graph, a streamed_graph goes without
+
+        start_write = time.perf_counter()
+        mysource.write(fmt=args.dest_fmt)
+        stats['write'] = time.perf_counter() - start_write
+        LOG.info("Writing time: %d sec", time.perf_counter() - start_write)
+        if args.incremental:
+            mysource.save_inputs(args.dest_fmt, params)
+
+    # '*_test.ttl' graphs if requested
+    if (args.no_verify or args.skip_tests) is False:
+        suite = mysource.getTestSuite()
+        if suite is None:
+            LOG.warning("No tests configured for this source: %s", source)
+        else:
+            unittest.TextTestRunner(verbosity=2).run(suite)
+    else:
+        LOG.info("Skipping Tests for source: %s", source)
+
+    LOG.info('***** Finished with %s *****', source)
+
+    return stats
+
+
+def run_source_job(source, args, tax_ids=None):
+    """
+    Worker process entry point for `--jobs`.
+    Everything the source logs or prints goes to its own
+    '<log_dir>/<source>.log' and failures are reported rather than raised,
+    so one broken ingest does not take the pool down with it.
+
+    :return: dict summarizing the run
+    """
+    stats = {
+        'source': source, 'status': 'ok', 'triples': None,
+        'fetch': None, 'parse': None, 'write': None, 'total': None,
+        'error': None,
+        'log': os.path.join(args.log_dir, source.lower() + '.log')}
+
+    # pool workers are reused; drop whatever the previous job attached
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    start = time.perf_counter()
+    with open(stats['log'], 'w') as log_file, \
+            redirect_stdout(log_file), redirect_stderr(log_file):
+        handler = logging.StreamHandler(log_file)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root_logger.addHandler(handler)
+        try:
+            run_source(source, args, tax_ids, stats)
+        except Exception as err:  # report it in the summary, whatever it is
+            LOG.exception("%s failed", source)
+            stats['status'] = 'failed'
+            stats['error'] = repr(err)
+        except SystemExit as err:  # some ingests still call exit()
+            LOG.error("%s exited with %s", source, err.code)
+            stats['status'] = 'failed'
+            stats['error'] = 'exit({})'.format(err.code)
+        finally:
+            root_logger.removeHandler(handler)
+    stats['total'] = time.perf_counter() - start
+
+    return stats
+
+
+def run_sources_parallel(sources, args, tax_ids=None):
+    """
+    Run each source in its own worker process, `args.jobs` at a time.
+    With `args.keep_going` unset, sources not yet started
+    are cancelled as soon as any one of them fails.
+
+    :return: list of summary dicts, one per source, in the order requested
+    """
+    if not os.path.exists(args.log_dir):
+        os.makedirs(args.log_dir)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(run_source_job, source, args, tax_ids): source
+            for source in sources}
+        for future in as_completed(futures):
+            source = futures[future]
+            if future.cancelled():
+                continue
+            stats = future.result()
+            results[source] = stats
+            LOG.info(
+                "%s %s in %d sec (log: %s)",
+                source, stats['status'], stats['total'], stats['log'])
+            if stats['status'] not in SUCCESS and not args.keep_going:
+                LOG.error("Stopping after failure of %s", source)
+                for pending in futures:
+                    pending.cancel()
+
+    for source in sources:
+        if source not in results:
+            results[source] = {
+                'source': source, 'status': 'cancelled', 'triples': None,
+                'fetch': None, 'parse': None, 'write': None, 'total': None,
+                'error': None, 'log': None}
+
+    return [results[source] for source in sources]
+
+
+def format_summary(results):
+    """
+    Tabulate exit status, triple counts and timings per source
+    :param results: list of dicts as returned by run_source_job()
+    :return: str
+    """
+    def _secs(val):
+        return '-' if val is None else '{:.0f}'.format(val)
+
+    header = ('source', 'status', 'triples', 'fetch', 'parse', 'write', 'total')
+    rows = [header]
+    for stats in results:
+        rows.append((
+            stats['source'],
+            stats['status'],
+            '-' if stats['triples'] is None else str(stats['triples']),
+            _secs(stats['fetch']),
+            _secs(stats['parse']),
+            _secs(stats['write']),
+            _secs(stats['total'])))
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    lines = [
+        '  '.join(cell.ljust(widths[col]) for col, cell in enumerate(row)).rstrip()
+        for row in rows]
+    for stats in results:
+        if stats['error'] is not None:
+            lines.append('{}: {}'.format(stats['source'], stats['error']))
+
+    return '\n'.join(lines)
 
 
 def main():
-    # TODO this should be generated by looking in the dipper/sources directory
-    source_to_class_map = {
-        # 'facebase_alpha': 'FaceBase_alpha',
-        'hpoa': 'HPOAnnotations',
-        'zfin': 'ZFIN',
-        'omim': 'OMIM',
-        'biogrid': 'BioGrid',
-        'mgi': 'MGI',
-        'impc': 'IMPC',
-        'panther': 'Panther',
-        'ncbigene': 'NCBIGene',
-        'ucscbands': 'UCSCBands',
-        'ctd': 'CTD',
-        'genereviews': 'GeneReviews',
-        'eom': 'EOM',
-        'coriell': 'Coriell',
-        # 'clinvar': 'ClinVar',      # needs integrating here
-        'monochrom': 'Monochrom',
-        'kegg': 'KEGG',
-        'animalqtldb': 'AnimalQTLdb',
-        'ensembl': 'Ensembl',
-        'hgnc': 'HGNC',
-        'orphanet': 'Orphanet',
-        'omia': 'OMIA',
-        'flybase': 'FlyBase',
-        'mmrrc': 'MMRRC',
-        'wormbase': 'WormBase',
-        'mpd': 'MPD',
-        'gwascatalog': 'GWASCatalog',
-        'monarch': 'Monarch',
-        'go': 'GeneOntology',
-        'reactome': 'Reactome',
-        'udp': 'UDP',
-        'mgislim': 'MGISlim',
-        'zfinslim': 'ZFINSlim',
-        'bgee': 'Bgee',
-        'mydrug': 'MyDrug',
-        'stringdb': 'StringDB',
-        'rgd': 'RGD',
-        'sgd': 'SGD',
-        'mychem': 'MyChem',
-        'ebi': 'EBIGene2Phen',
-    }
 
     parser = argparse.ArgumentParser(
         description='Dipper: Data Ingestion Pipeline for Monarch',
         formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument(
         '-g', '--graph', type=str, default="rdf_graph",
-        help='graph type: rdf_graph, streamed_graph')
+        help='graph type: rdf_graph, streamed_graph\n'
+        'streamed_graph keeps triples on disk and writes turtle, nt or nquads')
     parser.add_argument(
         '-s', '--sources', type=str, default='?',
         help='comma separated list of sources')
@@ -124,15 +316,46 @@ def main():
         ''',
         type=str)
 
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of sources to process in parallel, each in its own process')
+    parser.add_argument(
+        '--keep_going', action='store_true',
+        help='with --jobs, keep running the other sources when one fails')
+    parser.add_argument(
+        '--log_dir', type=str, default='out/log',
+        help='with --jobs, directory for the per source log files')
+
+    parser.add_argument(
+        '--parse_jobs', type=int, default=1,
+        help='worker processes a source may parse with, where it can (mgi)')
+    parser.add_argument(
+        '--write_jobs', type=int, default=1,
+        help='worker processes to write nt or nquads output with,\n'
+        'each serializing the triples of a share of the subjects')
+    parser.add_argument(
+        '--keep_shards', action='store_true',
+        help='with --write_jobs, leave the output as the per worker files\n'
+        'and a MANIFEST.json in out/<source>.<ext>.d/ rather than one file')
+    parser.add_argument(
+        '--compress', choices=sorted(Compression.EXTENSIONS),
+        help='compress the main output as it is written, by a pool of threads\n'
+        '(zstd needs the zstandard package)')
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='reuse the existing output of a source when its raw files,\n'
+        'translation tables and the dipper version are unchanged since it was written')
+
+    parser.add_argument(
+        '--offline_axioms', action='store_true',
+        help='add property axioms from the local ontology index\n'
+        'without checking the ontologies for new versions')
+
     args = parser.parse_args()
     tax_ids = None
     if args.taxon is not None:
         tax_ids = [str(t) for t in args.taxon.split(',') if t.isdigit()]
 
-    species_specific = [
-        'Panther', 'NCBIGene', 'BioGrid', 'UCSCBands',
-        'GeneOntology', 'Bgee', 'StringDB', 'Ensembl']
-
     formats_supported = [
         'turtle', 'ttl',
         'ntriples', 'nt',
@@ -168,10 +391,6 @@ def main():
     #    print(test_query.query_graph(args.query, True))
     #    exit(0)
 
-    # run initial tests
-    if (args.no_verify or args.skip_tests) is not True:
-        unittest.TextTestRunner(verbosity=2).run(TEST_SUITE)
-
     # set serializer
     if args.dest_fmt is not None:
         if args.dest_fmt in formats_supported:
@@ -191,93 +410,43 @@ def main():
     else:
         args.dest_fmt = 'turtle'
 
+    if args.compress is not None and not Compression.available(args.compress):
+        LOG.error("%s compression needs the zstandard package", args.compress)
+        exit(1)
+
     # Provide feedback if we can't proceed
-    if args.sources is None or args.sources.split(',')[0] not in source_to_class_map:
-        LOG.info('Unknown Source %s', args.sources.split(',')[0])
+    sources = (args.sources or '?').split(',')
+    unknown = [src for src in sources if src.lower() not in source_registry.sources()]
+    if unknown:
+        LOG.info('Unknown Source %s', ','.join(unknown))
         LOG.info('Sources Known are limited to:')
-        for key in sorted(source_to_class_map):
-            LOG.info('\t%s\t%s', key, source_to_class_map[key])
+        for (src, key) in sorted(
+                source_registry.ingest_names().items(), key=lambda item: item[1]):
+            LOG.info('\t%s\t%s', key, src)
         exit(0)
 
-    # iterate through all the sources
-    for source in args.sources.split(','):
-        LOG.info("\n******* %s *******", source)
-        source = source.lower()
-        src = source_to_class_map[source]
-
-        # import source lib
-        module = "dipper.sources.{0}".format(src)
-        imported_module = importlib.import_module(module)
-        source_class = getattr(imported_module, src)
-        mysource = None
-
-        LOG.info(
-            'Command line arguments available to dipper-etl:\n%s',
-            "\n".join(['\t{}: {}'.format(k, v) for k, v in vars(args).items()]))
-
-        source_args = dict(graph_type=args.graph)
-        source_args['are_bnodes_skolemized'] = not args.use_bnodes
-        if src in species_specific:
-            source_args['tax_ids'] = tax_ids
-        if args.version:
-            source_args['version'] = args.version
-        if args.data_release_version:
-            source_args['data_release_version'] = args.data_release_version
-
-        mysource = source_class(**source_args)
-
-        # WIP cli args should be available to source
-        if hasattr(mysource, 'ARGV'):
-            mysource.ARGV = vars(args)
-        else:
-            LOG.error('no where to to put args in %s', mysource.__class__)
-
-        if args.parse_only is False:
-            start_fetch = time.perf_counter()
-            mysource.fetch(args.force)
-
-            end_fetch = time.perf_counter()
-            LOG.info("Fetching time: %d sec", end_fetch - start_fetch)
-
-        mysource.settestonly(args.test_only)
-
-        # create source ingest graph first (with pristine arguments)
-        if args.test_only is False and args.fetch_only is False:
-            start_parse = time.perf_counter()
-            mysource.parse(args.limit)
-
-            end_parse = time.perf_counter()
-            LOG.info("Parsing time: %d sec", end_parse - start_parse)
-
-            if args.graph == 'rdf_graph':
-                LOG.info("Found %d nodes", len(mysource.graph))
-
-                # Add property axioms
-                start_axiom_exp = time.perf_counter()
-                LOG.info("Adding property axioms")
-
-                properties = GraphUtils.get_properties_from_graph(mysource.graph)
-                GraphUtils.add_property_axioms(mysource.graph, properties)
-                LOG.info(
-                    "Property axioms added: %d sec",
-                    time.perf_counter() - start_axiom_exp)
-
-                start_write = time.perf_counter()
-                mysource.write(fmt=args.dest_fmt)
-                LOG.info("Writing time: %d sec", time.perf_counter() - start_write)
-            # elif args.graph == 'streamed_graph': ...
-
-        # '*_test.ttl' graphs if requested
-        if (args.no_verify or args.skip_tests) is False:
-            suite = mysource.getTestSuite()
-            if suite is None:
-                LOG.warning("No tests configured for this source: %s", source)
-            else:
-                unittest.TextTestRunner(verbosity=2).run(suite)
-        else:
-            LOG.info("Skipping Tests for source: %s", source)
+    # run initial tests
+    if (args.no_verify or args.skip_tests) is not True:
+        from tests.test_general import GeneralGraphTestCase
+        unittest.TextTestRunner(verbosity=2).run(
+            unittest.TestLoader().loadTestsFromTestCase(GeneralGraphTestCase))
+
+    if args.jobs > 1:
+        if args.graph == 'rdf_graph':
+            from dipper.utils.GraphUtils import GraphUtils
+            # bring the property index up to date once, the sources read it from disk
+            GraphUtils.get_property_types(args.offline_axioms)
+            args.offline_axioms = True
+        results = run_sources_parallel(sources, args, tax_ids)
+        print(format_summary(results))
+        LOG.info("All done.")
+        if any(stats['status'] not in SUCCESS for stats in results):
+            sys.exit(1)
+        return
 
-        LOG.info('***** Finished with %s *****', source)
+    # iterate through all the sources
+    for source in sources:
+        run_source(source, args, tax_ids)
 
     LOG.info("All done.")
 
@@ -1,2 +1,4 @@
 from pkgutil import extend_path
 __path__ = extend_path(__path__, __name__)
+
+__version__ = '0.2.3'  # keep in step with setup.py
@@ -7,7 +7,9 @@
 '''
 import os.path
 import logging
-import yaml
+
+from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils import TableSnapshot
 
 __author__ = 'nicole'
 
@@ -17,14 +19,22 @@ LOG = logging.getLogger(__name__)
 curie_map = None
 
 if os.path.exists(os.path.join(os.path.dirname(__file__), 'curie_map.yaml')):
-    with open(os.path.join(os.path.dirname(__file__), 'curie_map.yaml')) as yaml_file:
-        curie_map = yaml.safe_load(yaml_file)
-        LOG.debug("Finished loading curie maps: %s", curie_map)
+    curie_map = TableSnapshot.load_yaml(
+        os.path.join(os.path.dirname(__file__), 'curie_map.yaml'))
+    LOG.debug("Finished loading curie maps: %s", curie_map)
 else:
     LOG.debug("Cannot find 'curie_map.yaml' in  %s", os.path.dirname(__file__))
 
+# one CurieUtil (and so one CURIE expansion cache) shared by all graphs
+curie_util = CurieUtil(curie_map)
+
+
 def get():
     return curie_map
 
+
+def get_curie_util():
+    return curie_util
+
 def get_base():
     return curie_map['']
@@ -0,0 +1,197 @@
+import heapq
+import logging
+import shutil
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+
+class NTriplesWriter:
+    """
+    Buffered, disk backed store for N-Triples statements.
+
+    Statements accumulate in memory and are written out in large blocks
+    every `buffer_size` statements, so memory use stays flat however many
+    triples an ingest makes.
+
+    Without a `file_handle` the blocks go to an anonymous spool file
+    and may be streamed back out later as ntriples, nquads or turtle
+    (ntriples being a subset of turtle).
+
+    With `dedup` each block is sorted and uniquified into its own run
+    and the runs are merged (external merge sort) when written out,
+    leaving the output sorted and free of duplicate triples.
+    """
+
+    MAX_RUNS = 128   # merge runs before we hold this many files open
+
+    STREAMABLE_FORMATS = {
+        'nt': 'nt', 'ntriples': 'nt',
+        'turtle': 'nt', 'ttl': 'nt',
+        'n3': 'nt', 'notation3': 'nt',
+        'nquads': 'nq', 'nq': 'nq'}
+
+    def __init__(
+            self, file_handle=None, buffer_size=100000, dedup=False, tmpdir=None):
+        self.file_handle = file_handle
+        self.buffer_size = buffer_size
+        self.dedup = dedup and file_handle is None
+        self.tmpdir = tmpdir
+        self.buffer = []
+        self.count = 0
+        self.spool = None
+        self.runs = []
+        self.closed = False
+
+    def __len__(self):
+        """
+        number of statements written so far.
+        With dedup, duplicates are only discounted within each block
+        until the runs are merged by write_to()
+        """
+        return self.count + len(self.buffer)
+
+    def add(self, statement):
+        """
+        :param statement: str a single N-Triples statement (with final ' .')
+        """
+        self.buffer.append(statement)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.file_handle is not None:
+            self.file_handle.write('\n'.join(self.buffer) + '\n')
+            self.count += len(self.buffer)
+        elif self.dedup:
+            # sort as bytes, the same order heapq.merge() will see them in
+            lines = sorted({(line + '\n').encode('utf-8') for line in self.buffer})
+            run = self._new_tempfile()
+            run.write(b''.join(lines))
+            self.runs.append(run)
+            self.count += len(lines)
+            if len(self.runs) >= self.MAX_RUNS:
+                self._collapse_runs()
+        else:
+            if self.spool is None:
+                self.spool = self._new_tempfile()
+            self.spool.write(('\n'.join(self.buffer) + '\n').encode('utf-8'))
+            self.count += len(self.buffer)
+        self.buffer = []
+
+    def write_to(self, destination, fmt='nt', graph_iri=None):
+        """
+        Stream all spooled statements into a binary file like destination
+
+        :param destination: file opened for writing bytes
+        :param fmt: str one of STREAMABLE_FORMATS
+        :param graph_iri: str IRI naming the graph, required for nquads
+        :return: int number of statements written
+        """
+        if self.file_handle is not None:
+            raise ValueError('statements were written directly to the file handle')
+        if self.closed:
+            raise ValueError('writer is closed')
+        if fmt not in self.STREAMABLE_FORMATS:
+            raise ValueError('Cannot stream triples as {}'.format(fmt))
+        fmt = self.STREAMABLE_FORMATS[fmt]
+        if fmt == 'nq' and graph_iri is None:
+            raise ValueError('nquads requires a graph IRI')
+
+        if fmt == 'nt' and not self.dedup and self.spool is not None:
+            self.flush()
+            self.spool.flush()
+            self.spool.seek(0)
+            shutil.copyfileobj(self.spool, destination)
+            self.spool.seek(0, 2)
+            return self.count
+
+        lines = self._lines()
+
+        if fmt == 'nq':
+            suffix = ' <{}> .\n'.format(graph_iri).encode('utf-8')
+            lines = (line[:-3] + suffix for line in lines)
+
+        written = 0
+        block = []
+        for line in lines:
+            block.append(line)
+            if len(block) >= self.buffer_size:
+                destination.write(b''.join(block))
+                written += len(block)
+                block = []
+        destination.write(b''.join(block))
+        written += len(block)
+        if self.spool is not None:
+            self.spool.seek(0, 2)   # back to appending
+
+        return written
+
+    def update(self, other):
+        """
+        Add every statement spooled by another writer to this one
+        """
+        for line in other._lines():
+            self.add(line.decode('utf-8')[:-1])
+        if other.spool is not None:
+            other.spool.seek(0, 2)
+
+    def close(self):
+        self.flush()
+        self.closed = True
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        for run in self.runs:
+            run.close()
+        self.runs = []
+
+    def _new_tempfile(self):
+        return tempfile.TemporaryFile(
+            mode='w+b', dir=self.tmpdir, prefix='dipper_', suffix='.nt')
+
+    def _lines(self):
+        """
+        :return: iterator over the spooled statements as bytes, newline included
+        """
+        self.flush()
+        if self.dedup:
+            self._collapse_runs()
+            if self.runs:
+                return self._rewind(self.runs[0])
+        elif self.spool is not None:
+            return self._rewind(self.spool)
+        return iter(())
+
+    @staticmethod
+    def _rewind(spool):
+        spool.flush()
+        spool.seek(0)
+        return iter(spool)
+
+    def _collapse_runs(self):
+        """
+        k-way merge of the sorted runs into a single sorted, unique run
+        """
+        if len(self.runs) < 2:
+            return
+        merged = self._new_tempfile()
+        previous = None
+        unique = 0
+        block = []
+        for line in heapq.merge(*[self._rewind(run) for run in self.runs]):
+            if line != previous:
+                block.append(line)
+                previous = line
+                unique += 1
+                if len(block) >= self.buffer_size:
+                    merged.write(b''.join(block))
+                    block = []
+        merged.write(b''.join(block))
+        self.count = unique   # exact now the runs are merged
+        for run in self.runs:
+            run.close()
+        self.runs = [merged]
+        LOG.debug('Merged sorted runs of triples')
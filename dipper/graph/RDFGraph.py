@@ -2,13 +2,14 @@ import re
 import logging
 import sys
 import os
+from collections import Counter
 
-import yaml
 from rdflib import ConjunctiveGraph, Literal, URIRef, BNode, Namespace
+from rdflib.plugins.parsers.ntriples import NTriplesParser
 
 from dipper.graph.Graph import Graph as DipperGraph
-from dipper.utils.CurieUtil import CurieUtil
 from dipper import curie_map as curie_map_class
+from dipper.utils import TableSnapshot
 
 LOG = logging.getLogger(__name__)
 
@@ -22,25 +23,26 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
     """
 
     curie_map = curie_map_class.get()
-    curie_util = CurieUtil(curie_map)
+    curie_util = curie_map_class.get_curie_util()
 
     # make global translation table available outside the ingest
-    with open(
-        os.path.join(
-            os.path.dirname(__file__),
-            '../../translationtable/GLOBAL_TERMS.yaml')) as fhandle:
-        globaltt = yaml.safe_load(fhandle)
-        globaltcid = {v: k for k, v in globaltt.items()}
+    globaltt = TableSnapshot.load_yaml(os.path.join(
+        os.path.dirname(__file__), '../../translationtable/GLOBAL_TERMS.yaml'))
+    globaltcid = {v: k for k, v in globaltt.items()}
 
     def __init__(self, are_bnodes_skized=True, identifier=None):
         # print("in RDFGraph  with id: ", identifier)
         super().__init__('IOMemory', identifier)
         self.are_bnodes_skized = are_bnodes_skized
+        self.bound_prefixes = set()
+        # triples per predicate, kept up to date as they are added and removed
+        self.predicate_counts = Counter()
 
         # Can be removed when this is resolved
         # https://github.com/RDFLib/rdflib/issues/632
         for pfx in ('OBO',):  # , 'ORPHA'):
             self.bind(pfx, Namespace(self.curie_map[pfx]))
+            self.bound_prefixes.add(pfx)
 
         # try adding them all
         # self.bind_all_namespaces()  # too much
@@ -92,6 +94,40 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
                 subject_id, predicate_id)
         return
 
+    def add(self, triple_or_quad):
+        size = len(self)   # does not walk the (in memory) store
+        ConjunctiveGraph.add(self, triple_or_quad)
+        if len(self) > size:
+            self.predicate_counts[triple_or_quad[1]] += 1
+
+    def addN(self, quads):
+        for quad in quads:
+            self.add(quad)
+
+    def remove(self, triple_or_quad):
+        matches = list(self.triples(triple_or_quad))
+        ConjunctiveGraph.remove(self, triple_or_quad)
+        for triple in matches:
+            if triple not in self:
+                self.predicate_counts[triple[1]] -= 1
+                if not self.predicate_counts[triple[1]]:
+                    del self.predicate_counts[triple[1]]
+
+    def parse(self, *args, **kwargs):
+        # parsers add to a context graph rather than through add()
+        context = ConjunctiveGraph.parse(self, *args, **kwargs)
+        self.predicate_counts = Counter(self.predicates())
+        return context
+
+    def add_ntriples(self, source):
+        """
+        Add triples already serialized as ntriples (e.g. by another process),
+        parsed straight into this graph
+
+        :param source: binary file like object of ntriples lines
+        """
+        NTriplesParser(_AddingSink(self)).parse(source)
+
     def skolemizeBlankNode(self, curie):
         stripped_id = re.sub(r'^_:|^_', '', curie, 1)
         node = BNode(stripped_id).skolemize(self.curie_util.get_base())
@@ -124,10 +160,11 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         else:
             iri = RDFGraph.curie_util.get_uri(curie)
             if iri is not None:
-                node = URIRef(RDFGraph.curie_util.get_uri(curie))
-                # Bind prefix map to graph
-                prefix = curie.split(':')[0]
-                if prefix not in self.namespace_manager.namespaces():
+                node = URIRef(iri)
+                # Bind prefix map to graph (once)
+                prefix = curie[:curie.index(':')]
+                if prefix not in self.bound_prefixes:
+                    self.bound_prefixes.add(prefix)
                     mapped_iri = self.curie_map[prefix]
                     self.bind(prefix, Namespace(mapped_iri))
             else:
@@ -147,6 +184,7 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         for prefix in self.curie_map.keys():
             iri = self.curie_map[prefix]
             self.bind(prefix, Namespace(iri))
+            self.bound_prefixes.add(prefix)
         return
 
     # serialize() conflicts between rdflib & Graph.serialize abstractmethod
@@ -154,3 +192,15 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
     def serialize(  # rdflib version
             self, destination=None, format='turtle', base=None, encoding=None):
         return ConjunctiveGraph.serialize(self, destination, format)
+
+
+class _AddingSink:
+    """
+    Where the ntriples parser puts each triple, added as any other
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def triple(self, subject, predicate, obj):
+        self.graph.add((subject, predicate, obj))
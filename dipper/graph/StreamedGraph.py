@@ -1,10 +1,11 @@
 import logging
-import re
-import yaml
+import sys
 import os
+from collections import Counter
 
 from dipper.graph.Graph import Graph as DipperGraph
-from dipper.utils.CurieUtil import CurieUtil
+from dipper.graph.NTriplesWriter import NTriplesWriter
+from dipper.utils import TableSnapshot
 from dipper import curie_map as curimap
 
 LOG = logging.getLogger(__name__)
@@ -12,119 +13,180 @@ LOG = logging.getLogger(__name__)
 
 class StreamedGraph(DipperGraph):
     """
-    Stream rdf triples to file or stdout
-    Assumes a downstream process will sort then uniquify triples
+    Stream rdf triples to file or to a disk backed spool
+    instead of holding them in memory.
 
-    Theoretically could support both ntriple, rdfxml formats, for now
-    just support nt
+    Given a file_handle, triples are written to it directly as ntriples
+    and a downstream process is assumed to sort then uniquify them.
+
+    Otherwise triples are spooled (see NTriplesWriter) and written out by
+    serialize() as ntriples, nquads or turtle, optionally deduplicated.
     """
 
     curie_map = curimap.get()
-    curie_util = CurieUtil(curie_map)
+    curie_util = curimap.get_curie_util()
+
+    globaltt = TableSnapshot.load_yaml(os.path.join(
+        os.path.dirname(__file__), '../../translationtable/GLOBAL_TERMS.yaml'))
+    globaltcid = {v: k for k, v in globaltt.items()}
 
-    with open(
-            os.path.join(os.path.dirname(__file__),
-                         '../../translationtable/GLOBAL_TERMS.yaml')) as fhandle:
-        globaltt = yaml.safe_load(fhandle).copy()
-        globaltcid = {v: k for k, v in globaltt.items()}
+    # N-Triples tokens for literals of non str python types
+    LITERAL_XSD_TYPE = {
+        bool: 'http://www.w3.org/2001/XMLSchema#boolean',
+        int: 'http://www.w3.org/2001/XMLSchema#integer',
+        float: 'http://www.w3.org/2001/XMLSchema#double',
+    }
 
     def __init__(
-            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt'):
+            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt',
+            dedup=False, buffer_size=100000, tmpdir=None):
+        """
+        :param are_bnodes_skized: bool skolemize blank nodes
+        :param identifier: curie or iri naming the graph (used for nquads)
+        :param file_handle: write ntriples straight to this text file
+        :param fmt: str kept for compatibility, output format is chosen on serialize()
+        :param dedup: bool remove duplicate triples when they are written out
+        :param buffer_size: int number of triples held in memory between writes
+        :param tmpdir: str directory to spool triples in (default system temp)
+        """
         self.are_bnodes_skized = are_bnodes_skized
         self.fmt = fmt
         self.file_handle = file_handle
         self.identifier = identifier
+        self.writer = NTriplesWriter(
+            file_handle, buffer_size=buffer_size, dedup=dedup, tmpdir=tmpdir)
+        # triples (as added, before any dedup) per predicate iri
+        self.predicate_counts = Counter()
+
+    def __len__(self):
+        return len(self.writer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iadd__(self, other):
+        """
+        Append all the triples of another StreamedGraph (i.e. dataset metadata)
+        """
+        self.writer.update(other.writer)
+        self.predicate_counts.update(other.predicate_counts)
+        return self
+
+    def add_ntriples(self, lines):
+        """
+        Append triples already serialized as ntriples (e.g. by another process)
+
+        :param lines: iterable of ntriples lines
+        """
+        for line in lines:
+            line = line.rstrip('\n')
+            if line:
+                self.writer.add(line)
+                self.predicate_counts[line.split(' ', 2)[1][1:-1]] += 1
+
+    def close(self):
+        """
+        Flush any buffered triples and release the spool;
+        the graph can not be serialized afterwards
+        """
+        self.writer.close()
 
     def addTriple(
             self, subject_id, predicate_id, obj, object_is_literal=None,
             literal_type=None):
         # trying making infrence on type of object if none is supplied
         if object_is_literal is None:
-            if self.curie_regexp.match(obj) or\
+            if self.curie_regexp.match(obj) is not None or\
                     obj.split(':')[0].lower() in ('http', 'https', 'ftp'):
                 object_is_literal = False
+            else:
+                object_is_literal = True
+
+        if object_is_literal is True:
+            if obj is None:
+                LOG.warning(
+                    "None as literal object for subj: %s and pred: %s",
+                    subject_id, predicate_id)
+                return
+            if literal_type is not None and obj not in ("", " "):
+                literal = '{}^^{}'.format(
+                    self._quote_encode(str(obj)), self._getnode(literal_type))
+            elif isinstance(obj, str):
+                literal = self._quote_encode(obj)
+            elif type(obj) in self.LITERAL_XSD_TYPE:
+                literal = '"{}"^^<{}>'.format(
+                    str(obj).lower() if isinstance(obj, bool) else obj,
+                    self.LITERAL_XSD_TYPE[type(obj)])
+            else:
+                raise TypeError("Cannot determine type of {}".format(obj))
+            predicate = self._getnode(predicate_id)
+            self.writer.add(' '.join((
+                self._getnode(subject_id), predicate, literal, '.')))
+            self.predicate_counts[predicate[1:-1]] += 1
+
+        elif obj is not None and obj != '':  # object is a resource
+            predicate = self._getnode(predicate_id)
+            self.writer.add(' '.join((
+                self._getnode(subject_id), predicate, self._getnode(obj), '.')))
+            self.predicate_counts[predicate[1:-1]] += 1
         else:
-            object_is_literal = True
-
-        subject_iri = self._getnode(subject_id)
-        predicate_iri = self._getnode(predicate_id)
-        if not object_is_literal:
-            obj = self._getnode(obj)
+            LOG.warning(
+                "None/empty object IRI for subj: %s and pred: %s",
+                subject_id, predicate_id)
 
-        if literal_type is not None:
-            literal_type = self._getnode(literal_type)
+    def skolemizeBlankNode(self, curie):
+        # same IRI RDFGraph makes of it
+        return '{}.well-known/genid/{}'.format(
+            self.curie_util.get_base(), self._bnode_id(curie))
 
-        if obj is not None:
-            self.serialize(
-                subject_iri, predicate_iri, obj, object_is_literal, literal_type)
-        else:
-            LOG.warning("Null value passed as object")
-        return
+    def serialize(self, destination=None, format='nt', **kwargs):
+        """
+        Write the spooled triples out (rdflib compatible signature,
+        as used by GraphUtils.write)
 
-    def skolemizeBlankNode(self, curie):
-        base_iri = StreamedGraph.curie_map.get_base()
-        curie_id = curie.split(':')[1]
-        skolem_iri = "{0}.wellknown/genid/{1}".format(base_iri, curie_id)
-        return skolem_iri
-
-    def serialize(self, subject_iri, predicate_iri, obj,
-                  object_is_literal=False, literal_type=None):
-        if not object_is_literal:
-            triple = "<{}> <{}> <{}> .".format(subject_iri, predicate_iri, obj)
-        elif literal_type is not None:
-            triple = '<{}> <{}> {}^^<{}> .'.format(
-                subject_iri, predicate_iri,
-                self._quote_encode(str(obj)), literal_type)
-        else:
-            if isinstance(obj, str):
-                triple = '<{}> <{}> {} .'.format(
-                    subject_iri, predicate_iri, self._quote_encode(obj))
-            else:
-                lit_type = self._getLiteralXSDType(obj)
-                if type is not None:
-                    triple = '<{}> <{}> "{}"^^<{}> .'.format(
-                        subject_iri, predicate_iri, obj, lit_type)
-                else:
-                    raise TypeError("Cannot determine type of {}".format(obj))
-
-        if self.file_handle is None:
-            print(triple)
-        else:
-            self.file_handle.write("{}\n".format(triple))
+        :param destination: binary file like object, defaults to stdout
+        :param format: ntriples, nquads or turtle
+        :return: bytes (empty, the triples are not held in memory)
+        """
+        if destination is None:
+            destination = sys.stdout.buffer
+        graph_iri = None
+        if self.identifier is not None:
+            graph_iri = self._getnode(self.identifier)[1:-1]
+        self.writer.write_to(destination, format, graph_iri)
+        return b''
 
     def _getnode(self, curie):
         """
-        Returns IRI, or blank node curie/iri depending on
-        self.skolemize_blank_node setting
+        Returns the N-Triples token for a curie or iri:
+        an <IRI> or a _:blank node depending on
+        self.are_bnodes_skized setting
+
+        dispatches on leading characters rather than running regexes
+        as this is called three times per triple
 
         :param curie: str id as curie or iri
-        :return:
+        :return: str
         """
-        if re.match(r'^_:', curie):
+        if curie[0] == '_':
             if self.are_bnodes_skized is True:
-                node = self.skolemizeBlankNode(curie)
-            else:
-                node = curie
-        elif re.match(r'^http|^ftp', curie):
-            node = curie
-        elif len(curie.split(':')) == 2:
-            node = StreamedGraph.curie_util.get_uri(curie)
-        else:
+                return '<' + self.skolemizeBlankNode(curie) + '>'
+            return '_:' + self._bnode_id(curie)
+        if curie[:4] == 'http' or curie[:3] == 'ftp' or curie[:4] == 'jdbc':
+            return '<' + curie + '>'
+        iri = StreamedGraph.curie_util.get_uri(curie)
+        if iri is None:
             raise TypeError("Cannot process curie {}".format(curie))
-        return node
+        return '<' + iri + '>'
 
-    def _getLiteralXSDType(self, literal):
-        """
-        This could be much more nuanced, but for now
-        if a literal is not a str, determine if it's
-        a xsd int or double
-        :param literal:
-        :return: str - xsd full iri
-        """
-        if isinstance(literal, int):
-            return self._getnode("xsd:integer")
-        if isinstance(literal, float):
-            return self._getnode("xsd:double")
+    @staticmethod
+    def _bnode_id(curie):
+        if curie[:2] == '_:':
+            return curie[2:]
+        return curie[1:]
 
     @staticmethod
     def _quote_encode(literal):
@@ -14,6 +14,15 @@ __author__ = 'nlw'
 
 LOG = logging.getLogger(__name__)
 
+# specification of each distribution_type (file extension, before any compression)
+FORMAT_SPECS = {
+    'ttl': 'https://www.w3.org/TR/turtle/',
+    'nt': 'https://www.w3.org/TR/n-triples/',
+    'nq': 'https://www.w3.org/TR/n-quads/',
+    'xml': 'https://www.w3.org/TR/rdf-syntax-grammar/',
+    'n3': 'https://www.w3.org/TeamSubmission/n3/',
+}
+
 
 class Dataset:
     """
@@ -155,11 +164,8 @@ class Dataset:
      which apparently in theory could lead to blank node ID collisions between the two
      graphs.
 
-     Note also that this implementation currently does not support producing metadata
-     for StreamedGraph graphs (see dipper/graph/StreamedGraph.py). StreamedGraph is
-     currently not being used for any ingests, so this isn't a problem. There was
-     talk of using StreamedGraph for a rewrite/refactor of the Clinvar ingest, which
-     would probably require adding support here for StreamedGraph's.
+     For StreamedGraph graphs (see dipper/graph/StreamedGraph.py) the dataset graph
+     is a StreamedGraph as well, appended in place with `mainGraph += datasetGraph`
     """
 
     def __init__(
@@ -317,7 +323,9 @@ class Dataset:
                              "https://github.com/monarch-initiative/dipper")
         self.graph.addTriple(self.distribution_level_turtle_curie,
                              self.globaltt['format'],
-                             "https://www.w3.org/TR/turtle/")
+                             FORMAT_SPECS.get(
+                                 self.distribution_type.split('.')[0],
+                                 FORMAT_SPECS['ttl']))
         self.graph.addTriple(self.distribution_level_turtle_curie,
                              self.globaltt['downloadURL'],
                              self.download_url)
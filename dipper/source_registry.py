@@ -0,0 +1,81 @@
+'''
+    The ingests dipper-etl.py can run, found in dipper/sources
+
+    Each module there named for the Source subclass it defines is a source,
+    known by the ingest name it passes to Source.__init__ and by its
+    lower cased class name. Modules are only read as text here;
+    a source's module is imported when its class is asked for.
+'''
+import os
+import re
+import glob
+import logging
+import importlib
+
+LOG = logging.getLogger(__name__)
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), 'sources')
+
+# base classes, not ingests
+BASES = ('Source', 'OMIMSource', 'PostgreSQLSource')
+# modules that are not (or no longer) run as ingests
+EXCLUDED = {
+    'Decipher': 'deprecated, see EBIGene2Phen',
+}
+# names the command line has accepted which are neither of the above
+ALIASES = {
+    'ebi': 'EBIGene2Phen',
+}
+
+INGEST_NAME = re.compile(r'''super\(\)\.__init__\(.*?\bname=['"](\w+)['"]''', re.S)
+
+_SOURCES = None
+
+
+def sources():
+    """
+    :return: dict of each name a source is known by to its class name
+    """
+    global _SOURCES
+    if _SOURCES is None:
+        found = {}
+        for path in sorted(glob.glob(os.path.join(SOURCE_DIR, '*.py'))):
+            clsname = os.path.splitext(os.path.basename(path))[0]
+            if clsname in BASES or clsname in EXCLUDED:
+                continue
+            with open(path, 'r') as reader:
+                text = reader.read()
+            if re.search(r'^class {}\((\w*Source)\):'.format(clsname), text, re.M) \
+                    is None:
+                continue
+            found[clsname.lower()] = clsname
+            match = INGEST_NAME.search(text)
+            if match is not None:
+                found.setdefault(match.group(1), clsname)
+        for (alias, clsname) in ALIASES.items():
+            found.setdefault(alias, clsname)
+        _SOURCES = found
+    return _SOURCES
+
+
+def ingest_names():
+    """
+    :return: dict of each source's class name to the shortest name it is known by
+    """
+    names = {}
+    for (name, clsname) in sorted(sources().items()):
+        if clsname not in names or len(name) < len(names[clsname]):
+            names[clsname] = name
+    return names
+
+
+def get_class(name):
+    """
+    Import a source's module, and only that
+
+    :param name: str a name the source is known by, in any case
+    :return: the Source subclass
+    """
+    clsname = sources()[name.lower()]
+    module = importlib.import_module('dipper.sources.' + clsname)
+    return getattr(module, clsname)
@@ -258,7 +258,9 @@ class AnimalQTLdb(Source):
         28483, 29016, 29018, 8945, 29385, 12532, 31023, 14234, 17138, 1795, 1798, 32133
     }
 
-    def __init__(self, graph_type, are_bnodes_skolemized, data_release_version=None):
+    def __init__(
+            self, graph_type, are_bnodes_skolemized, data_release_version=None,
+            argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -268,7 +270,8 @@ class AnimalQTLdb(Source):
             ingest_url='http://www.animalgenome.org/cgi-bin/QTLdb/index',
             ingest_logo='source-animalqtldb.png',
             license_url=None,
-            data_rights="'" + AQDL + '/faq#32' + "'"
+            data_rights="'" + AQDL + '/faq#32' + "'",
+            argv=argv
             # file_handle=None
         )
 
@@ -7,7 +7,6 @@ import gzip
 from datetime import datetime
 from stat import ST_SIZE
 
-import pandas as pd
 from dipper.sources.Source import Source
 from dipper.models.Model import Model
 from dipper.models.assoc.Association import Assoc
@@ -82,7 +81,8 @@ class Bgee(Source):
                  are_bnodes_skolemized,
                  data_release_version=None,
                  tax_ids=None,
-                 version=None):
+                 version=None,
+                 argv=None):
         """
         :param tax_ids: [str,], List of NCBI taxon  identifiers
         :return:
@@ -96,7 +96,8 @@ class Bgee(Source):
             ingest_url='http://bgee.org/',
             ingest_logo='source-bgee.png',
             # license_url=None,
-            data_rights='https://bgee.org/?page=about'
+            data_rights='https://bgee.org/?page=about',
+            argv=argv
             # file_handle=None
         )
         self.default_taxa = {
@@ -189,6 +190,7 @@ class Bgee(Source):
         :param limit: int, limit per group
         :return: None
         """
+        import pandas as pd
         dataframe = pd.read_csv(fh, sep='\t')
         col = self.files['anat_entity']['columns']
         if not self.check_fileheader(col, list(dataframe)):
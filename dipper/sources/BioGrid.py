@@ -41,7 +41,8 @@ class BioGrid(Source):
                  graph_type,
                  are_bnodes_skolemized,
                  data_release_version=None,
-                 tax_ids=None):
+                 tax_ids=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -52,6 +53,7 @@ class BioGrid(Source):
             ingest_logo='source-biogrid.png',
             license_url='https://downloads.thebiogrid.org/Download/LICENSE.txt',
             data_rights='https://wiki.thebiogrid.org/doku.php/terms_and_conditions',
+            argv=argv,
             # file_handle=None
         )
 
@@ -2,10 +2,14 @@ import csv
 import re
 import gzip
 import os
+import json
+import shutil
+import hashlib
 import logging
 import urllib
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 from dipper.sources.Source import Source
 from dipper.models.Model import Model
@@ -16,6 +20,8 @@ from dipper.models.Reference import Reference
 
 
 LOG = logging.getLogger(__name__)
+BATCH_SIZE = 4000   # publications per batch query
+BATCH_WORKERS = 4   # batch queries at once
 
 
 class CTD(Source):
@@ -113,7 +119,8 @@ class CTD(Source):
             self,
             graph_type,
             are_bnodes_skolemized,
-            data_release_version=None):
+            data_release_version=None,
+            argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -123,7 +130,8 @@ class CTD(Source):
             ingest_url='http://ctdbase.org',
             ingest_logo='source-ctd.png',
             license_url=None,
-            data_rights='http://ctdbase.org/about/legal.jsp'
+            data_rights='http://ctdbase.org/about/legal.jsp',
+            argv=argv
             # file_handle=None
         )
 
@@ -141,6 +149,8 @@ class CTD(Source):
 
         self.geno = Genotype(self.graph)
         self.pathway = Pathway(self.graph)
+        # publications of the chemical-disease associations with direct evidence
+        self.curated_pubs = set()
 
         return
 
@@ -156,26 +166,8 @@ class CTD(Source):
         # typical download unless detectably stale
         self.get_files(is_dl_forced)
 
-        # check if there is a local  batch query association file, and download if it's
-        # dated later than the (???original intxn???) file
-
-        src_key = 'chemical_disease_associations'
-        assoc_file = '/'.join((self.rawdir, self.files[src_key]['file']))
-
-        src_key = 'publications'
-        disambig_file = '/'.join((self.rawdir, self.api_fetch[src_key]['file']))
-
-        if os.path.exists(disambig_file):
-            dfile_dt = os.stat(disambig_file)
-            afile_dt = os.stat(assoc_file)
-            if dfile_dt < afile_dt:
-                LOG.info('Batchquery file is older; Refreshing  %s', disambig_file)
-                self._fetch_disambiguating_assoc()  # api ferch
-            else:
-                LOG.info("Batchquery file is up to date")
-        else:
-            LOG.info('Batchquery file does not exist; Fetching  %s', disambig_file)
-            self._fetch_disambiguating_assoc()  # api ferch
+        # the batch query disambiguating associations is made while parsing,
+        # once the chemical-disease file has given us the publications to ask for
 
         # consider creating subsets of the files that
         # only have direct annotations (not inferred)
@@ -206,12 +198,10 @@ class CTD(Source):
         # self._parse_ctd_file(limit, 'gene_pathway')
         # self._parse_ctd_file(limit, 'gene_disease')
 
-        src_key = 'publications'
-        file_path = '/'.join((self.rawdir, self.api_fetch[src_key]['file']))
-        if os.path.exists(file_path) is True:
+        file_path = self._fetch_disambiguating_assoc(   # api fetch
+            self.curated_pubs, limited=limit is not None and not self.test_mode)
+        if file_path is not None:
             self._parse_curated_chem_disease(file_path, limit)
-        else:
-            LOG.error('Batch Query file "%s" does not exist', file_path)
         LOG.info("Done parsing files.")
 
     def _parse_ctd_file(self, limit, src_key):
@@ -225,6 +215,7 @@ class CTD(Source):
             :return None
         """
         row_count = 0
+        col = self.files[src_key]['columns']
         version_pattern = re.compile(r'^# Report created: (.+)$')
         is_versioned = False
         file_path = '/'.join((self.rawdir, self.files[src_key]['file']))
@@ -246,7 +237,14 @@ class CTD(Source):
                 else:
                     row_count += 1
                     if src_key == 'chemical_disease_associations':
+                        self._check_list_len(row, len(col))
                         self._process_interactions(row)
+                        # ambiguous associations are disambiguated per publication
+                        direct_evidence = row[col.index('DirectEvidence')].strip()
+                        pubmed_ids = row[col.index('PubMedIDs')]
+                        if direct_evidence in ['marker/mechanism', 'therapeutic'] \
+                                and pubmed_ids != '':
+                            self.curated_pubs.update(pubmed_ids.split('|'))
 
                     # elif file == self.files['gene_pathway']['file']:
                     #     self._process_pathway(row)
@@ -298,95 +296,117 @@ class CTD(Source):
 
         return
 
-    def _fetch_disambiguating_assoc(self):
+    def _fetch_disambiguating_assoc(self, pubs, limited=False):
         """
         For any of the items in the chemical-disease association file that have
         ambiguous association types we fetch the disambiguated associations
         using the batch query API, and store these in a file.
 
-        Elsewhere, we can loop through the file and create the appropriate associations.
+        The publications are asked about BATCH_SIZE at a time, a few batches at once,
+        each batch kept in its own file under raw/ctd/batchquery/ and listed in
+        its MANIFEST.json; a rerun only fetches the batches it does not have,
+        until the chemical-disease file changes. A limited parse asks about
+        fewer publications; it leaves the batches of a full one in place
+        and combines its results in a file of its own.
 
-        :return:
+        Elsewhere, we can loop through the file and create the appropriate associations.
 
+        :param pubs: set of PubMed ids (numbers only)
+        :param limited: bool if pubs are only those of the rows parsed within a limit
+        :return: str path to the combined batch query results, None without pubs
         """
         src_key = 'chemical_disease_associations'
         assoc_file = '/'.join((self.rawdir, self.files[src_key]['file']))
-        col = self.files[src_key]['columns']
-
-        all_pubs = set()
-        # first get all the unique publications
-        with gzip.open(assoc_file, 'rt') as tsvfile:
-            reader = csv.reader(tsvfile, delimiter="\t")
-            # about ~30 lines of header
-            row = next(reader)
-            while row[0][0] == '#' and row[0] != '# Fields:':
-                row = next(reader)
-            row = next(reader)
-            row[0] = row[0][2:].strip()
-            if not self.check_fileheader(col, row):
-                pass
-
-            for row in reader:
-                if row[0][0] == '#':
-                    continue
-                self._check_list_len(row, len(col))
-
-                # chem_name = row[col.index('ChemicalName')]
-                # chem_id = row[col.index('ChemicalID')]      # MeSH identifier
-                # cas_rn = row[col.index('CasRN')]            # CAS Registry Number
-                # disease_name = row[col.index('DiseaseName')]
-                # disease_id = row[col.index('DiseaseID')]    # MeSH or OMIM identifier
-                direct_evidence = row[col.index('DirectEvidence')].strip()
-                # (note in 201910  no direct_evidence are pipe delimited)
-                # inferred_gene_symbol = row[col.index('InferenceGeneSymbol')]
-                # inference_score = row[col.index('InferenceScore')]
-                # omim_ids = row[col.index('OmimIDs')]                # '|'-delimited
-                pubmed_ids = row[col.index('PubMedIDs')]            # '|'-delimited
-
-                # direct_evidence_list = direct_evidence.split('|')  # no instances of
-
-                if direct_evidence not in ['marker/mechanism', 'therapeutic']:
-                    continue
-                    # 6338455 ''
-                    #   63384 marker/mechanism
-                    #   35124 therapeutic
-                    # out of 6436992 total (inc comments)  Oct. 2019
-
-                if pubmed_ids is not None and pubmed_ids != '':
-                    all_pubs.update(set(re.split(r'\|', pubmed_ids)))
-        sorted_pubs = sorted(list(all_pubs))
-        # write out for debuging
-        with open(self.rawdir + '/' + 'pub_list.txt', 'w') as pub_writer:
-            pub_writer.write('\n'.join(sorted_pubs))
-
         src_key = 'publications'
         disambig_file = '/'.join((self.rawdir, self.api_fetch[src_key]['file']))
+        if limited:
+            disambig_file += '.limited'
+
+        sorted_pubs = sorted(pubs)
+        if not sorted_pubs:
+            LOG.warning('No publications to disambiguate associations with')
+            return None
+        LOG.debug('Publications to disambiguate: %s', ' '.join(sorted_pubs))
+
+        batchdir = '/'.join((self.rawdir, 'batchquery'))
+        manifest_file = '/'.join((batchdir, 'MANIFEST.json'))
+        os.makedirs(batchdir, exist_ok=True)
+        manifest = {}
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r') as reader:
+                manifest = json.load(reader)
+        source_digest = self.store.digest(assoc_file)
+        is_current = manifest.get('source_sha256') == source_digest
+        if not is_current:
+            LOG.info('Chemical-disease file has changed; Refreshing %s', batchdir)
+            for name in os.listdir(batchdir):
+                os.remove('/'.join((batchdir, name)))
+
+        # name each batch for the publications in it
+        batches = [
+            sorted_pubs[start:start + BATCH_SIZE]
+            for start in range(0, len(sorted_pubs), BATCH_SIZE)]
+        names = [
+            hashlib.sha1('|'.join(batch).encode()).hexdigest() + '.tsv'
+            for batch in batches]
+        if not (limited and is_current):
+            # batches of publications no longer asked about, or never completed
+            for name in set(os.listdir(batchdir)) - set(names) - {'MANIFEST.json'}:
+                os.remove('/'.join((batchdir, name)))
+            with open(manifest_file, 'w') as writer:
+                json.dump({
+                    'source_sha256': source_digest,
+                    'batches': [
+                        {'file': name, 'publications': len(batch)}
+                        for (name, batch) in zip(names, batches)]}, writer, indent=2)
+
+        todo = [
+            (name, batch) for (name, batch) in zip(names, batches)
+            if not os.path.exists('/'.join((batchdir, name)))]
+        LOG.info(
+            'Have %i of %i batch queries, fetching the rest',
+            len(batches) - len(todo), len(batches))
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+            futures = [
+                executor.submit(self._batch_query, '/'.join((batchdir, name)), batch)
+                for (name, batch) in todo]
+            for future in futures:
+                future.result()
+
+        # one file, with a single header line, for parsing
+        with open(disambig_file + '.part', 'w') as writer:
+            for (num, name) in enumerate(names):
+                with open('/'.join((batchdir, name)), 'r') as reader:
+                    header = reader.readline()
+                    if num == 0:
+                        writer.write(header)
+                    body = reader.read()
+                if body and not body.endswith('\n'):
+                    body += '\n'
+                writer.write(body)
+        os.replace(disambig_file + '.part', disambig_file)
+        return disambig_file
+
+    def _batch_query(self, batch_file, pubs):
+        """
+        Fetch the curated chemical-disease associations of some publications,
+        the file only appears once complete
+        :param batch_file: str path to write the results to
+        :param pubs: list of PubMed ids
+        """
+        src_key = 'publications'
         url = self.api_fetch[src_key]['url']
-        col = self.api_fetch[src_key]['columns']
-        params = self.api_fetch[src_key]['params']
-
-        # now in batches of 4000, we fetch the curated chemical-disease associations
-        batch_size = 4000
-        start = 0
-        end = min((batch_size, len(all_pubs)))  # get them in batches of 4000
-
-        with open(disambig_file, 'wb') as dmbf:
-            while start < len(sorted_pubs):
-                params['inputTerms'] = '|'.join(sorted_pubs[start:end])
-                # fetch the data from url
-                LOG.info(
-                    'fetching %d (%d-%d)',  # refs: %s',  # too chatty
-                    len(re.split(r'\|', params['inputTerms'])),
-                    start, end  # , params['inputTerms']
-                )
-                data = urllib.parse.urlencode(params)
-                encoding = 'utf-8'
-                binary_data = data.encode(encoding)
-                req = urllib.request.Request(url, binary_data)
-                resp = urllib.request.urlopen(req)
-                dmbf.write(resp.read())
-                start = end
-                end = min((start + batch_size, len(sorted_pubs)))
+        params = dict(self.api_fetch[src_key]['params'])
+        params['inputTerms'] = '|'.join(pubs)
+        LOG.info('fetching %d refs (%s-%s)', len(pubs), pubs[0], pubs[-1])
+        data = urllib.parse.urlencode(params)
+        encoding = 'utf-8'
+        binary_data = data.encode(encoding)
+        req = urllib.request.Request(url, binary_data)
+        with urllib.request.urlopen(req) as resp, \
+                open(batch_file + '.part', 'wb') as writer:
+            shutil.copyfileobj(resp, writer)
+        os.replace(batch_file + '.part', batch_file)
 
     def _process_interactions(self, row):
         """
@@ -42,11 +42,15 @@ import hashlib
 import logging
 import argparse
 import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
 import yaml
+from dipper.graph.NTriplesWriter import NTriplesWriter
 from dipper.models.ClinVarRecord import ClinVarRecord, Gene,\
     Variant, Allele, Condition, Genotype
 from dipper import curie_map
+from dipper.utils import TableSnapshot
 
 LOG = logging.getLogger(__name__)
 
@@ -60,19 +64,28 @@ LOCAL_TT_PATH = RPATH + '/translationtable/' + INAME + '.yaml'
 
 CV_FTP = 'ftp://ftp.ncbi.nlm.nih.gov/pub/clinvar'
 
+# ClinVarSets handed to a worker process at a time
+CHUNK_SETS = 1000
+
+STATUS_AND_SCORES = {
+    "no assertion criteria provided": '0',
+    "no assertion provided": '0',
+    "criteria provided, single submitter": '1',
+    "criteria provided, conflicting interpretations": '1',
+    "criteria provided, multiple submitters, no conflicts": '2',
+    "reviewed by expert panel": '3',
+    "practice guideline": '4',
+}
+
 # Global translation table
 # Translate labels found in ontologies
 # to the terms they are for
-GLOBALTT = {}
-with open(GLOBAL_TT_PATH) as fh:
-    GLOBALTT = yaml.safe_load(fh)
+GLOBALTT = TableSnapshot.load_yaml(GLOBAL_TT_PATH)
 
 # Local translation table
 # Translate external strings found in datasets
 # to specific labels found in ontologies
-LOCALTT = {}
-with open(LOCAL_TT_PATH) as fh:
-    LOCALTT = yaml.safe_load(fh)
+LOCALTT = TableSnapshot.load_yaml(LOCAL_TT_PATH)
 
 CURIEMAP = curie_map.get()
 CURIEMAP['_'] = 'https://monarchinitiative.org/.well-known/genid/'
@@ -558,6 +571,709 @@ def write_review_status_scores():
     return triples
 
 
+def clinvarset_to_triples(ClinVarSet, g2pmap):
+    """
+    Make the triples for one ClinVarSet,
+    the RCV and its SCVs (MONARCH associations)
+
+    :param ClinVarSet: Element
+    :param g2pmap: dict of gene to the conditions curated for it
+    :return: list of ntriples, None if the RCV is under specified
+    """
+
+    if ClinVarSet.find('RecordStatus').text != 'current':
+        LOG.warning(
+            "%s is not current", ClinVarSet.get('ID'))
+
+    RCVAssertion = ClinVarSet.find('./ReferenceClinVarAssertion')
+    # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/ClinVarAccession/@Acc
+    # 162,466  2016-Mar
+    rcv_acc = RCVAssertion.find('./ClinVarAccession').get('Acc')
+
+    # I do not expect we care as we shouldn't keep the RCV.
+    if RCVAssertion.find('./RecordStatus').text != 'current':
+        LOG.warning(
+            "%s <is not current on>", rcv_acc)  # + rs_dated)
+
+    ClinicalSignificance = RCVAssertion.find(
+        './ClinicalSignificance/Description').text
+    significance = resolve(ClinicalSignificance)
+
+    # # # Child elements
+    #
+    # /RCV/Assertion
+    # /RCV/AttributeSet
+    # /RCV/Citation
+    # /RCV/ClinVarAccession
+    # /RCV/ClinicalSignificance
+    # /RCV/MeasureSet
+    # /RCV/ObservedIn
+    # /RCV/RecordStatus
+    # /RCV/TraitSet
+
+    rcv_review = None
+    RCV_ClinicalSignificance = RCVAssertion.find('./ClinicalSignificance')
+    if RCV_ClinicalSignificance is not None:
+        RCV_ReviewStatus = RCV_ClinicalSignificance.find('./ReviewStatus')
+        if RCV_ReviewStatus is not None:
+            rcv_review = RCV_ReviewStatus.text.strip()
+
+    #######################################################################
+    # Our Genotype/Subject is a sequence alteration / Variant
+    # which apparently was Measured
+
+    # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/MeasureSet/@ID
+    # 162,466  2016-Mar
+    # 366,566  2017-Mar
+
+    # are now >4 types
+    # <GenotypeSet ID="424700" Type="CompoundHeterozygote">
+    # <MeasureSet  ID="242681" Type="Variant">
+    # <MeasureSet  ID="123456" Type="Haplotype">
+    # <Measure     ID="46900"  Type="single nucleotide variant">
+
+    # As of 04/2019
+    # Measure is no longer a direct child of ReferenceClinVarAssertion
+    # Unless a MeasureSet Type="Variant", both the MeasureSet ID and Measure IDs
+    # will be resolvable, eg:
+    # https://www.ncbi.nlm.nih.gov/clinvar/variation/431733/
+    # https://www.ncbi.nlm.nih.gov/clinvar/variation/425238/
+
+    # If MeasureSet Type == Variant, make the ID the child ID
+    # Genotypes can have >1 MeasureSets (Variants)
+    # MeasureSets can have >1 Measures (Alleles)
+    # Measures (Alleles) can have >1 gene
+
+    RCV_MeasureSet = RCVAssertion.find('./MeasureSet')
+    # Note: it is a "set" but have only seen a half dozen with two,
+    # all of type:  copy number gain  SO:0001742
+
+    genovar = None  # Union[Genotype, Variant, None]
+
+    if RCV_MeasureSet is None:
+        #  201705 introduced GenotypeSet a CompoundHeterozygote
+        #  with multiple variants
+        RCV_GenotypeSet = RCVAssertion.find('./GenotypeSet')
+        genovar = Genotype(
+            id="ClinVarVariant:" + RCV_GenotypeSet.get('ID'),
+            label=RCV_GenotypeSet.find(
+                './Name/ElementValue[@Type="Preferred"]').text,
+            variant_type=RCV_GenotypeSet.get('Type')
+        )
+        for RCV_MeasureSet in RCV_GenotypeSet.findall('./MeasureSet'):
+            genovar.variants.append(
+                process_measure_set(RCV_MeasureSet, rcv_acc))
+    else:
+        genovar = process_measure_set(RCV_MeasureSet, rcv_acc)
+
+    # Create ClinVarRecord object
+    rcv = ClinVarRecord(
+        id=RCVAssertion.get('ID'),
+        accession=rcv_acc,
+        created=RCVAssertion.get('DateCreated'),
+        updated=RCVAssertion.get('DateLastUpdated'),
+        genovar=genovar,
+        significance=significance
+    )
+
+    #######################################################################
+    # the Object is the Disease, here is called a "trait"
+    # reluctantly starting with the RCV disease
+    # not the SCV traits as submitted due to time constraints
+
+    for RCV_TraitSet in RCVAssertion.findall('./TraitSet'):
+        # /RCV/TraitSet/Trait[@Type="Disease"]/@ID
+        # 144,327   2016-Mar
+
+        # /RCV/TraitSet/Trait[@Type="Disease"]/XRef/@DB
+        #     29 Human Phenotype Ontology
+        #     82 EFO
+        #    659 Gene
+        #  53218 Orphanet
+        #  57356 OMIM
+        # 142532 MedGen
+
+        for RCV_Trait in RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
+            has_medgen_id = False
+            rcv_disease_db = None
+            rcv_disease_id = None
+            medgen_id = None
+            disease_label = None
+
+            RCV_TraitName = RCV_Trait.find(
+                './Name/ElementValue[@Type="Preferred"]')
+
+            if RCV_TraitName is not None:
+                disease_label = RCV_TraitName.text
+            # else:
+            #    LOG.warning(rcv_acc + " MISSING DISEASE NAME")
+
+            for RCV_TraitXRef in RCV_Trait.findall('./XRef[@DB="OMIM"]'):
+                rcv_disease_db = RCV_TraitXRef.get('DB')
+                rcv_disease_id = RCV_TraitXRef.get('ID')
+                if rcv_disease_id.startswith('PS'):
+                    rcv_disease_db = 'OMIMPS'
+                break
+
+            # Accept Orphanet if no OMIM
+            if rcv_disease_db is None or rcv_disease_id is None:
+                if rcv_disease_db is not None:
+                    break
+                for RCV_TraitXRef in RCV_Trait.findall(
+                        './XRef[@DB="Orphanet"]'):
+                    rcv_disease_db = 'ORPHA'  # RCV_TraitXRef.get('DB')
+                    rcv_disease_id = RCV_TraitXRef.get('ID')
+                    break
+
+            # Always get medgen for g2p mapping file
+            for RCV_TraitXRef in RCV_Trait.findall('./XRef[@DB="MedGen"]'):
+                has_medgen_id = True
+                medgen_id = RCV_TraitXRef.get('ID')
+                break
+
+            if rcv_disease_db is None and has_medgen_id:
+                # use UMLS prefix instead of MedGen
+                # see https://github.com/monarch-initiative/dipper/issues/874
+                rcv_disease_db = 'UMLS'  # RCV_TraitXRef.get('DB')
+            if rcv_disease_id is None and has_medgen_id:
+                rcv_disease_id = medgen_id
+
+            # See if there are any leftovers. Possibilities include:
+            # EFO, Gene, Human Phenotype Ontology
+            if rcv_disease_db is None:
+                for RCV_TraitXRef in RCV_Trait.findall('./XRef'):
+                    LOG.warning(
+                        rcv_acc + " UNKNOWN DISEASE DB:\t" +
+                        RCV_TraitXRef.get('DB') + ":" + RCV_TraitXRef.get('ID'))
+                    # 82372 MedGen
+                    #    58 EFO
+                    #     1 Human Phenotype Ontology
+                    break
+
+            rcv.conditions.append(Condition(
+                id=rcv_disease_id,
+                label=disease_label,
+                database=rcv_disease_db,
+                medgen_id=medgen_id
+            ))
+
+    # Check that we have enough info from the RCV
+    # to justify parsing the related SCVs
+    # check that no members of rcv.genovar are none
+    # and that at least one condition has an id and db
+    if [1 for member in vars(rcv.genovar) if member is None] \
+            or not [
+                1 for condition in rcv.conditions
+                if condition.id is not None and
+                condition.database is not None]:
+        LOG.info('%s is under specified. SKIPPING', rcv_acc)
+        return None
+
+    # start anew
+    rcvtriples = []
+
+    # At this point we should have a ClinVarRecord object with all
+    # necessary data.  Next convert it to triples
+    record_to_triples(rcv, rcvtriples, g2pmap)
+
+    #######################################################################
+    # Descend into each SCV grouped with the current RCV
+    #######################################################################
+
+    # keep a collection of a SCV's associations and patho significance call
+    # when this RCV's set is complete, interlink based on patho call
+
+    pathocalls = {}
+
+    for SCV_Assertion in ClinVarSet.findall('./ClinVarAssertion'):
+
+        # /SCV/AdditionalSubmitters
+        # /SCV/Assertion
+        # /SCV/AttributeSet
+        # /SCV/Citation
+        # /SCV/ClinVarAccession
+        # /SCV/ClinVarSubmissionID
+        # /SCV/ClinicalSignificance
+        # /SCV/Comment
+        # /SCV/CustomAssertionScore
+        # /SCV/ExternalID
+        # /SCV/MeasureSet
+        # /SCV/ObservedIn
+        # /SCV/RecordStatus
+        # /SCV/StudyDescription
+        # /SCV/StudyName
+        # /SCV/TraitSet
+
+        # init
+        # scv_review = scv_significance = None
+        # scv_assertcount += 1
+
+        for condition in rcv.conditions:
+
+            if condition.database is None:
+                continue
+
+            rcv_disease_curie = condition.database + ':' + condition.id
+
+            scv_id = SCV_Assertion.get('ID')
+            monarch_id = digest_id(rcv.id + scv_id + condition.id)
+            monarch_assoc = 'MONARCH:' + monarch_id
+
+            # if we parsed a review status up above, attach this review status
+            # to this association to allow filtering of RCV by review status
+            if rcv_review is not None:
+                write_spo(
+                    monarch_assoc,
+                          GLOBALTT['assertion_confidence_score'],
+                    STATUS_AND_SCORES[rcv_review],
+                    rcvtriples)
+
+            ClinVarAccession = SCV_Assertion.find('./ClinVarAccession')
+            scv_acc = ClinVarAccession.get('Acc')
+            scv_accver = ClinVarAccession.get('Version')
+            scv_orgid = ClinVarAccession.get('OrgID')
+            # scv_updated = ClinVarAccession.get('DateUpdated')  # not used
+            SCV_SubmissionID = SCV_Assertion.find('./ClinVarSubmissionID')
+            scv_submitter = None
+            if SCV_SubmissionID is not None:
+                scv_submitter = SCV_SubmissionID.get('submitter')
+
+            # blank node identifiers
+            _evidence_id = '_:' + digest_id(monarch_id + '_evidence')
+            write_spo(
+                _evidence_id, 'rdfs:label', monarch_id + '_evidence',
+                rcvtriples)
+
+            _assertion_id = '_:' + digest_id(monarch_id + '_assertion')
+            write_spo(
+                _assertion_id, 'rdfs:label', monarch_id + '_assertion',
+                rcvtriples)
+
+            #                   TRIPLES
+            # <monarch_assoc><rdf:type><OBAN:association>  .
+            write_spo(monarch_assoc, 'rdf:type', 'OBAN:association', rcvtriples)
+            # <monarch_assoc>
+            #   <OBAN:association_has_subject>
+            #       <ClinVarVariant:rcv_variant_id>
+            write_spo(
+                monarch_assoc, 'OBAN:association_has_subject', rcv.genovar.id,
+                rcvtriples)
+            # <ClinVarVariant:rcv_variant_id><rdfs:label><rcv.variant.label>  .
+
+            # <monarch_assoc><OBAN:association_has_object><rcv_disease_curi>  .
+            write_spo(
+                monarch_assoc, 'OBAN:association_has_object', rcv_disease_curie,
+                rcvtriples)
+            # <rcv_disease_curi><rdfs:label><rcv_disease_label>  .
+            # medgen might not have a disease label
+            if condition.label is not None:
+                write_spo(
+                    rcv_disease_curie, 'rdfs:label', condition.label,
+                    rcvtriples)
+
+            # <monarch_assoc><SEPIO:0000007><:_evidence_id>  .
+            write_spo(
+                monarch_assoc,
+                GLOBALTT['has_supporting_evidence_line'],
+                _evidence_id,
+                rcvtriples)
+            # <monarch_assoc><SEPIO:0000015><:_assertion_id>  .
+            write_spo(
+                monarch_assoc,
+                GLOBALTT['is_asserted_in'],
+                _assertion_id,
+                rcvtriples)
+
+            # <:_evidence_id><rdf:type><ECO:0000000> .
+            write_spo(
+                _evidence_id, 'rdf:type', GLOBALTT['evidence'], rcvtriples)
+
+            # <:_assertion_id><rdf:type><SEPIO:0000001> .
+            write_spo(
+                _assertion_id, 'rdf:type', GLOBALTT['assertion'], rcvtriples)
+            # <:_assertion_id><rdfs:label><'assertion'>  .
+            write_spo(
+                _assertion_id, 'rdfs:label', 'ClinVarAssertion_' + scv_id,
+                rcvtriples)
+
+            # <:_assertion_id><SEPIO_0000111><:_evidence_id>
+            write_spo(
+                _assertion_id,
+                GLOBALTT['is_assertion_supported_by_evidence'], _evidence_id,
+                rcvtriples)
+
+            # <:_assertion_id><dc:identifier><scv_acc + '.' + scv_accver>
+            write_spo(
+                _assertion_id, 'dc:identifier', scv_acc + '.' + scv_accver,
+                rcvtriples)
+            # <:_assertion_id><SEPIO:0000018><ClinVarSubmitters:scv_orgid>  .
+            write_spo(
+                _assertion_id,
+                GLOBALTT['created_by'],
+                'ClinVarSubmitters:' + scv_orgid,
+                rcvtriples)
+            # <ClinVarSubmitters:scv_orgid><rdf:type><foaf:organization>  .
+            write_spo(
+                'ClinVarSubmitters:' + scv_orgid,
+                'rdf:type',
+                'foaf:organization',
+                rcvtriples)
+            # <ClinVarSubmitters:scv_orgid><rdfs:label><scv_submitter>  .
+            if scv_submitter is not None:
+                write_spo(
+                    'ClinVarSubmitters:' + scv_orgid, 'rdfs:label', scv_submitter,
+                    rcvtriples)
+            ################################################################
+            ClinicalSignificance = SCV_Assertion.find('./ClinicalSignificance')
+            if ClinicalSignificance is not None:
+                scv_eval_date = str(
+                    ClinicalSignificance.get('DateLastEvaluated'))
+
+            # bummer. cannot specify xpath parent '..' targeting above .find()
+            for SCV_AttributeSet in SCV_Assertion.findall('./AttributeSet'):
+                # /SCV/AttributeSet/Attribute[@Type="AssertionMethod"]
+                SCV_Attribute = SCV_AttributeSet.find(
+                    './Attribute[@Type="AssertionMethod"]')
+                if SCV_Attribute is not None:
+                    SCV_Citation = SCV_AttributeSet.find('./Citation')
+
+                    # <:_assertion_id><SEPIO:0000021><scv_eval_date>  .
+                    if scv_eval_date != "None":
+                        write_spo(
+                            _assertion_id,
+                            GLOBALTT['Date Created'],
+                            scv_eval_date,
+                            rcvtriples)
+
+                    scv_assert_method = SCV_Attribute.text
+                    #  need to be mapped to a <sepio:100...n> curie ????
+                    # if scv_assert_method in TT:
+                    # scv_assert_id = resolve(scv_assert_method)
+                    # _assertion_method_id = '_:' + monarch_id + \
+                    #    '_assertionmethod_' + digest_id(scv_assert_method)
+                    #
+                    # changing to not include context till we have IRI
+
+                    # blank node, would be be nice if these were only made once
+                    _assertion_method_id = '_:' + digest_id(
+                        scv_assert_method + '_assertionmethod')
+                    write_spo(
+                        _assertion_method_id, 'rdfs:label',
+                        scv_assert_method + '_assertionmethod',
+                        rcvtriples)
+
+                    #       TRIPLES   specified_by
+                    # <:_assertion_id><SEPIO:0000041><_assertion_method_id>
+                    write_spo(
+                        _assertion_id, GLOBALTT['is_specified_by'],
+                        _assertion_method_id,
+                        rcvtriples)
+
+                    # <_assertion_method_id><rdf:type><SEPIO:0000037>
+                    write_spo(
+                        _assertion_method_id,
+                        'rdf:type',
+                        GLOBALTT['assertion method'],
+                        rcvtriples)
+
+                    # <_assertion_method_id><rdfs:label><scv_assert_method>
+                    write_spo(
+                        _assertion_method_id, 'rdfs:label', scv_assert_method,
+                        rcvtriples)
+
+                    # <_assertion_method_id><ERO:0000480><scv_citation_url>
+                    if SCV_Citation is not None:
+                        SCV_Citation_URL = SCV_Citation.find('./URL')
+                        if SCV_Citation_URL is not None:
+                            write_spo(
+                                _assertion_method_id, GLOBALTT['has_url'],
+                                SCV_Citation_URL.text, rcvtriples)
+
+            # scv_type = ClinVarAccession.get('Type')  # assert == 'SCV' ?
+            # RecordStatus                             # assert =='current' ?
+
+            # SCV_ReviewStatus = ClinicalSignificance.find('./ReviewStatus')
+            # if SCV_ReviewStatus is not None:
+            #    scv_review = SCV_ReviewStatus.text
+
+            # SCV/ClinicalSignificance/Citation/ID
+            # see also:
+            # SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
+            for SCV_Citation in ClinicalSignificance.findall(
+                    './Citation/ID[@Source="PubMed"]'):
+                scv_citation_id = SCV_Citation.text
+                #           TRIPLES
+                # has_part -> has_supporting_reference
+                # <:_evidence_id><SEPIO:0000124><PMID:scv_citation_id>  .
+                write_spo(
+                    _evidence_id,
+                    GLOBALTT['has_supporting_reference'],
+                    'PMID:' + scv_citation_id,
+                    rcvtriples)
+                # <:monarch_assoc><dc:source><PMID:scv_citation_id>
+                write_spo(
+                    monarch_assoc, 'dc:source', 'PMID:' + scv_citation_id,
+                    rcvtriples)
+
+                # <PMID:scv_citation_id><rdf:type><IAO:0000013>
+                write_spo(
+                    'PMID:' + scv_citation_id,
+                    'rdf:type', GLOBALTT['journal article'], rcvtriples)
+
+                # <PMID:scv_citation_id><SEPIO:0000123><literal>
+
+            scv_significance = scv_geno = None
+            SCV_Description = ClinicalSignificance.find('./Description')
+            if SCV_Description is not None:
+                scv_significance = SCV_Description.text.strip()
+                scv_geno = resolve(scv_significance)
+                unkwn = 'has_uncertain_significance_for_condition'
+                if scv_geno is not None and \
+                        LOCALTT[scv_significance] != unkwn and \
+                        scv_significance != 'protective':
+                    # we have the association's (SCV) pathnogicty call
+                    # and its significance is explicit
+                    ##########################################################
+                    # 2016 july.
+                    # We do not want any of the proceeding triples
+                    # unless we get here (no implicit "uncertain significance")
+                    # TRIPLES
+                    # <monarch_assoc>
+                    #   <OBAN:association_has_predicate>
+                    #       <scv_geno>
+                    write_spo(
+                        monarch_assoc,
+                        'OBAN:association_has_predicate',
+                        scv_geno,
+                        rcvtriples)
+                    # <rcv_variant_id><scv_geno><rcv_disease_db:rcv_disease_id>
+                    write_spo(
+                        genovar.id, scv_geno, rcv_disease_curie, rcvtriples)
+                    # <monarch_assoc><oboInOwl:hasdbxref><ClinVar:rcv_acc>  .
+                    write_spo(
+                        monarch_assoc,
+                        GLOBALTT['database_cross_reference'],
+                        'ClinVar:' + rcv_acc,
+                        rcvtriples)
+
+                    # store association's significance to compare w/sibs
+                    pathocalls[monarch_assoc] = scv_geno
+                else:
+                    del rcvtriples[:]
+                    continue
+            # if we have deleted the triples buffer then
+            # there is no point in continueing  (I don't think)
+            if not rcvtriples:
+                continue
+            # scv_assert_type = SCV_Assertion.find('./Assertion').get('Type')
+            # check scv_assert_type == 'variation to disease'?
+            # /SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
+            for SCV_ObsIn in SCV_Assertion.findall('./ObservedIn'):
+                # /SCV/ObservedIn/Sample
+                # /SCV/ObservedIn/Method
+                for SCV_ObsData in SCV_ObsIn.findall('./ObservedData'):
+                    for SCV_Citation in SCV_ObsData.findall('./Citation'):
+
+                        for scv_citation_id in SCV_Citation.findall(
+                                './ID[@Source="PubMed"]'):
+                            # has_supporting_reference
+                            # see also: SCV/ClinicalSignificance/Citation/ID
+                            # <_evidence_id><SEPIO:0000124><PMID:scv_citation_id>
+                            write_spo(
+                                _evidence_id,
+                                GLOBALTT['has_supporting_reference'],
+                                'PMID:' + scv_citation_id.text, rcvtriples)
+                            # <PMID:scv_citation_id><rdf:type><IAO:0000013>
+                            write_spo(
+                                'PMID:' + scv_citation_id.text,
+                                'rdf:type', GLOBALTT['journal article'],
+                                rcvtriples)
+
+                            # <:monarch_assoc><dc:source><PMID:scv_citation_id>
+                            write_spo(
+                                monarch_assoc,
+                                'dc:source',
+                                'PMID:' + scv_citation_id.text, rcvtriples)
+                        for scv_pub_comment in SCV_Citation.findall(
+                                './Attribute[@Type="Description"]'):
+                            # <PMID:scv_citation_id><rdf:comment><scv_pub_comment>
+                            write_spo(
+                                'PMID:' + scv_citation_id.text,
+                                'rdf:comment', scv_pub_comment, rcvtriples)
+                    # for SCV_Citation in SCV_ObsData.findall('./Citation'):
+                    for SCV_Description in SCV_ObsData.findall(
+                            'Attribute[@Type="Description"]'):
+                        # <_evidence_id> <dc:description> "description"
+                        if SCV_Description.text != 'not provided':
+                            write_spo(
+                                _evidence_id,
+                                'dc:description',
+                                SCV_Description.text,
+                                rcvtriples)
+
+                # /SCV/ObservedIn/TraitSet
+                # /SCV/ObservedIn/Citation
+                # /SCV/ObservedIn/Co-occurrenceSet
+                # /SCV/ObservedIn/Comment
+                # /SCV/ObservedIn/XRef
+
+                # /SCV/Sample/Origin
+                # /SCV/Sample/Species@TaxonomyId="9606" is a constant
+                # scv_affectedstatus = \
+                #    SCV_ObsIn.find('./Sample').find('./AffectedStatus').text
+
+                # /SCV/ObservedIn/Method/NamePlatform
+                # /SCV/ObservedIn/Method/TypePlatform
+                # /SCV/ObservedIn/Method/Description
+                # /SCV/ObservedIn/Method/SourceType
+                # /SCV/ObservedIn/Method/MethodType
+                # /SCV/ObservedIn/Method/MethodType
+                for SCV_OIMT in SCV_ObsIn.findall('./Method/MethodType'):
+                    if SCV_OIMT.text != 'not provided':
+                        scv_evidence_type = resolve(SCV_OIMT.text.strip())
+                        if scv_evidence_type is None:
+                            LOG.warning(
+                                'No mapping for scv_evidence_type: %s',
+                                SCV_OIMT.text)
+                            continue
+                        # blank node
+                        _provenance_id = '_:' + digest_id(
+                            _evidence_id + scv_evidence_type)
+
+                        write_spo(
+                            _provenance_id, 'rdfs:label',
+                            _evidence_id + scv_evidence_type, rcvtriples)
+
+                        # TRIPLES
+                        # has_provenance -> has_supporting_study
+                        # <_evidence_id><SEPIO:0000011><_provenence_id>
+                        write_spo(
+                            _evidence_id,
+                            GLOBALTT['has_supporting_activity'],
+                            _provenance_id,
+                            rcvtriples)
+
+                        # <_:provenance_id><rdf:type><scv_evidence_type>
+                        write_spo(
+                            _provenance_id, 'rdf:type', scv_evidence_type,
+                            rcvtriples)
+
+                        # <_:provenance_id><rdfs:label><SCV_OIMT.text>
+                        write_spo(
+                            _provenance_id, 'rdfs:label', SCV_OIMT.text,
+                            rcvtriples)
+            # End of a SCV (a.k.a. MONARCH association)
+    # End of the ClinVarSet.
+    # output triples that only are known after processing sibbling records
+    scv_link(pathocalls, rcvtriples)
+    return rcvtriples
+
+
+def chunk_to_triples(chunk, g2pmap, tables=None):
+    """
+    Worker for map_chunks()
+
+    :param chunk: bytes, consecutive ClinVarSet elements
+    :param g2pmap: dict of gene to the conditions curated for it
+    :param tables: (GLOBALTT, LOCALTT, CURIEMAP) to use, when overridden
+    :return: tuple of the unique ntriples, the rejected ClinVarSets (as xml)
+        and the number of ClinVarSets in the chunk
+    """
+    if tables is not None:
+        global GLOBALTT, LOCALTT, CURIEMAP
+        (GLOBALTT, LOCALTT, CURIEMAP) = tables
+
+    triples = set()
+    rejects = []
+    count = 0
+    for ClinVarSet in ET.fromstring(b'<ClinVarSets>' + chunk + b'</ClinVarSets>'):
+        count += 1
+        rcvtriples = clinvarset_to_triples(ClinVarSet, g2pmap)
+        if rcvtriples is None:
+            rejects.append(ET.tostring(ClinVarSet).decode('utf-8'))
+        else:
+            triples.update(rcvtriples)
+    return list(triples), rejects, count
+
+
+def map_chunks(chunks, g2pmap, tables, jobs=1):
+    """
+    chunk_to_triples() over each chunk, in order,
+    in a pool of `jobs` worker processes when there is more than one.
+    At most two chunks per worker are in flight at a time
+    so memory does not grow with the size of the release.
+    """
+    if jobs is None or jobs < 2:
+        for chunk in chunks:
+            yield chunk_to_triples(chunk, g2pmap, tables)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(chunk_to_triples, chunk, g2pmap, tables))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def split_clinvarsets(xml_fh, sets_per_chunk=CHUNK_SETS, block_size=2**22):
+    """
+    Cut a ClinVar release into chunks of whole ClinVarSet elements
+    by scanning for their start and end tags, without parsing the XML.
+
+    :param xml_fh: binary file handle on the (gunzipped) release
+    :param sets_per_chunk: number of ClinVarSet elements in each chunk
+    :param block_size: bytes to read at a time
+    :return: generator of bytes, first whatever precedes the first ClinVarSet
+        (the xml declaration and the ReleaseSet start tag) then the chunks
+    """
+    start_tag = b'<ClinVarSet'
+    end_tag = b'</ClinVarSet>'
+    buff = b''
+    prelude = None
+    batch = []
+    while True:
+        block = xml_fh.read(block_size)
+        buff += block
+        pos = 0
+        while True:
+            begin = buff.find(start_tag, pos)
+            if begin < 0:
+                break
+            if prelude is None:
+                prelude = buff[:begin]
+                yield prelude
+            end = buff.find(end_tag, begin)
+            if end < 0:
+                break
+            end += len(end_tag)
+            batch.append(buff[begin:end])
+            pos = end
+            if len(batch) >= sets_per_chunk:
+                yield b''.join(batch)
+                batch = []
+        buff = buff[pos:]
+        if not block:
+            break
+    if prelude is None:
+        yield buff
+    if batch:
+        yield b''.join(batch)
+
+
+def release_set(prelude):
+    """
+    :param prelude: bytes preceding the first ClinVarSet
+    :return: Element ReleaseSet (without children), None if not found
+    """
+    match = re.search(rb'<ReleaseSet\b[^>]*>', prelude)
+    if match is None:
+        return None
+    return ET.fromstring(match.group(0)[:-1] + b'/>')
+
+
 def parse():
     """
     Main function for parsing a clinvar XML release and outputting triples
@@ -613,6 +1329,10 @@ def parse():
         '-s', '--skolemize', default=True,
         help='default: True. False keeps plain blank nodes  "_:xxx"')
 
+    argparser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count(),
+        help='number of worker processes. default: number of cpus')
+
     args = argparser.parse_args()
 
     basename = re.sub(r'\.xml.gz$', '', args.filename)
@@ -640,7 +1360,6 @@ def parse():
         # no problem
         LOG.info("fresh start for %s", outfile)
 
-    outtmp = open(outfile, 'a')
     output = args.destination + '/' + args.output
 
     # catch and release input for future study
@@ -655,15 +1374,13 @@ def parse():
 
     # default to /dev/stdout if anything amiss
 
-    # Buffer to store the triples below a MONARCH_association
-    # before we decide to whether to keep or not"
-    rcvtriples = []
-
-    # Buffer to store non redundant triples between RCV sets
-    releasetriple = set()
+    # Store of non redundant triples between RCV sets,
+    # spooled to disk and sorted uniquely when written out
+    releasetriple = NTriplesWriter(dedup=True, tmpdir=args.destination)
 
     # make triples to relate each review status to Clinvar's "score" - 0 to 4 stars
-    # releasetriple.update(set(write_review_status_scores()))
+    # for triple in write_review_status_scores():
+    #     releasetriple.add(triple)
 
     g2pmap = {}
     # this needs to be read first
@@ -695,652 +1412,50 @@ def parse():
         global CURIEMAP
         CURIEMAP['_'] = '_:'
 
-    # Seed releasetriple to avoid union with the empty set
     # <MonarchData: + args.output> <a> <owl:Ontology>
     releasetriple.add(make_spo('MonarchData:' + args.output, 'a', 'owl:Ontology'))
 
     rjct_cnt = tot_cnt = 0
 
-    status_and_scores = {
-        "no assertion criteria provided": '0',
-        "no assertion provided": '0',
-        "criteria provided, single submitter": '1',
-        "criteria provided, conflicting interpretations": '1',
-        "criteria provided, multiple submitters, no conflicts": '2',
-        "reviewed by expert panel": '3',
-        "practice guideline": '4',
-    }
-
     #######################################################
     # main loop over xml
     # taken in chunks composed of ClinVarSet stanzas
-    with gzip.open(filename, 'rt') as clinvar_fh:
-        TREE = ET.iterparse(clinvar_fh)  # w/o specifing events it defaults to 'end'
-        for event, element in TREE:
-            if element.tag != 'ClinVarSet':
-                ReleaseSet = element
-                continue
-            else:
-                ClinVarSet = element
-                tot_cnt += 1
-
-            if ClinVarSet.find('RecordStatus').text != 'current':
-                LOG.warning(
-                    "%s is not current", ClinVarSet.get('ID'))
-
-            RCVAssertion = ClinVarSet.find('./ReferenceClinVarAssertion')
-            # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/ClinVarAccession/@Acc
-            # 162,466  2016-Mar
-            rcv_acc = RCVAssertion.find('./ClinVarAccession').get('Acc')
-
-            # I do not expect we care as we shouldn't keep the RCV.
-            if RCVAssertion.find('./RecordStatus').text != 'current':
-                LOG.warning(
-                    "%s <is not current on>", rcv_acc)  # + rs_dated)
-
-            ClinicalSignificance = RCVAssertion.find(
-                './ClinicalSignificance/Description').text
-            significance = resolve(ClinicalSignificance)
-
-            # # # Child elements
-            #
-            # /RCV/Assertion
-            # /RCV/AttributeSet
-            # /RCV/Citation
-            # /RCV/ClinVarAccession
-            # /RCV/ClinicalSignificance
-            # /RCV/MeasureSet
-            # /RCV/ObservedIn
-            # /RCV/RecordStatus
-            # /RCV/TraitSet
-
-            RCV_ClinicalSignificance = RCVAssertion.find('./ClinicalSignificance')
-            if RCV_ClinicalSignificance is not None:
-                RCV_ReviewStatus = RCV_ClinicalSignificance.find('./ReviewStatus')
-                if RCV_ReviewStatus is not None:
-                    rcv_review = RCV_ReviewStatus.text.strip()
-
-            #######################################################################
-            # Our Genotype/Subject is a sequence alteration / Variant
-            # which apparently was Measured
-
-            # /ReleaseSet/ClinVarSet/ReferenceClinVarAssertion/MeasureSet/@ID
-            # 162,466  2016-Mar
-            # 366,566  2017-Mar
-
-            # are now >4 types
-            # <GenotypeSet ID="424700" Type="CompoundHeterozygote">
-            # <MeasureSet  ID="242681" Type="Variant">
-            # <MeasureSet  ID="123456" Type="Haplotype">
-            # <Measure     ID="46900"  Type="single nucleotide variant">
-
-            # As of 04/2019
-            # Measure is no longer a direct child of ReferenceClinVarAssertion
-            # Unless a MeasureSet Type="Variant", both the MeasureSet ID and Measure IDs
-            # will be resolvable, eg:
-            # https://www.ncbi.nlm.nih.gov/clinvar/variation/431733/
-            # https://www.ncbi.nlm.nih.gov/clinvar/variation/425238/
-
-            # If MeasureSet Type == Variant, make the ID the child ID
-            # Genotypes can have >1 MeasureSets (Variants)
-            # MeasureSets can have >1 Measures (Alleles)
-            # Measures (Alleles) can have >1 gene
-
-            RCV_MeasureSet = RCVAssertion.find('./MeasureSet')
-            # Note: it is a "set" but have only seen a half dozen with two,
-            # all of type:  copy number gain  SO:0001742
-
-            genovar = None  # Union[Genotype, Variant, None]
-
-            if RCV_MeasureSet is None:
-                #  201705 introduced GenotypeSet a CompoundHeterozygote
-                #  with multiple variants
-                RCV_GenotypeSet = RCVAssertion.find('./GenotypeSet')
-                genovar = Genotype(
-                    id="ClinVarVariant:" + RCV_GenotypeSet.get('ID'),
-                    label=RCV_GenotypeSet.find(
-                        './Name/ElementValue[@Type="Preferred"]').text,
-                    variant_type=RCV_GenotypeSet.get('Type')
-                )
-                for RCV_MeasureSet in RCV_GenotypeSet.findall('./MeasureSet'):
-                    genovar.variants.append(
-                        process_measure_set(RCV_MeasureSet, rcv_acc))
-            else:
-                genovar = process_measure_set(RCV_MeasureSet, rcv_acc)
-
-            # Create ClinVarRecord object
-            rcv = ClinVarRecord(
-                id=RCVAssertion.get('ID'),
-                accession=rcv_acc,
-                created=RCVAssertion.get('DateCreated'),
-                updated=RCVAssertion.get('DateLastUpdated'),
-                genovar=genovar,
-                significance=significance
-            )
-
-            #######################################################################
-            # the Object is the Disease, here is called a "trait"
-            # reluctantly starting with the RCV disease
-            # not the SCV traits as submitted due to time constraints
-
-            for RCV_TraitSet in RCVAssertion.findall('./TraitSet'):
-                # /RCV/TraitSet/Trait[@Type="Disease"]/@ID
-                # 144,327   2016-Mar
-
-                # /RCV/TraitSet/Trait[@Type="Disease"]/XRef/@DB
-                #     29 Human Phenotype Ontology
-                #     82 EFO
-                #    659 Gene
-                #  53218 Orphanet
-                #  57356 OMIM
-                # 142532 MedGen
-
-                for RCV_Trait in RCV_TraitSet.findall('./Trait[@Type="Disease"]'):
-                    has_medgen_id = False
-                    rcv_disease_db = None
-                    rcv_disease_id = None
-                    medgen_id = None
-                    disease_label = None
-
-                    RCV_TraitName = RCV_Trait.find(
-                        './Name/ElementValue[@Type="Preferred"]')
-
-                    if RCV_TraitName is not None:
-                        disease_label = RCV_TraitName.text
-                    # else:
-                    #    LOG.warning(rcv_acc + " MISSING DISEASE NAME")
-
-                    for RCV_TraitXRef in RCV_Trait.findall('./XRef[@DB="OMIM"]'):
-                        rcv_disease_db = RCV_TraitXRef.get('DB')
-                        rcv_disease_id = RCV_TraitXRef.get('ID')
-                        if rcv_disease_id.startswith('PS'):
-                            rcv_disease_db = 'OMIMPS'
-                        break
-
-                    # Accept Orphanet if no OMIM
-                    if rcv_disease_db is None or rcv_disease_id is None:
-                        if rcv_disease_db is not None:
-                            break
-                        for RCV_TraitXRef in RCV_Trait.findall(
-                                './XRef[@DB="Orphanet"]'):
-                            rcv_disease_db = 'ORPHA'  # RCV_TraitXRef.get('DB')
-                            rcv_disease_id = RCV_TraitXRef.get('ID')
-                            break
-
-                    # Always get medgen for g2p mapping file
-                    for RCV_TraitXRef in RCV_Trait.findall('./XRef[@DB="MedGen"]'):
-                        has_medgen_id = True
-                        medgen_id = RCV_TraitXRef.get('ID')
-                        break
-
-                    if rcv_disease_db is None and has_medgen_id:
-                        # use UMLS prefix instead of MedGen
-                        # see https://github.com/monarch-initiative/dipper/issues/874
-                        rcv_disease_db = 'UMLS'  # RCV_TraitXRef.get('DB')
-                    if rcv_disease_id is None and has_medgen_id:
-                        rcv_disease_id = medgen_id
-
-                    # See if there are any leftovers. Possibilities include:
-                    # EFO, Gene, Human Phenotype Ontology
-                    if rcv_disease_db is None:
-                        for RCV_TraitXRef in RCV_Trait.findall('./XRef'):
-                            LOG.warning(
-                                rcv_acc + " UNKNOWN DISEASE DB:\t" +
-                                RCV_TraitXRef.get('DB') + ":" + RCV_TraitXRef.get('ID'))
-                            # 82372 MedGen
-                            #    58 EFO
-                            #     1 Human Phenotype Ontology
-                            break
-
-                    rcv.conditions.append(Condition(
-                        id=rcv_disease_id,
-                        label=disease_label,
-                        database=rcv_disease_db,
-                        medgen_id=medgen_id
-                    ))
-
-            # Check that we have enough info from the RCV
-            # to justify parsing the related SCVs
-            # check that no members of rcv.genovar are none
-            # and that at least one condition has an id and db
-            if [1 for member in vars(rcv.genovar) if member is None] \
-                    or not [
-                        1 for condition in rcv.conditions
-                        if condition.id is not None and
-                        condition.database is not None]:
-                LOG.info('%s is under specified. SKIPPING', rcv_acc)
+    # each converted to triples by clinvarset_to_triples() in a worker process
+    with gzip.open(filename, 'rb') as clinvar_fh:
+        chunks = split_clinvarsets(clinvar_fh)
+        ReleaseSet = release_set(next(chunks))
+        tables = (GLOBALTT, LOCALTT, CURIEMAP)
+        for triples, rejects, count in map_chunks(chunks, g2pmap, tables, args.jobs):
+            tot_cnt += count
+            for triple in triples:
+                releasetriple.add(triple)
+            for rejected in rejects:
                 rjct_cnt += 1
                 # Write this Clinvar set out so we can know what we are missing
-                print(
-                    # minidom.parseString(
-                    #    ET.tostring(
-                    #        ClinVarSet)).toprettyxml(
-                    #           indent="   "), file=reject)
-                    #  too slow. doubles time
-                    ET.tostring(ClinVarSet).decode('utf-8'), file=reject)
-                ClinVarSet.clear()
-                continue
-
-            # start anew
-            del rcvtriples[:]
-
-            # At this point we should have a ClinVarRecord object with all
-            # necessary data.  Next convert it to triples
-            record_to_triples(rcv, rcvtriples, g2pmap)
-
-            #######################################################################
-            # Descend into each SCV grouped with the current RCV
-            #######################################################################
-
-            # keep a collection of a SCV's associations and patho significance call
-            # when this RCV's set is complete, interlink based on patho call
-
-            pathocalls = {}
-
-            for SCV_Assertion in ClinVarSet.findall('./ClinVarAssertion'):
-
-                # /SCV/AdditionalSubmitters
-                # /SCV/Assertion
-                # /SCV/AttributeSet
-                # /SCV/Citation
-                # /SCV/ClinVarAccession
-                # /SCV/ClinVarSubmissionID
-                # /SCV/ClinicalSignificance
-                # /SCV/Comment
-                # /SCV/CustomAssertionScore
-                # /SCV/ExternalID
-                # /SCV/MeasureSet
-                # /SCV/ObservedIn
-                # /SCV/RecordStatus
-                # /SCV/StudyDescription
-                # /SCV/StudyName
-                # /SCV/TraitSet
-
-                # init
-                # scv_review = scv_significance = None
-                # scv_assertcount += 1
-
-                for condition in rcv.conditions:
-
-                    if condition.database is None:
-                        continue
-
-                    rcv_disease_curie = condition.database + ':' + condition.id
-
-                    scv_id = SCV_Assertion.get('ID')
-                    monarch_id = digest_id(rcv.id + scv_id + condition.id)
-                    monarch_assoc = 'MONARCH:' + monarch_id
-
-                    # if we parsed a review status up above, attach this review status
-                    # to this association to allow filtering of RCV by review status
-                    if rcv_review is not None:
-                        write_spo(
-                            monarch_assoc,
-                                  GLOBALTT['assertion_confidence_score'],
-                            status_and_scores[rcv_review],
-                            rcvtriples)
-
-                    ClinVarAccession = SCV_Assertion.find('./ClinVarAccession')
-                    scv_acc = ClinVarAccession.get('Acc')
-                    scv_accver = ClinVarAccession.get('Version')
-                    scv_orgid = ClinVarAccession.get('OrgID')
-                    # scv_updated = ClinVarAccession.get('DateUpdated')  # not used
-                    SCV_SubmissionID = SCV_Assertion.find('./ClinVarSubmissionID')
-                    if SCV_SubmissionID is not None:
-                        scv_submitter = SCV_SubmissionID.get('submitter')
-
-                    # blank node identifiers
-                    _evidence_id = '_:' + digest_id(monarch_id + '_evidence')
-                    write_spo(
-                        _evidence_id, 'rdfs:label', monarch_id + '_evidence',
-                        rcvtriples)
-
-                    _assertion_id = '_:' + digest_id(monarch_id + '_assertion')
-                    write_spo(
-                        _assertion_id, 'rdfs:label', monarch_id + '_assertion',
-                        rcvtriples)
-
-                    #                   TRIPLES
-                    # <monarch_assoc><rdf:type><OBAN:association>  .
-                    write_spo(monarch_assoc, 'rdf:type', 'OBAN:association', rcvtriples)
-                    # <monarch_assoc>
-                    #   <OBAN:association_has_subject>
-                    #       <ClinVarVariant:rcv_variant_id>
-                    write_spo(
-                        monarch_assoc, 'OBAN:association_has_subject', rcv.genovar.id,
-                        rcvtriples)
-                    # <ClinVarVariant:rcv_variant_id><rdfs:label><rcv.variant.label>  .
-
-                    # <monarch_assoc><OBAN:association_has_object><rcv_disease_curi>  .
-                    write_spo(
-                        monarch_assoc, 'OBAN:association_has_object', rcv_disease_curie,
-                        rcvtriples)
-                    # <rcv_disease_curi><rdfs:label><rcv_disease_label>  .
-                    # medgen might not have a disease label
-                    if condition.label is not None:
-                        write_spo(
-                            rcv_disease_curie, 'rdfs:label', condition.label,
-                            rcvtriples)
-
-                    # <monarch_assoc><SEPIO:0000007><:_evidence_id>  .
-                    write_spo(
-                        monarch_assoc,
-                        GLOBALTT['has_supporting_evidence_line'],
-                        _evidence_id,
-                        rcvtriples)
-                    # <monarch_assoc><SEPIO:0000015><:_assertion_id>  .
-                    write_spo(
-                        monarch_assoc,
-                        GLOBALTT['is_asserted_in'],
-                        _assertion_id,
-                        rcvtriples)
-
-                    # <:_evidence_id><rdf:type><ECO:0000000> .
-                    write_spo(
-                        _evidence_id, 'rdf:type', GLOBALTT['evidence'], rcvtriples)
-
-                    # <:_assertion_id><rdf:type><SEPIO:0000001> .
-                    write_spo(
-                        _assertion_id, 'rdf:type', GLOBALTT['assertion'], rcvtriples)
-                    # <:_assertion_id><rdfs:label><'assertion'>  .
-                    write_spo(
-                        _assertion_id, 'rdfs:label', 'ClinVarAssertion_' + scv_id,
-                        rcvtriples)
-
-                    # <:_assertion_id><SEPIO_0000111><:_evidence_id>
-                    write_spo(
-                        _assertion_id,
-                        GLOBALTT['is_assertion_supported_by_evidence'], _evidence_id,
-                        rcvtriples)
-
-                    # <:_assertion_id><dc:identifier><scv_acc + '.' + scv_accver>
-                    write_spo(
-                        _assertion_id, 'dc:identifier', scv_acc + '.' + scv_accver,
-                        rcvtriples)
-                    # <:_assertion_id><SEPIO:0000018><ClinVarSubmitters:scv_orgid>  .
-                    write_spo(
-                        _assertion_id,
-                        GLOBALTT['created_by'],
-                        'ClinVarSubmitters:' + scv_orgid,
-                        rcvtriples)
-                    # <ClinVarSubmitters:scv_orgid><rdf:type><foaf:organization>  .
-                    write_spo(
-                        'ClinVarSubmitters:' + scv_orgid,
-                        'rdf:type',
-                        'foaf:organization',
-                        rcvtriples)
-                    # <ClinVarSubmitters:scv_orgid><rdfs:label><scv_submitter>  .
-                    write_spo(
-                        'ClinVarSubmitters:' + scv_orgid, 'rdfs:label', scv_submitter,
-                        rcvtriples)
-                    ################################################################
-                    ClinicalSignificance = SCV_Assertion.find('./ClinicalSignificance')
-                    if ClinicalSignificance is not None:
-                        scv_eval_date = str(
-                            ClinicalSignificance.get('DateLastEvaluated'))
-
-                    # bummer. cannot specify xpath parent '..' targeting above .find()
-                    for SCV_AttributeSet in SCV_Assertion.findall('./AttributeSet'):
-                        # /SCV/AttributeSet/Attribute[@Type="AssertionMethod"]
-                        SCV_Attribute = SCV_AttributeSet.find(
-                            './Attribute[@Type="AssertionMethod"]')
-                        if SCV_Attribute is not None:
-                            SCV_Citation = SCV_AttributeSet.find('./Citation')
-
-                            # <:_assertion_id><SEPIO:0000021><scv_eval_date>  .
-                            if scv_eval_date != "None":
-                                write_spo(
-                                    _assertion_id,
-                                    GLOBALTT['Date Created'],
-                                    scv_eval_date,
-                                    rcvtriples)
-
-                            scv_assert_method = SCV_Attribute.text
-                            #  need to be mapped to a <sepio:100...n> curie ????
-                            # if scv_assert_method in TT:
-                            # scv_assert_id = resolve(scv_assert_method)
-                            # _assertion_method_id = '_:' + monarch_id + \
-                            #    '_assertionmethod_' + digest_id(scv_assert_method)
-                            #
-                            # changing to not include context till we have IRI
-
-                            # blank node, would be be nice if these were only made once
-                            _assertion_method_id = '_:' + digest_id(
-                                scv_assert_method + '_assertionmethod')
-                            write_spo(
-                                _assertion_method_id, 'rdfs:label',
-                                scv_assert_method + '_assertionmethod',
-                                rcvtriples)
-
-                            #       TRIPLES   specified_by
-                            # <:_assertion_id><SEPIO:0000041><_assertion_method_id>
-                            write_spo(
-                                _assertion_id, GLOBALTT['is_specified_by'],
-                                _assertion_method_id,
-                                rcvtriples)
-
-                            # <_assertion_method_id><rdf:type><SEPIO:0000037>
-                            write_spo(
-                                _assertion_method_id,
-                                'rdf:type',
-                                GLOBALTT['assertion method'],
-                                rcvtriples)
-
-                            # <_assertion_method_id><rdfs:label><scv_assert_method>
-                            write_spo(
-                                _assertion_method_id, 'rdfs:label', scv_assert_method,
-                                rcvtriples)
-
-                            # <_assertion_method_id><ERO:0000480><scv_citation_url>
-                            if SCV_Citation is not None:
-                                SCV_Citation_URL = SCV_Citation.find('./URL')
-                                if SCV_Citation_URL is not None:
-                                    write_spo(
-                                        _assertion_method_id, GLOBALTT['has_url'],
-                                        SCV_Citation_URL.text, rcvtriples)
-
-                    # scv_type = ClinVarAccession.get('Type')  # assert == 'SCV' ?
-                    # RecordStatus                             # assert =='current' ?
-
-                    # SCV_ReviewStatus = ClinicalSignificance.find('./ReviewStatus')
-                    # if SCV_ReviewStatus is not None:
-                    #    scv_review = SCV_ReviewStatus.text
-
-                    # SCV/ClinicalSignificance/Citation/ID
-                    # see also:
-                    # SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
-                    for SCV_Citation in ClinicalSignificance.findall(
-                            './Citation/ID[@Source="PubMed"]'):
-                        scv_citation_id = SCV_Citation.text
-                        #           TRIPLES
-                        # has_part -> has_supporting_reference
-                        # <:_evidence_id><SEPIO:0000124><PMID:scv_citation_id>  .
-                        write_spo(
-                            _evidence_id,
-                            GLOBALTT['has_supporting_reference'],
-                            'PMID:' + scv_citation_id,
-                            rcvtriples)
-                        # <:monarch_assoc><dc:source><PMID:scv_citation_id>
-                        write_spo(
-                            monarch_assoc, 'dc:source', 'PMID:' + scv_citation_id,
-                            rcvtriples)
-
-                        # <PMID:scv_citation_id><rdf:type><IAO:0000013>
-                        write_spo(
-                            'PMID:' + scv_citation_id,
-                            'rdf:type', GLOBALTT['journal article'], rcvtriples)
-
-                        # <PMID:scv_citation_id><SEPIO:0000123><literal>
-
-                    scv_significance = scv_geno = None
-                    SCV_Description = ClinicalSignificance.find('./Description')
-                    if SCV_Description is not None:
-                        scv_significance = SCV_Description.text.strip()
-                        scv_geno = resolve(scv_significance)
-                        unkwn = 'has_uncertain_significance_for_condition'
-                        if scv_geno is not None and \
-                                LOCALTT[scv_significance] != unkwn and \
-                                scv_significance != 'protective':
-                            # we have the association's (SCV) pathnogicty call
-                            # and its significance is explicit
-                            ##########################################################
-                            # 2016 july.
-                            # We do not want any of the proceeding triples
-                            # unless we get here (no implicit "uncertain significance")
-                            # TRIPLES
-                            # <monarch_assoc>
-                            #   <OBAN:association_has_predicate>
-                            #       <scv_geno>
-                            write_spo(
-                                monarch_assoc,
-                                'OBAN:association_has_predicate',
-                                scv_geno,
-                                rcvtriples)
-                            # <rcv_variant_id><scv_geno><rcv_disease_db:rcv_disease_id>
-                            write_spo(
-                                genovar.id, scv_geno, rcv_disease_curie, rcvtriples)
-                            # <monarch_assoc><oboInOwl:hasdbxref><ClinVar:rcv_acc>  .
-                            write_spo(
-                                monarch_assoc,
-                                GLOBALTT['database_cross_reference'],
-                                'ClinVar:' + rcv_acc,
-                                rcvtriples)
-
-                            # store association's significance to compare w/sibs
-                            pathocalls[monarch_assoc] = scv_geno
-                        else:
-                            del rcvtriples[:]
-                            continue
-                    # if we have deleted the triples buffer then
-                    # there is no point in continueing  (I don't think)
-                    if not rcvtriples:
-                        continue
-                    # scv_assert_type = SCV_Assertion.find('./Assertion').get('Type')
-                    # check scv_assert_type == 'variation to disease'?
-                    # /SCV/ObservedIn/ObservedData/Citation/'ID[@Source="PubMed"]
-                    for SCV_ObsIn in SCV_Assertion.findall('./ObservedIn'):
-                        # /SCV/ObservedIn/Sample
-                        # /SCV/ObservedIn/Method
-                        for SCV_ObsData in SCV_ObsIn.findall('./ObservedData'):
-                            for SCV_Citation in SCV_ObsData.findall('./Citation'):
-
-                                for scv_citation_id in SCV_Citation.findall(
-                                        './ID[@Source="PubMed"]'):
-                                    # has_supporting_reference
-                                    # see also: SCV/ClinicalSignificance/Citation/ID
-                                    # <_evidence_id><SEPIO:0000124><PMID:scv_citation_id>
-                                    write_spo(
-                                        _evidence_id,
-                                        GLOBALTT['has_supporting_reference'],
-                                        'PMID:' + scv_citation_id.text, rcvtriples)
-                                    # <PMID:scv_citation_id><rdf:type><IAO:0000013>
-                                    write_spo(
-                                        'PMID:' + scv_citation_id.text,
-                                        'rdf:type', GLOBALTT['journal article'],
-                                        rcvtriples)
-
-                                    # <:monarch_assoc><dc:source><PMID:scv_citation_id>
-                                    write_spo(
-                                        monarch_assoc,
-                                        'dc:source',
-                                        'PMID:' + scv_citation_id.text, rcvtriples)
-                                for scv_pub_comment in SCV_Citation.findall(
-                                        './Attribute[@Type="Description"]'):
-                                    # <PMID:scv_citation_id><rdf:comment><scv_pub_comment>
-                                    write_spo(
-                                        'PMID:' + scv_citation_id.text,
-                                        'rdf:comment', scv_pub_comment, rcvtriples)
-                            # for SCV_Citation in SCV_ObsData.findall('./Citation'):
-                            for SCV_Description in SCV_ObsData.findall(
-                                    'Attribute[@Type="Description"]'):
-                                # <_evidence_id> <dc:description> "description"
-                                if SCV_Description.text != 'not provided':
-                                    write_spo(
-                                        _evidence_id,
-                                        'dc:description',
-                                        SCV_Description.text,
-                                        rcvtriples)
-
-                        # /SCV/ObservedIn/TraitSet
-                        # /SCV/ObservedIn/Citation
-                        # /SCV/ObservedIn/Co-occurrenceSet
-                        # /SCV/ObservedIn/Comment
-                        # /SCV/ObservedIn/XRef
-
-                        # /SCV/Sample/Origin
-                        # /SCV/Sample/Species@TaxonomyId="9606" is a constant
-                        # scv_affectedstatus = \
-                        #    SCV_ObsIn.find('./Sample').find('./AffectedStatus').text
-
-                        # /SCV/ObservedIn/Method/NamePlatform
-                        # /SCV/ObservedIn/Method/TypePlatform
-                        # /SCV/ObservedIn/Method/Description
-                        # /SCV/ObservedIn/Method/SourceType
-                        # /SCV/ObservedIn/Method/MethodType
-                        # /SCV/ObservedIn/Method/MethodType
-                        for SCV_OIMT in SCV_ObsIn.findall('./Method/MethodType'):
-                            if SCV_OIMT.text != 'not provided':
-                                scv_evidence_type = resolve(SCV_OIMT.text.strip())
-                                if scv_evidence_type is None:
-                                    LOG.warning(
-                                        'No mapping for scv_evidence_type: %s',
-                                        SCV_OIMT.text)
-                                    continue
-                                # blank node
-                                _provenance_id = '_:' + digest_id(
-                                    _evidence_id + scv_evidence_type)
-
-                                write_spo(
-                                    _provenance_id, 'rdfs:label',
-                                    _evidence_id + scv_evidence_type, rcvtriples)
-
-                                # TRIPLES
-                                # has_provenance -> has_supporting_study
-                                # <_evidence_id><SEPIO:0000011><_provenence_id>
-                                write_spo(
-                                    _evidence_id,
-                                    GLOBALTT['has_supporting_activity'],
-                                    _provenance_id,
-                                    rcvtriples)
-
-                                # <_:provenance_id><rdf:type><scv_evidence_type>
-                                write_spo(
-                                    _provenance_id, 'rdf:type', scv_evidence_type,
-                                    rcvtriples)
-
-                                # <_:provenance_id><rdfs:label><SCV_OIMT.text>
-                                write_spo(
-                                    _provenance_id, 'rdfs:label', SCV_OIMT.text,
-                                    rcvtriples)
-                    # End of a SCV (a.k.a. MONARCH association)
-            # End of the ClinVarSet.
-            # output triples that only are known after processing sibbling records
-            scv_link(pathocalls, rcvtriples)
-            # put this RCV's triples in the SET of all triples in this data release
-            releasetriple.update(set(rcvtriples))
-            del rcvtriples[:]
-            ClinVarSet.clear()
+                print(rejected, file=reject)
 
         ###############################################################
         # first in is last out
         if ReleaseSet is not None and ReleaseSet.get('Type') != 'full':
             LOG.warning('Not a full release')
-        rs_dated = ReleaseSet.get('Dated')  # "2016-03-01 (date_last_seen)
-        releasetriple.add(
-            make_spo('MonarchData:' + args.output, 'owl:versionInfo', rs_dated))
+        if ReleaseSet is not None:
+            rs_dated = ReleaseSet.get('Dated')  # "2016-03-01 (date_last_seen)
+            releasetriple.add(
+                make_spo('MonarchData:' + args.output, 'owl:versionInfo', rs_dated))
         # not finalized
         # releasetriple.add(
         #     make_spo(
         #        'MonarchData:' + args.output, owl:versionIRI,
         #        'MonarchArchive:' RELEASEDATE + '/ttl/' + args.output'))
 
-        # write all remaining triples out
-        print('\n'.join(list(releasetriple)), file=outtmp)
+    # write all remaining triples out
+    with open(outfile, 'wb') as outtmp:
+        releasetriple.write_to(outtmp, 'nt')
+    releasetriple.close()
     if rjct_cnt > 0:
         LOG.warning(
             'The %i out of %i records not included are written back to \n%s',
             rjct_cnt, tot_cnt, str(reject))
-    outtmp.close()
     reject.close()
     os.replace(outfile, output)
 
@@ -4,7 +4,6 @@ import re
 from datetime import datetime
 import stat
 import os
-import pysftp
 
 from dipper.sources.Source import Source
 from dipper import config
@@ -118,7 +117,8 @@ class Coriell(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -127,6 +127,7 @@ class Coriell(Source):
             ingest_title='Coriell Institute for Medical Research',
             ingest_url='https://ccr.coriell.org/',
             ingest_logo='source-coriell.png',
+            argv=argv,
             # website disclaimer 'https://www.coriell.org/1/About-Us/Legal-Notice'
             # wet material https://www.coriell.org/1/NINDS/About/Shared-Usage-Guidelines
             # license_url=None,
@@ -171,6 +172,8 @@ class Coriell(Source):
 
         """
 
+        import pysftp
+
         host = config.get_config()['dbauth']['coriell']['host']
         key = config.get_config()['dbauth']['coriell']['private_key']
         user = config.get_config()['user']['coriell']
@@ -43,7 +43,8 @@ class Decipher(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -54,6 +55,7 @@ class Decipher(Source):
             ingest_logo='source-decipher.png',
             license_url='https://decipher.sanger.ac.uk/legal',
             data_rights='https://decipher.sanger.ac.uk/datasharing',
+            argv=argv,
             # file_handle=None
         )
 
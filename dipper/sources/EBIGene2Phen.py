@@ -74,7 +74,8 @@ class EBIGene2Phen(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -85,7 +86,8 @@ class EBIGene2Phen(Source):
             ingest_logo='source-ebigene2phen.png',
             license_url=None,
             data_rights='https://www.ebi.ac.uk/about/terms-of-use',
-            file_handle=None
+            file_handle=None,
+            argv=argv
         )
 
         # Load mondo map file
@@ -86,7 +86,8 @@ class EOM(PostgreSQLSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -96,7 +97,8 @@ class EOM(PostgreSQLSource):
             ingest_url='http://elementsofmorphology.nih.gov',
             ingest_logo='source-eom.png',
             data_rights='http://www.genome.gov/copyright.cfm',
-            license_url='https://creativecommons.org/publicdomain/mark/1.0/'
+            license_url='https://creativecommons.org/publicdomain/mark/1.0/',
+            argv=argv
             # file_handle=None
         )
 
@@ -73,7 +73,8 @@ class Ensembl(Source):
                  are_bnodes_skolemized,
                  data_release_version=None,
                  tax_ids=None,
-                 gene_ids=None):
+                 gene_ids=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -82,6 +83,7 @@ class Ensembl(Source):
             ingest_title='ENSEMBL',
             ingest_url='http://uswest.ensembl.org',
             ingest_logo='source-ensembl.png',
+            argv=argv,
             # license_url=None,
             # data_rights=None,
             # file_handle=None
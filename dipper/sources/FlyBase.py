@@ -133,7 +133,8 @@ class FlyBase(PostgreSQLSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -144,7 +145,8 @@ class FlyBase(PostgreSQLSource):
             ingest_logo='source-flybase.png',
             license_url=None,
             data_rights='https://wiki.flybase.org/wiki/FlyBase_Wiki:General_disclaimer',
-            file_handle=None
+            file_handle=None,
+            argv=argv
             )
 
     def fetch(self, is_dl_forced=False):
@@ -165,13 +167,13 @@ class FlyBase(PostgreSQLSource):
                      '/', cxn['database'])), is_object_literal=True)
 
         # Get data from remote db
-        # Each query takes 2 minutes or so
+        # Each query takes 2 minutes or so, run them concurrently
+        queries = {}
         for query_map in self.queries.values():
-            query_fh = open(os.path.join(
-                os.path.dirname(__file__), query_map['query']), 'r')
-            query = query_fh.read()
-            self.fetch_query_from_pgdb(
-                query_map['file'], query, None, cxn)
+            with open(os.path.join(
+                    os.path.dirname(__file__), query_map['query']), 'r') as query_fh:
+                queries[query_map['file']] = query_fh.read()
+        self.fetch_queries_from_pgdb(queries, cxn)
 
         # Get flat file's current name on the remote server
         ftp = FTP(FlyBase.FLYFTP)
@@ -10,7 +10,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Reference import Reference
 from dipper.models.GenomicFeature import Feature, makeChromID
-from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.OntologySnapshot import OntologySnapshot
 
 logging.getLogger().setLevel(logging.WARN)
 LOG = logging.getLogger(__name__)
@@ -97,7 +97,8 @@ class GWASCatalog(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -108,7 +109,8 @@ class GWASCatalog(Source):
             ingest_url='http://www.ebi.ac.uk/gwas/',
             ingest_logo='source-gwascatalog.png',
             license_url=None,
-            data_rights='http://www.ebi.ac.uk/gwas/docs/about'
+            data_rights='http://www.ebi.ac.uk/gwas/docs/about',
+            argv=argv
             # file_handle=None
         )
 
@@ -154,11 +156,16 @@ class GWASCatalog(Source):
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Processing Data from %s", raw)
 
-        so_ontology = RDFGraph(False, "SO")
-        LOG.info("Loading SO ontology in separate rdf graph")
-        so_ontology.parse(self.files['so']['url'], format='xml')
-        so_ontology.bind_all_namespaces()
-        LOG.info("Finished loading SO ontology")
+        # SO was fetched along with the catalog,
+        # its terms are only extracted again when it changes
+        so_ontology = OntologySnapshot(
+            self.files['so']['url'], self.rawdir, offline=True, store=self.store
+        ).terms()
+        if not so_ontology.labels:
+            # without it every variant to gene relation would be dropped
+            raise ValueError(
+                "No SO terms from {}/{}".format(self.rawdir, self.files['so']['file']))
+        LOG.info("Loaded %i SO terms", len(so_ontology.labels))
 
         mondo_file = '/'.join((self.rawdir, self.files['mondo']['file']))
         with open(mondo_file, 'r') as mondo_fh:
@@ -360,19 +367,15 @@ class GWASCatalog(Source):
                         mapped_genes, snp_labels)  # hap_label)
                 else:
                     so_class = self.resolve(context_list[index])
-                    so_query = """
-        SELECT ?variant_label
-        WHERE {{
-            {0} rdfs:subClassOf+ {1} ;
-            rdfs:label ?variant_label .
-        }}
-                    """.format(so_class, self.globaltt['gene_variant'])
-
-                    query_result = so_ontology.query(so_query)
+                    so_iri = self.graph.curie_util.get_uri(so_class)
+                    is_gene_variant = so_ontology.is_subclass_of(
+                        so_iri,
+                        self.graph.curie_util.get_uri(self.globaltt['gene_variant'])
+                    ) and so_ontology.label(so_iri) is not None
 
                     gene_id = DipperUtil.get_hgnc_id_from_symbol(mapped_genes[index])
 
-                    if gene_id is not None and len(list(query_result)) == 1:
+                    if gene_id is not None and is_gene_variant:
                         if context_list[index] in ['upstream_gene_variant',
                                                    'downstream_gene_variant']:
                             graph.addTriple(
@@ -8,15 +8,13 @@ import os
 
 import yaml
 
-from dipper.sources.ZFIN import ZFIN
-from dipper.sources.WormBase import WormBase
 from dipper.sources.Source import Source
 from dipper.models.assoc.Association import Assoc
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
-from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.UniProtIdMap import UniProtIdMap
 
 
 LOG = logging.getLogger(__name__)
@@ -199,7 +197,8 @@ class GeneOntology(Source):
                  graph_type,
                  are_bnodes_skolemized,
                  data_release_version=None,
-                 tax_ids=None):
+                 tax_ids=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -209,7 +208,8 @@ class GeneOntology(Source):
             ingest_url='http://www.geneontology.org',
             ingest_logo='source-geneontology.png',
             license_url=None,
-            data_rights='http://geneontology.org/page/use-and-license'
+            data_rights='http://geneontology.org/page/use-and-license',
+            argv=argv
             # file_handle=None
         )
         self.test_ids = []
@@ -229,9 +229,12 @@ class GeneOntology(Source):
 
         # moving this from process_gaf() to avoid repeating this for each
         # file to be processed.
+        # their modules are only imported for the taxa that need them
         if '7955' in self.tax_ids:
+            from dipper.sources.ZFIN import ZFIN
             self.zfin = ZFIN(self.graph_type, self.are_bnodes_skized)
         if '6239' in self.tax_ids:
+            from dipper.sources.WormBase import WormBase
             self.wbase = WormBase(self.graph_type, self.are_bnodes_skized)
 
         if 'gene' not in self.all_test_ids:
@@ -487,71 +490,30 @@ class GeneOntology(Source):
                 uniprot_per, uniprot_tot)
 
     def get_uniprot_entrez_id_map(self):
+        """
+        UniProt accessions of our taxa to 1:1 Entrez (or else Ensembl) gene ids,
+        served from an index of all taxa which is only rebuilt
+        when the mapping file changes.
+        """
         src_key = 'id-map'
-        taxon_digest = GraphUtils.digest_id(str(self.tax_ids))
-        id_map = {}
-        smallfile = '/'.join((self.rawdir, 'id_map_' + taxon_digest + '.yaml'))
         bigfile = '/'.join((self.rawdir, self.files[src_key]['file']))
+        indexfile = '/'.join((self.rawdir, 'idmapping_selected.sqlite'))
 
-        # if processed smallfile exists and is newer than bigfile then use it instead
-        if os.path.isfile(smallfile) and \
-                os.path.getctime(smallfile) > os.path.getctime(bigfile):
-            LOG.info("Using the cheap mapping file %s", smallfile)
-            with open(smallfile, 'r') as yamlreader:
-                id_map = yaml.safe_load(yamlreader)
-        else:
+        digest = UniProtIdMap.index_digest(indexfile)
+        if digest is None or not os.path.isfile(bigfile) or \
+                self.store.digest(bigfile) != digest:
             LOG.info(
-                "Expensive Mapping from Uniprot IDs to Entrez/ENSEMBL gene ids for %s",
-                self.tax_ids)
+                "Expensive Mapping from Uniprot IDs to Entrez/ENSEMBL gene ids")
             self.fetch_from_url(self.files[src_key]['url'], bigfile)
-            col = self.files[src_key]['columns']
-            ummapped_uniprot = 0
-            with gzip.open(bigfile, 'rb') as csvfile:
-                csv.field_size_limit(sys.maxsize)
-                reader = csv.reader(  # warning this file is over 10GB unzipped
-                    io.TextIOWrapper(csvfile, newline=""),
-                    delimiter='\t', quotechar='\"')
-                for row in reader:
-                    uniprotkb_ac = row[col.index('UniProtKB-AC')].strip()
-                    # uniprotkb_id = row[col.index('UniProtKB-ID')]
-                    geneid = row[col.index('GeneID (EntrezGene)')].strip()
-                    # refseq = row[col.index('RefSeq')]
-                    # gi = row[col.index('GI')]
-                    # pdb = row[col.index('PDB')]
-                    # go = row[col.index('GO')]
-                    # uniref100 = row[col.index('UniRef100')]
-                    # unifref90 = row[col.index('UniRef90')]
-                    # uniref50 = row[col.index('UniRef50')]
-                    # uniparc = row[col.index('UniParc')]
-                    # pir = row[col.index('PIR')]
-                    ncbitaxon = row[col.index('NCBI-taxon')].strip()
-                    # mim = row[col.index('MIM')]
-                    # unigene = row[col.index('UniGene')]
-                    # pubmed = row[col.index('PubMed')]
-                    # embl = row[col.index('EMBL')]
-                    # embl_cds = row[col.index('EMBL-CDS')]
-                    ensembl = row[col.index('Ensembl')].strip()
-                    # ensembl_trs = row[col.index('Ensembl_TRS')]
-                    # ensembl_pro = row[col.index('Ensembl_PRO')]
-                    # other_pubmed = row[col.index('Additional PubMed')]
-
-                    if ncbitaxon not in self.tax_ids:
-                        continue
-
-                    # neither empty nor a list
-                    if geneid != '' and ';' not in geneid:
-                        id_map[uniprotkb_ac] = 'NCBIGene:' + geneid
-                    elif ensembl != '' and ';' not in ensembl:
-                        id_map[uniprotkb_ac] = 'ENSEMBL:' + ensembl
-                    else:
-                        ummapped_uniprot += 1
+            digest = self.store.digest(bigfile)
+        else:
+            LOG.info("Using the cheap mapping index %s", indexfile)
+        id_map = UniProtIdMap.open(
+            bigfile, self.files[src_key]['columns'], digest, indexfile, self.tax_ids)
 
-            LOG.info("Writing id_map out as %s", smallfile)
-            with open(smallfile, 'w') as yamlwriter:
-                yaml.dump(id_map, yamlwriter)
-            LOG.warning('Did not find 1:1 gene IDs for %i uniprots', ummapped_uniprot)
+        LOG.warning('Did not find 1:1 gene IDs for %i uniprots', id_map.unmapped())
         LOG.info(
-            "Acquired %i 1:1 uniprot to [entrez|ensembl] mappings", len(id_map.keys()))
+            "Acquired %i 1:1 uniprot to [entrez|ensembl] mappings", len(id_map))
 
         return id_map
 
@@ -3,7 +3,6 @@ import os
 import csv
 import logging
 
-from bs4 import BeautifulSoup
 from dipper.sources.OMIMSource import OMIMSource
 from dipper.models.Model import Model
 from dipper.models.Reference import Reference
@@ -61,7 +60,8 @@ class GeneReviews(OMIMSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -72,6 +72,7 @@ class GeneReviews(OMIMSource):
             ingest_logo='source-genereviews.png',
             license_url=None,
             data_rights='http://www.ncbi.nlm.nih.gov/books/NBK138602/',
+            argv=argv,
             # file_handle=None
         )
 
@@ -301,6 +302,7 @@ class GeneReviews(OMIMSource):
         :param limit:
         :return:
         """
+        from bs4 import BeautifulSoup
         model = Model(self.graph)
         cnt = 0
         books_not_found = set()
@@ -93,7 +93,8 @@ class HGNC(OMIMSource):
             are_bnodes_skolemized,
             data_release_version=None,
             tax_ids=None,
-            gene_ids=None
+            gene_ids=None,
+            argv=None
     ):
         super().__init__(
             graph_type=graph_type,
@@ -105,6 +106,7 @@ class HGNC(OMIMSource):
             ingest_logo='source-hgnc.png',
             license_url=None,
             data_rights='ftp://ftp.ebi.ac.uk/pub/databases/genenames/README.txt',
+            argv=argv,
             # file_handle=None
         )
 
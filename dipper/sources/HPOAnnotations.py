@@ -111,7 +111,8 @@ class HPOAnnotations(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -122,6 +123,7 @@ class HPOAnnotations(Source):
             ingest_logo='source-hpo.png',
             license_url=None,
             data_rights='https://hpo.jax.org/app/license',
+            argv=argv,
             # file_handle=None
         )
         self.dataset.set_citation('https://hpo.jax.org/app/citation')
@@ -115,7 +115,8 @@ class IMPC(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -126,7 +127,8 @@ class IMPC(Source):
             ingest_logo='source-impc.png',
             license_url=None,
             data_rights=GITHUBRAW + 'mpi2/PhenotypeArchive/master/LICENSE',
-            file_handle=None
+            file_handle=None,
+            argv=argv
         )
 
         # TODO add a citation for impc dataset as a whole
@@ -185,43 +187,28 @@ class IMPC(Source):
         model.addClassToGraph(taxon_id, None)
 
         # with open(raw, 'r', encoding="utf8") as csvfile:
-        col = self.files['all']['columns']
         with gzip.open(raw, 'rt') as csvfile:
             reader = csv.reader(csvfile, delimiter=',', quotechar='\"')
             row = next(reader)  # presumed header
-            if not self.check_fileheader(col, row):
-                pass
+            get_fields = self.column_getter('all', row, (
+                'marker_accession_id', 'marker_symbol', 'phenotyping_center',
+                'colony_id', 'sex', 'zygosity', 'allele_accession_id',
+                'allele_symbol', 'strain_accession_id', 'strain_name',
+                'project_fullname', 'pipeline_name', 'pipeline_stable_id',
+                'procedure_stable_id', 'procedure_name', 'parameter_stable_id',
+                'parameter_name', 'mp_term_id', 'mp_term_name', 'p_value',
+                'percentage_change', 'effect_size', 'statistical_method',
+                'resource_name'))
 
             for row in reader:
-                # | head -1 | tr ',' '\n' | sed "s|\(.*\)|# \1 = row[col.index('\1')]|g"
-                marker_accession_id = row[col.index('marker_accession_id')].strip()
-                marker_symbol = row[col.index('marker_symbol')].strip()
-                phenotyping_center = row[col.index('phenotyping_center')].strip()
-                colony_raw = row[col.index('colony_id')].strip()
-                sex = row[col.index('sex')].strip()
-                zygosity = row[col.index('zygosity')].strip()
-                allele_accession_id = row[col.index('allele_accession_id')].strip()
-                allele_symbol = row[col.index('allele_symbol')].strip()
-                # allele_name = row[col.index('allele_name')]
-                strain_accession_id = row[col.index('strain_accession_id')].strip()
-                strain_name = row[col.index('strain_name')].strip()
-                # project_name = row[col.index('project_name')]
-                project_fullname = row[col.index('project_fullname')].strip()
-                pipeline_name = row[col.index('pipeline_name')].strip()
-                pipeline_stable_id = row[col.index('pipeline_stable_id')].strip()
-                procedure_stable_id = row[col.index('procedure_stable_id')].strip()
-                procedure_name = row[col.index('procedure_name')].strip()
-                parameter_stable_id = row[col.index('parameter_stable_id')].strip()
-                parameter_name = row[col.index('parameter_name')].strip()
-                # top_level_mp_term_id = row[col.index('top_level_mp_term_id')]
-                # top_level_mp_term_name = row[col.index('top_level_mp_term_name')]
-                mp_term_id = row[col.index('mp_term_id')].strip()
-                mp_term_name = row[col.index('mp_term_name')].strip()
-                p_value = row[col.index('p_value')].strip()
-                percentage_change = row[col.index('percentage_change')].strip()
-                effect_size = row[col.index('effect_size')].strip()
-                statistical_method = row[col.index('statistical_method')].strip()
-                resource_name = row[col.index('resource_name')].strip()
+                (marker_accession_id, marker_symbol, phenotyping_center,
+                 colony_raw, sex, zygosity, allele_accession_id,
+                 allele_symbol, strain_accession_id, strain_name,
+                 project_fullname, pipeline_name, pipeline_stable_id,
+                 procedure_stable_id, procedure_name, parameter_stable_id,
+                 parameter_name, mp_term_id, mp_term_name, p_value,
+                 percentage_change, effect_size, statistical_method,
+                 resource_name) = [field.strip() for field in get_fields(row)]
 
                 if self.test_mode and marker_accession_id not in self.gene_ids:
                     continue
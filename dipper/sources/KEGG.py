@@ -106,7 +106,8 @@ class KEGG(OMIMSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -116,7 +117,8 @@ class KEGG(OMIMSource):
             ingest_url='http://www.genome.jp/kegg/',
             ingest_logo='source-kegg.png',
             license_url=None,
-            data_rights='http://www.kegg.jp/kegg/legal.html'
+            data_rights='http://www.kegg.jp/kegg/legal.html',
+            argv=argv
             # file_handle=None
         )
 
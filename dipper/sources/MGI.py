@@ -1,8 +1,13 @@
 import csv
 import os
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import logging
 import re
+from dipper.graph.StreamedGraph import StreamedGraph
 from dipper.sources.PostgreSQLSource import PostgreSQLSource
 from dipper.models.assoc.Association import Assoc
 from dipper.models.assoc.G2PAssoc import G2PAssoc
@@ -10,11 +15,34 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
 from dipper import config
+from dipper.utils.IntKeyMap import IntKeyMap, IntKeys
 from dipper.models.GenomicFeature import Feature, makeChromID
 
 
 LOG = logging.getLogger(__name__)
 
+# the MGI instance forked into worker processes, see _process_views_in_parallel()
+_PARSING = None
+
+
+def _process_view_shard(view, limit, shard):
+    """
+    Worker process: run one view of the inherited MGI instance,
+    writing its triples to an ntriples shard file
+
+    :return: the shard file
+    """
+    inherited = _PARSING.graph
+    with open(shard, 'w') as writer:
+        _PARSING.graph = StreamedGraph(_PARSING.are_bnodes_skized, file_handle=writer)
+        try:
+            _PARSING._process_view(view, limit)
+            _PARSING.graph.close()
+        finally:
+            # keep it referenced, a streamed graph's spool is shared with the parent
+            _PARSING.graph = inherited
+    return shard
+
 
 class MGI(PostgreSQLSource):
     """
@@ -285,6 +313,70 @@ class MGI(PostgreSQLSource):
         'Not Specified',
     ]
 
+    # the view processing methods, in the order they must be run
+    # the first five provide us the hash-lookups
+    # the rest use the hash populated above (and before them)
+    # to lookup the ids when filling in the graph
+    VIEWS = [
+        '_process_prb_strain_acc_view',
+        '_process_mrk_acc_view',
+        '_process_all_summary_view',
+        '_process_bib_acc_view',
+        '_process_gxd_genotype_summary_view',
+        '_process_prb_strain_view',
+        # '_process_prb_strain_genotype_view',
+        '_process_gxd_genotype_view',
+        '_process_mrk_marker_view',
+        '_process_mrk_acc_view_for_equiv',
+        '_process_mrk_summary_view',
+        '_process_all_allele_view',
+        '_process_all_allele_mutation_view',
+        '_process_gxd_allele_pair_view',
+        '_process_voc_annot_view',
+        '_process_evidence_view',
+        '_process_mgi_note_vocevidence_view',
+        '_process_mrk_location_cache',
+        'process_mgi_relationship_transgene_genes',
+        'process_mgi_note_allele_view',
+    ]
+
+    # views adding nothing to the hash-lookups that a later view reads,
+    # so with `parse_jobs` they may run concurrently after all the others
+    SHARD_VIEWS = [
+        '_process_mrk_acc_view_for_equiv',
+        '_process_all_allele_mutation_view',
+        '_process_gxd_allele_pair_view',
+        '_process_mgi_note_vocevidence_view',
+        '_process_mrk_location_cache',
+        'process_mgi_relationship_transgene_genes',
+        'process_mgi_note_allele_view',
+    ]
+
+    # the non-mouse genes that are part of transgene alleles
+    TRANSGENE_GENES_QUERY = '''
+SELECT  r._relationship_key as rel_key,
+        r._object_key_1 as object_1,
+        a.accid as allele_id,
+        alabel.label as allele_label,
+        rc._category_key as category_key,
+        rc.name as category_name,
+        t._term_key as property_key,
+        t.term as property_name,
+        rp.value as property_value
+    FROM mgi_relationship r
+    JOIN mgi_relationship_category rc ON r._category_key = rc._category_key
+    JOIN acc_accession a  ON r._object_key_1 = a._object_key
+        AND rc._mgitype_key_1 = a._mgitype_key
+        AND a._logicaldb_key = 1
+    JOIN all_label alabel ON a._object_key = alabel._allele_key
+        AND alabel._label_status_key = 1
+        AND alabel.priority = 1
+    JOIN mgi_relationship_property rp ON r._relationship_key = rp._relationship_key
+        AND rp._propertyname_key = 12948292
+        JOIN voc_term t ON rp._propertyname_key = t._term_key
+    WHERE r._category_key = 1004
+        '''
+
     # for testing purposes, this is a list of internal db keys
     # to match and select only portions of the source
 
@@ -292,7 +384,8 @@ class MGI(PostgreSQLSource):
             self,
             graph_type,
             are_bnodes_skolemized,
-            data_release_version=None
+            data_release_version=None,
+            argv=None
     ):
         super().__init__(
             graph_type=graph_type,
@@ -304,7 +397,8 @@ class MGI(PostgreSQLSource):
             ingest_logo="source-mgi.png",
             license_url=None,
             data_rights='http://www.informatics.jax.org/mgihome/other/copyright.shtml',
-            file_handle=None)
+            file_handle=None,
+            argv=argv)
 
         # so that we don't have to deal with BNodes,
         # we will create hash lookups
@@ -312,17 +406,19 @@ class MGI(PostgreSQLSource):
         # the type-specific-object-keys to MGI public identifiers.
         # then, subsequent views of the table will lookup the identifiers
         # in the hash.  this allows us to do the 'joining' on the fly
+        # keyed on MGI's numeric _object_key, held compactly as they run to millions
         self.idhash = {
-            'allele': {}, 'marker': {}, 'publication': {}, 'strain': {},
-            'genotype': {}, 'annot': {}, 'notes': {}, 'seqalt': {}}
+            'allele': IntKeyMap(), 'marker': IntKeyMap(), 'publication': IntKeyMap(),
+            'strain': IntKeyMap(), 'genotype': IntKeyMap(), 'annot': IntKeyMap(),
+            'notes': IntKeyMap(), 'seqalt': IntKeyMap()}
         # to store if a marker is a class or indiv
         self.markers = {
             'classes': [], 'indiv': []}
         # use this to store internally generated labels for various features
-        self.label_hash = {}
+        self.label_hash = IntKeyMap(codec=IntKeys('MGI:'))
         # use this to store the genotype strain ids
         # for building genotype labels
-        self.geno_bkgd = {}
+        self.geno_bkgd = IntKeyMap(codec=IntKeys('MGI:'))
         self.strain_to_genotype_map = {}
 
         self.wildtype_alleles = set()
@@ -365,17 +461,17 @@ class MGI(PostgreSQLSource):
         # self.fetch_from_pgdb(self.tables, cxn, 100)  # for testing only
         # self.fetch_from_pgdb(self.tables, cxn, None, is_dl_forced)
 
+        queries = {}
         for query_map in self.resources['query_map']:
-            query_fh = open(os.path.join(
-                os.path.dirname(__file__), query_map['query']), 'r')
-            query = query_fh.read()
+            with open(os.path.join(
+                    os.path.dirname(__file__), query_map['query']), 'r') as query_fh:
+                queries[query_map['outfile']] = query_fh.read()
             # force = False
             # if 'Force' in query_map:   # unused
             #     force = query_map['Force']
-            self.fetch_query_from_pgdb(
-                query_map['outfile'], query, None, cxn)
         # always get this - it has the verion info
-        self.fetch_transgene_genes_from_db(cxn)
+        queries['mgi_relationship_transgene_genes'] = self.TRANSGENE_GENES_QUERY
+        self.fetch_queries_from_pgdb(queries, cxn)
 
         datestamp = ver = None
         # get the resource version information from
@@ -418,34 +514,62 @@ class MGI(PostgreSQLSource):
         if self.test_only:
             self.test_mode = True
 
-        # the following will provide us the hash-lookups
-        # These must be processed in a specific order
-        self._process_prb_strain_acc_view(limit)
-        self._process_mrk_acc_view()
-        self._process_all_summary_view(limit)
-        self._process_bib_acc_view(limit)
-        self._process_gxd_genotype_summary_view(limit)
-
-        # The following will use the hash populated above
-        # to lookup the ids when filling in the graph
-        self._process_prb_strain_view(limit)
-        # self._process_prb_strain_genotype_view(limit)
-        self._process_gxd_genotype_view(limit)
-        self._process_mrk_marker_view(limit)
-        self._process_mrk_acc_view_for_equiv(limit)
-        self._process_mrk_summary_view(limit)
-        self._process_all_allele_view(limit)
-        self._process_all_allele_mutation_view(limit)
-        self._process_gxd_allele_pair_view(limit)
-        self._process_voc_annot_view(limit)
-        self._process_evidence_view(limit)
-        self._process_mgi_note_vocevidence_view(limit)
-        self._process_mrk_location_cache(limit)
-        self.process_mgi_relationship_transgene_genes(limit)
-        self.process_mgi_note_allele_view(limit)
+        jobs = self.ARGV.get('parse_jobs') or 1
+        if jobs > 1 and not self.test_mode and self.are_bnodes_skized and \
+                multiprocessing.get_start_method() == 'fork':
+            for view in self.VIEWS:
+                if view not in self.SHARD_VIEWS:
+                    self._process_view(view, limit)
+            self._process_views_in_parallel(self.SHARD_VIEWS, limit, jobs)
+        else:
+            for view in self.VIEWS:
+                self._process_view(view, limit)
         LOG.info("Finished parsing.")
         LOG.info("Loaded %d nodes", len(self.graph))
 
+    def _process_view(self, view, limit):
+        if view == '_process_mrk_acc_view':
+            self._process_mrk_acc_view()
+        else:
+            getattr(self, view)(limit)
+
+    def _process_views_in_parallel(self, views, limit, jobs):
+        """
+        Once the hash-lookups are complete, views that only read them
+        can each be processed in a worker process (forked, so sharing the
+        lookups with this one) writing its triples to its own shard.
+        The shards are then merged into the graph in the order given.
+
+        :param views: names of the view processing methods
+        :param limit: Only parse this many rows in each table
+        :param jobs: number of worker processes
+        """
+        global _PARSING
+        LOG.info("Processing %d views in %d processes", len(views), jobs)
+        shard_dir = tempfile.mkdtemp(prefix='mgi_', dir=self.outdir)
+        _PARSING = self
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                shards = [
+                    executor.submit(
+                        _process_view_shard, view, limit,
+                        os.path.join(shard_dir, view + '.nt'))
+                    for view in views]
+                shards = [shard.result() for shard in shards]
+            for shard in shards:
+                self._merge_shard(shard)
+        finally:
+            _PARSING = None
+            shutil.rmtree(shard_dir)
+
+    def _merge_shard(self, shard):
+        if self.graph_type == 'streamed_graph':
+            with open(shard, 'r') as reader:
+                self.graph.add_ntriples(reader)
+        else:
+            with open(shard, 'rb') as reader:
+                self.graph.add_ntriples(reader)
+
     def fetch_transgene_genes_from_db(self, cxn):
         """
         This is a custom query to fetch the non-mouse genes that
@@ -455,32 +579,8 @@ class MGI(PostgreSQLSource):
         :return:
         """
 
-        query = '''
-SELECT  r._relationship_key as rel_key,
-        r._object_key_1 as object_1,
-        a.accid as allele_id,
-        alabel.label as allele_label,
-        rc._category_key as category_key,
-        rc.name as category_name,
-        t._term_key as property_key,
-        t.term as property_name,
-        rp.value as property_value
-    FROM mgi_relationship r
-    JOIN mgi_relationship_category rc ON r._category_key = rc._category_key
-    JOIN acc_accession a  ON r._object_key_1 = a._object_key
-        AND rc._mgitype_key_1 = a._mgitype_key
-        AND a._logicaldb_key = 1
-    JOIN all_label alabel ON a._object_key = alabel._allele_key
-        AND alabel._label_status_key = 1
-        AND alabel.priority = 1
-    JOIN mgi_relationship_property rp ON r._relationship_key = rp._relationship_key
-        AND rp._propertyname_key = 12948292
-        JOIN voc_term t ON rp._propertyname_key = t._term_key
-    WHERE r._category_key = 1004
-        '''
-
         self.fetch_query_from_pgdb(
-            'mgi_relationship_transgene_genes', query, None, cxn)
+            'mgi_relationship_transgene_genes', self.TRANSGENE_GENES_QUERY, None, cxn)
 
     def _process_gxd_genotype_view(self, limit=None):
         """
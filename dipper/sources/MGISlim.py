@@ -1,7 +1,6 @@
 import logging
 import datetime
 
-from intermine.webservice import Service
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.sources.Source import Source
 from dipper.models.Reference import Reference
@@ -20,7 +19,8 @@ class MGISlim(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -30,6 +30,7 @@ class MGISlim(Source):
             ingest_url='http://www.mousemine.org/mousemine/service',
             ingest_logo="source-mgi.png",
             license_url='http://www.informatics.jax.org/mgihome/other/copyright.shtml',
+            argv=argv,
             # data_rights=None,
             # file_handle=None
         )
@@ -41,6 +42,7 @@ class MGISlim(Source):
         return
 
     def parse(self, limit=None):
+        from intermine.webservice import Service
 
         count = 0
         for num in range(10, 100):
@@ -68,7 +68,8 @@ class MMRRC(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -78,7 +79,8 @@ class MMRRC(Source):
             ingest_url='https://www.mmrrc.org',
             ingest_logo='source-mmrrc.png',
             # license_url=None,
-            data_rights='https://www.mmrrc.org/about/data_download.php'
+            data_rights='https://www.mmrrc.org/about/data_download.php',
+            argv=argv
             # file_handle=None
         )
         self.strain_hash = {}
@@ -79,7 +79,8 @@ class MPD(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -89,7 +90,8 @@ class MPD(Source):
             ingest_url='https://phenome.jax.org/',
             ingest_logo='source-mpd.png',
             # license_url=None,
-            data_rights='https://phenome.jax.org/about/termsofuse'
+            data_rights='https://phenome.jax.org/about/termsofuse',
+            argv=argv
             # file_handle=None
         )
 
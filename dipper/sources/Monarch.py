@@ -52,7 +52,8 @@ class Monarch(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -61,7 +62,8 @@ class Monarch(Source):
             ingest_title='The Monarch Initiative',
             ingest_url='https://monarchinitiative.org',
             ingest_logo='source-monarch.png',
-            license_url='https://creativecommons.org/licenses/by/4.0/'
+            license_url='https://creativecommons.org/licenses/by/4.0/',
+            argv=argv
             # data_rights=None,
             # file_handle=None
         )
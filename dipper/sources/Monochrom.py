@@ -131,7 +131,8 @@ class Monochrom(Source):
                  graph_type,
                  are_bnodes_skolemized,
                  data_release_version=None,
-                 tax_ids=None):
+                 tax_ids=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -140,7 +141,8 @@ class Monochrom(Source):
             ingest_title='Monarch Chromosome Ontology',
             ingest_url='https://monarchinitiative.org',   # TODO can we be more specific
             ingest_logo='source-monochrom.png',
-            license_url='http://creativecommons.org/licenses/by/4.0/'  # make our lic
+            license_url='http://creativecommons.org/licenses/by/4.0/',  # make our lic
+            argv=argv
             # data_rights=None,
             # file_handle=None
         )
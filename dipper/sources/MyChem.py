@@ -1,5 +1,4 @@
 import logging
-from SPARQLWrapper import SPARQLWrapper, JSON
 import requests
 from dipper.sources.Source import Source
 from dipper.models.Model import Model
@@ -13,7 +12,8 @@ class MyChem(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -23,7 +23,8 @@ class MyChem(Source):
             ingest_url='http://mychem.info/',
             ingest_logo='source-mychem.jpg',
             license_url=None,
-            data_rights='http://mychem.info/terms'
+            data_rights='http://mychem.info/terms',
+            argv=argv
             # file_handle=None
         )
 
@@ -200,6 +201,7 @@ class MyChem(Source):
 
     @staticmethod
     def execute_query(query):
+        from SPARQLWrapper import SPARQLWrapper, JSON
         endpoint = SPARQLWrapper('https://query.wikidata.org/sparql')
         endpoint.setQuery(query)
         endpoint.setReturnFormat(JSON)
@@ -26,7 +26,8 @@ class MyDrug(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -35,6 +36,7 @@ class MyDrug(Source):
             ingest_title='Drugs and Compounds in BioThings',
             ingest_url='http://c.biothings.io/',
             ingest_logo='source-mydrug.png',
+            argv=argv,
             # license_url=None,
             # data_rights=None,
             # file_handle=None
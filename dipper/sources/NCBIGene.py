@@ -117,7 +117,8 @@ class NCBIGene(OMIMSource):
             are_bnodes_skolemized,
             data_release_version=None,
             tax_ids=None,  # =['9606', '1009', '7955'],  # still gets to None via tests
-            gene_ids=None
+            gene_ids=None,
+            argv=None
     ):
         super().__init__(
             graph_type=graph_type,
@@ -130,6 +131,7 @@ class NCBIGene(OMIMSource):
             # ingest_desc=None,
             license_url='https://creativecommons.org/publicdomain/mark/1.0/',
             data_rights='https://www.ncbi.nlm.nih.gov/home/about/policies/',
+            argv=argv,
             # file_handle=None
         )
 
@@ -73,7 +73,8 @@ class OMIA(OMIMSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -85,6 +86,7 @@ class OMIA(OMIMSource):
             # ingest_desc=None,
             license_url=None,
             data_rights='http://sydney.edu.au/disclaimer.shtml',
+            argv=argv,
             # file_handle=None
         )
 
@@ -3,7 +3,7 @@ import re
 import json
 import urllib
 from urllib.error import HTTPError
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 
 from dipper.sources.OMIMSource import OMIMSource
 from dipper.sources.Source import USER_AGENT
@@ -13,6 +13,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.GenomicFeature import Feature, makeChromID
 from dipper.models.Reference import Reference
 from dipper import config
+from dipper.utils.ResponseCache import ResponseCache, RateLimiter
 from dipper.utils.romanplus import romanNumeralPattern, fromRoman, toRoman
 
 LOG = logging.getLogger(__name__)
@@ -25,6 +26,9 @@ OMIMURL = 'https://data.omim.org/downloads/'
 OMIMFTP = OMIMURL + config.get_config()['keys']['omim']
 OMIMAPI = 'https://api.omim.org/api/entry?format=json&apiKey=' + \
     config.get_config()['keys']['omim'] + '&'
+API_WORKERS = 4           # requests in flight
+API_RATE = 4              # requests a second
+CACHE_TTL = 30 * 86400    # seconds before a cached entry is fetched again
 
 
 class OMIM(OMIMSource):
@@ -81,7 +85,8 @@ class OMIM(OMIMSource):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skolemized=are_bnodes_skolemized,
@@ -93,10 +98,12 @@ class OMIM(OMIMSource):
             # ingest_desc=None,
             license_url=None,
             data_rights='http://omim.org/help/agreement',
+            argv=argv,
             # file_handle=None
         )
 
         self.omim_ncbigene_idmap = {}
+        self.api_limit = RateLimiter(API_RATE)
 
         # check if config exists; if it doesn't, error out and let user know
         if 'keys' not in config.get_config() and \
@@ -156,6 +163,10 @@ class OMIM(OMIMSource):
         the basic entry from omim, that is ALL fields,
         which includes an entry's:  prefix, mimNumber, status, and titles.
 
+        Entries are kept in raw/omim/api/<included fields>/<mimNumber>.json
+        and only fetched again once older than CACHE_TTL;
+        the rest are fetched a few batches at a time within the API's rate limit.
+
         :param omimids: the set of omim entry ids to fetch using their API
         :param transform: Function to transform each omim entry when looping
         :param included_fields: A set of what fields are required to retrieve
@@ -164,11 +175,10 @@ class OMIM(OMIMSource):
         """
 
         omimparams = {}
-        reponse_batches = []
 
         # add the included_fields as parameters
         if included_fields is not None and included_fields:
-            omimparams['include'] = ','.join(included_fields)
+            omimparams['include'] = ','.join(sorted(included_fields))
 
         # not expecting any, but keeping just in case
         cleanomimids = [o.split(':')[-1] for o in omimids]
@@ -178,78 +188,85 @@ class OMIM(OMIMSource):
             omimids = cleanomimids
         cleanomimids = []
 
-        # WIP: check if we can use a cached copy of the json records
-        # maybe if exists raw/omim/_<iso-date>.json use that
-
-        # in the meanwhile, to bypass (in case of emergencies)
-        # cache_date = '2019-06-27'
-        # with open('raw/omim/_' + cache_date + '.json', 'r') as cachefile:
-        #    reponse_batches = json.load(cachefile)
-        if True:  # False:
-
-            acc = 0  # for counting
-
-            # note that you can only do request batches of 20
-            # see info about "Limits" at http://omim.org/help/api
-            # TODO 2017 May seems a majority of many groups of 20
-            # are producing python None for RDF triple Objects
-
-            groupsize = 20
-            if not self.test_mode and limit is not None:
-                # just in case the limit is larger than the number of records,
-                maxit = limit
-                if limit > len(omimids):
-                    maxit = len(omimids)
-            else:
-                maxit = len(omimids)
-
-            while acc < maxit:
-                end = min((maxit, acc + groupsize))
-                # iterate through the omim ids list,
-                # and fetch from the OMIM api in batches of 20
-
-                if self.test_mode:
-                    intersect = list(
-                        set([str(i) for i in self.test_ids]) & set(omimids[acc:end]))
-                    # some of the test ids are in the omimids
-                    if intersect:
-                        LOG.info("found test ids: %s", intersect)
-                        omimparams.update({'mimNumber': ','.join(intersect)})
-                    else:
-                        acc += groupsize
-                        continue
-                else:
-                    omimparams.update({'mimNumber': ','.join(omimids[acc:end])})
-
-                url = OMIMAPI + urllib.parse.urlencode(omimparams)
-
+        if self.test_mode:
+            test_ids = set(str(i) for i in self.test_ids)
+            omimids = [mim for mim in omimids if mim in test_ids]
+            LOG.info("found test ids: %s", omimids)
+        elif limit is not None:
+            omimids = omimids[:limit]
+
+        # entries fetched before (with the same fields) and still fresh
+        cache = ResponseCache(
+            '/'.join((self.rawdir, 'api', omimparams.get('include', 'entry'))),
+            CACHE_TTL)
+        entries = {}
+        for mim in omimids:
+            entry = cache.get(mim)
+            if entry is not None:
+                entries[mim] = entry
+        missing = [mim for mim in omimids if mim not in entries]
+        LOG.info(
+            "Have %i cached OMIM entries, fetching %i from their API",
+            len(entries), len(missing))
+
+        # note that you can only do request batches of 20
+        # see info about "Limits" at http://omim.org/help/api
+        # TODO 2017 May seems a majority of many groups of 20
+        # are producing python None for RDF triple Objects
+        groupsize = 20
+        batches = [missing[i:i + groupsize] for i in range(0, len(missing), groupsize)]
+        with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+            futures = [
+                executor.submit(self._fetch_entries, batch, omimparams)
+                for batch in batches]
+            for future in futures:
                 try:
-                    req = urllib.request.urlopen(url)
-                except HTTPError as err:  # URLError?
-                    LOG.warning('fetching: %s', url)
-                    error_msg = err.read()
-                    if re.search(r'The API key: .* is invalid', str(error_msg)):
-                        msg = "API Key not valid"
-                        raise HTTPError(url, err.code, msg, err.hdrs, err.fp)
-                    LOG.error("Failed with: %s", str(error_msg))
+                    entry_list = future.result()
+                except HTTPError:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                if entry_list is None:
+                    # stop where it failed, keeping what was fetched so far
+                    for pending in futures:
+                        pending.cancel()
                     break
+                for entry in entry_list:
+                    mim = str(entry['entry']['mimNumber'])
+                    cache.put(mim, entry)
+                    entries[mim] = entry
+
+        LOG.info("begin transforming the %i records", len(entries))
+        for mim in omimids:
+            if mim in entries:
+                # apply the data transformation, and save it to the graph
+                transform(entries[mim], graph)
 
-                resp = req.read().decode()
-                acc += groupsize
-                # gather all batches
-                reponse_batches.append(json.loads(resp))
-
-            # snag a copy of all the batches
-
-            with open('./raw/omim/_'+date.today().isoformat()+'.json', 'w') as writer:
-                json.dump(reponse_batches, writer)
+    def _fetch_entries(self, omimids, omimparams):
+        """
+        Fetch a batch of (up to 20) entries from the OMIM API,
+        keeping within its rate limit
 
-        LOG.info(
-            "begin transforming the %i blocks of (20) records", len(reponse_batches))
-        for myjson in reponse_batches:
-            for entery in myjson['omim']['entryList']:
-                # apply the data transformation, and save it to the graph
-                transform(entery, graph)
+        :param omimids: list of mim numbers
+        :param omimparams: dict of other query parameters
+        :return: the response's list of entries, None if the request failed
+        """
+        params = dict(omimparams, mimNumber=','.join(omimids))
+        url = OMIMAPI + urllib.parse.urlencode(params)
+        self.api_limit.wait()
+        try:
+            req = urllib.request.urlopen(url)
+        except HTTPError as err:  # URLError?
+            LOG.warning('fetching: %s', url)
+            error_msg = err.read()
+            if re.search(r'The API key: .* is invalid', str(error_msg)):
+                msg = "API Key not valid"
+                raise HTTPError(url, err.code, msg, err.hdrs, err.fp)
+            LOG.error("Failed with: %s", str(error_msg))
+            return None
+
+        resp = req.read().decode()
+        return json.loads(resp)['omim']['entryList']
 
     def _process_all(self, limit):
         """
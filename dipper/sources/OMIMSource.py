@@ -51,7 +51,8 @@ class OMIMSource(Source):
             ingest_logo=None,
             license_url=None,
             data_rights=None,
-            file_handle=None
+            file_handle=None,
+            argv=None
     ):
 
         super().__init__(
@@ -64,7 +65,8 @@ class OMIMSource(Source):
             ingest_logo=ingest_logo,
             license_url=license_url,
             data_rights=data_rights,
-            file_handle=file_handle)
+            file_handle=file_handle,
+            argv=argv)
 
         self.omim_type = {}
         self.omim_replaced = {}
@@ -29,7 +29,8 @@ class Orphanet(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -39,7 +40,8 @@ class Orphanet(Source):
             ingest_url='http://www.orpha.net',
             ingest_logo='source-orphanet.png',
             license_url=None,
-            data_rights='http://www.orphadata.org/cgi-bin/index.php'
+            data_rights='http://www.orphadata.org/cgi-bin/index.php',
+            argv=argv
             # file_handle=None
         )
 
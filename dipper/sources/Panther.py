@@ -71,7 +71,8 @@ class Panther(Source):
             graph_type,
             are_bnodes_skolemized,
             data_release_version=None,
-            tax_ids=None
+            tax_ids=None,
+            argv=None
     ):
         super().__init__(
             graph_type=graph_type,
@@ -82,7 +83,8 @@ class Panther(Source):
             ingest_url='http://pantherdb.org',
             ingest_logo='source-panther.jpg',
             license_url=None,
-            data_rights='http://www.pantherdb.org/terms/disclaimer.jsp'
+            data_rights='http://www.pantherdb.org/terms/disclaimer.jsp',
+            argv=argv
             # file_handle=None
         )
         self.dataset.set_citation(
@@ -1,6 +1,8 @@
 
+import os
+import gzip
 import logging
-import psycopg2
+from concurrent.futures import ThreadPoolExecutor
 from dipper.sources.Source import Source
 
 LOG = logging.getLogger(__name__)
@@ -25,7 +27,8 @@ class PostgreSQLSource(Source):
             ingest_description=None,
             license_url=None,
             data_rights=None,
-            file_handle=None
+            file_handle=None,
+            argv=None
     ):
 
         super().__init__(
@@ -39,7 +42,8 @@ class PostgreSQLSource(Source):
             ingest_description=ingest_description,
             license_url=license_url,
             data_rights=data_rights,
-            file_handle=file_handle)
+            file_handle=file_handle,
+            argv=argv)
 
         # used downstream but handled in Source
         # globaltt = self.globaltt
@@ -60,49 +64,18 @@ class PostgreSQLSource(Source):
 
         con = None
         try:
-            con = psycopg2.connect(
-                host=cxn['host'], database=cxn['database'], port=cxn['port'],
-                user=cxn['user'], password=cxn['password'])
+            con = self._connect(cxn)
             cur = con.cursor()
             for tab in tables:
-                LOG.info("Fetching data from table %s", tab)
                 self._getcols(cur, tab)
-                query = ' '.join(("SELECT * FROM", tab))
-                countquery = ' '.join(("SELECT COUNT(*) FROM", tab))
-                if limit is not None:
-                    query = ' '.join((query, "LIMIT", str(limit)))
-                    countquery = ' '.join((countquery, "LIMIT", str(limit)))
-
-                cur.execute(countquery)
-                tablerowcount = cur.fetchone()[0]
-
-                outfile = '/'.join((self.rawdir, tab))
-
-                # download the file
-                LOG.info("COMMAND:%s", query)
-                outputquery = "COPY ({0}) TO STDOUT WITH DELIMITER AS '\t' CSV HEADER"\
-                              .format(query)
-                with open(outfile, 'w') as tsvfile:
-                    cur.copy_expert(outputquery, tsvfile)
-
-                filerowcount = self.file_len(outfile)
-
-                if (filerowcount - 1) < tablerowcount:
-                    raise Exception(
-                        "Download from {} failed, {} != {}"
-                        .format(cxn['host'] + ':' + cxn['database'],
-                                (filerowcount - 1), tablerowcount))
-                if (filerowcount - 1) > tablerowcount:
-                    LOG.warning(
-                        "Fetched from %s more rows in file (%s) than reported "
-                        "in count(%s)",
-                        cxn['host'] + ':' + cxn['database'],
-                        (filerowcount - 1), tablerowcount)
-
         finally:
             if con:
                 con.close()
 
+        LOG.info("Fetching data from tables %s", ', '.join(tables))
+        self.fetch_queries_from_pgdb(
+            {tab: ' '.join(("SELECT * FROM", tab)) for tab in tables}, cxn, limit=limit)
+
     def fetch_query_from_pgdb(self, qname, query, con, cxn, limit=None):
         """
         Supply either an already established connection, or connection parameters.
@@ -112,44 +85,109 @@ class PostgreSQLSource(Source):
         :param con: The already-established connection
         :param cxn: The postgres connection information
         :param limit: If you only want a subset of rows from the query
-        :return:
+        :return: number of rows fetched
         """
         if con is None and cxn is None:
             raise ValueError("ERROR: you need to supply connection information")
 
-        if con is None and cxn is not None:
-            con = psycopg2.connect(
-                host=cxn['host'], database=cxn['database'], port=cxn['port'],
-                user=cxn['user'], password=cxn['password'])
+        if con is None:
+            con = self._connect(cxn)
+            try:
+                return self.copy_query(con, qname, query, limit)
+            finally:
+                con.close()
+        return self.copy_query(con, qname, query, limit)
+
+    def fetch_queries_from_pgdb(
+            self, queries, cxn, jobs=4, limit=None, compress=False):
+        """
+        Run several queries concurrently, each over its own connection
+        from a pool of at most `jobs`, saving the output of each
+        to a local file named for the query (see copy_query()).
+        Supplying an already established connection runs them one after another.
+
+        :param queries: dict of file name to SQL query
+        :param cxn: The postgres connection information, or a connection
+        :param jobs: number of queries to run at once
+        :param limit: If you only want a subset of rows from each query
+        :param compress: gzip the files, saved as '<name>.gz'
+        :return: dict of file name to number of rows fetched
+        """
+        if not isinstance(cxn, dict):
+            return {
+                qname: self.copy_query(cxn, qname, query, limit, compress)
+                for qname, query in queries.items()}
+
+        from psycopg2.pool import ThreadedConnectionPool
+        pool = ThreadedConnectionPool(
+            1, max(1, min(jobs, len(queries))),
+            host=cxn['host'], database=cxn['database'], port=cxn['port'],
+            user=cxn['user'], password=cxn['password'])
+
+        def run(qname, query):
+            con = pool.getconn()
+            try:
+                return self.copy_query(con, qname, query, limit, compress)
+            finally:
+                pool.putconn(con)
+
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    executor.submit(run, qname, query): qname
+                    for qname, query in queries.items()}
+                # the first failure is raised, the other queries still finish
+                return {futures[future]: future.result() for future in futures}
+        finally:
+            pool.closeall()
+
+    def copy_query(self, con, qname, query, limit=None, compress=False):
+        """
+        COPY the output of a query into '<rawdir>/<qname>' as it arrives,
+        tab-delimited with a header, replacing any earlier file once complete.
+        The row count comes from the COPY command's status,
+        rather than counting again in the database or in the file.
 
+        :param con: an established connection
+        :param qname:  The name of the query to save the output to
+        :param query:  The SQL query itself
+        :param limit: If you only want a subset of rows from the query
+        :param compress: gzip the file, saved as '<qname>.gz'
+        :return: number of rows fetched
+        """
         outfile = '/'.join((self.rawdir, qname))
-        cur = con.cursor()
-        # wrap the query to get the count
-        countquery = ' '.join(("SELECT COUNT(*) FROM (", query, ") x"))
+        if compress:
+            outfile += '.gz'
         if limit is not None:
-            countquery = ' '.join((countquery, "LIMIT", str(limit)))
-
-        cur.execute(countquery)
-        tablerowcount = cur.fetchone()[0]
+            query = ' '.join(("SELECT * FROM (", query, ") x LIMIT", str(limit)))
 
-        # download the file
         LOG.debug("COMMAND:%s", query)
         outputquery = \
             "COPY ({0}) TO STDOUT WITH DELIMITER AS '\t' CSV HEADER".format(query)
 
-        with open(outfile, 'w') as tsvfile:
-            cur.copy_expert(outputquery, tsvfile)
-        # Regenerate row count to check integrity
-        filerowcount = self.file_len(outfile)
-        if (filerowcount-1) < tablerowcount:
-            raise Exception(
-                "Download from {} failed, {} != {}"
-                .format(cxn['host'] + ':' + cxn['database'],
-                        (filerowcount-1), tablerowcount))
-        if (filerowcount-1) > tablerowcount:
-            LOG.warning(
-                "Fetched from %s more rows in file (%s) than reported in count(%s)",
-                cxn['host'] + ':'+cxn['database'], (filerowcount-1), tablerowcount)
+        partfile = outfile + '.part'
+        try:
+            opener = gzip.open if compress else open
+            with opener(partfile, 'wb') as tsvfile, con.cursor() as cur:
+                cur.copy_expert(outputquery, tsvfile)
+                rowcount = cur.rowcount
+        except BaseException:
+            if os.path.exists(partfile):
+                os.remove(partfile)
+            raise
+        finally:
+            con.rollback()  # nothing to commit, end the transaction
+        os.replace(partfile, outfile)
+
+        LOG.info("Fetched %i rows into %s", rowcount, outfile)
+        return rowcount
+
+    @staticmethod
+    def _connect(cxn):
+        import psycopg2
+        return psycopg2.connect(
+            host=cxn['host'], database=cxn['database'], port=cxn['port'],
+            user=cxn['user'], password=cxn['password'])
 
     @staticmethod
     def _getcols(cur, table):
@@ -1,6 +1,5 @@
 import logging
 
-from ontobio.io.gafparser import GafParser
 from dipper.sources.Source import Source
 from dipper.models.assoc.Association import Assoc
 from dipper.models.Model import Model
@@ -47,7 +46,8 @@ class RGD(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -58,6 +58,7 @@ class RGD(Source):
             ingest_logo='source-rgd.png',
             license_url=None,
             data_rights='https://rgd.mcw.edu/wg/disclaimer/',
+            argv=argv,
             # file_handle=None
         )
         self.dataset.set_citation('https://rgd.mcw.edu/wg/citing-rgd/')
@@ -88,6 +89,7 @@ class RGD(Source):
         rgd_file = '/'.join(
             (self.rawdir, self.files['rat_gene2mammalian_phenotype']['file']))
         # ontobio gafparser implemented here
+        from ontobio.io.gafparser import GafParser
         p = GafParser()
         assocs = p.parse(open(rgd_file, "r"))
 
@@ -49,7 +49,8 @@ class Reactome(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -59,7 +60,8 @@ class Reactome(Source):
             ingest_url='http://reactome.org/',
             ingest_logo='source-reactome.png',
             license_url=None,
-            data_rights='https://reactome.org/license/'
+            data_rights='https://reactome.org/license/',
+            argv=argv
             # file_handle=None
         )
         # gaf evidence code mapping is built in parse(), after the file is fetched.
@@ -1,11 +1,11 @@
 import logging
-import pandas as pd
 
 from dipper.sources.Source import Source
 from dipper.models.assoc.Association import Assoc
 from dipper.models.Model import Model
 from dipper.models.Reference import Reference
-from ontobio.ontol_factory import OntologyFactory
+from dipper.utils.OntologySnapshot import OntologySnapshot
+from dipper import curie_map
 
 
 __author__ = 'timputman'
@@ -19,6 +19,7 @@ class SGD(Source):
 
     """
     SGD_BASE = 'https://downloads.yeastgenome.org/curation/literature/'
+    APO_URL = 'http://purl.obolibrary.org/obo/apo.owl'
     files = {
         'sgd_phenotype': {
             'file': 'phenotype_data.tab',
@@ -46,7 +47,8 @@ class SGD(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -57,7 +59,8 @@ class SGD(Source):
             ingest_logo='source-sgd.png',
             license_url='https://sites.google.com/view/yeastgenome-help/about',
             data_rights=None,
-            file_handle=None
+            file_handle=None,
+            argv=argv
         )
 
         self.apo_term_id = SGD.make_apo_map()
@@ -93,6 +96,7 @@ class SGD(Source):
             'Feature Name', 'Feature Type', 'Gene Name', 'SGDID', 'Reference',
             'Experiment Type', 'Mutant Type', 'Allele', 'Strain Background',
             'Phenotype', 'Chemical', 'Condition', 'Details', 'Reporter']
+        import pandas as pd
         sgd_df = pd.read_csv(sgd_file, sep='\t', names=columns)
         records = sgd_df.to_dict(orient='records')
         for index, assoc in enumerate(records):
@@ -227,15 +231,19 @@ class SGD(Source):
 
     @staticmethod
     def make_apo_map():
-        # load apo for term mapping
-        ofactory = OntologyFactory()
-        apo_ont = ofactory.create("apo")
-        apo_nodes = apo_ont.nodes()
+        # load apo for term mapping, from a local copy kept up to date
+        apo_ont = OntologySnapshot(SGD.APO_URL).terms()
+        if not apo_ont.labels:
+            # without it no phenotype or experiment type could be mapped
+            raise ValueError("No APO terms from {}".format(SGD.APO_URL))
+        curie_util = curie_map.get_curie_util()
         # dict schema { 'term': 'apo_id' }
         apo_term_id = dict()
-        for node in apo_nodes:
-            label = apo_ont.label(node)
-            apo_term_id[label] = node
+        for (iri, labels) in apo_ont.labels.items():
+            node = curie_util.get_curie(iri)
+            if node is not None:
+                for label in labels:
+                    apo_term_id[label] = node
         return apo_term_id
 
     @staticmethod
@@ -5,19 +5,25 @@ import time
 import logging
 import urllib
 import csv
-from datetime import datetime
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from operator import itemgetter
 from stat import ST_CTIME, ST_SIZE
-from inspect import getdoc
+from inspect import getdoc, getfile
 from rdflib import XSD, Literal
 
-import yaml
+import dipper
 from dipper.graph.RDFGraph import RDFGraph
 from dipper.graph.StreamedGraph import StreamedGraph
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.DownloadManager import DownloadManager
+from dipper.utils.ContentStore import ContentStore
+from dipper.utils import Compression, ShardedWriter, TableSnapshot
 from dipper.models.Dataset import Dataset
 
 LOG = logging.getLogger(__name__)
-CHUNK = 16 * 1024  # read remote urls of unknown size in 16k chunks
 USER_AGENT = \
     "The Monarch Initiative (https://monarchinitiative.org/;info@monarchinitiative.org)"
 
@@ -36,6 +42,7 @@ class Source:
 
     """
     DIPPERCACHE = 'https://archive.monarchinitiative.org/DipperCache'
+    downloader = DownloadManager()  # shared, so per host limits hold across sources
     namespaces = {}
     files = {}
     ARGV = {}
@@ -53,7 +60,10 @@ class Source:
             license_url=None,           # only if it is _our_ lic
             data_rights=None,           # their page that points to their current lic
             file_handle=None,
+            argv=None,                  # dipper-etl's command line options
     ):
+        if argv is not None:
+            self.ARGV = argv
 
         # pull in the common test identifiers
         self.all_test_ids = self.open_and_parse_yaml('../../resources/test_ids.yaml')
@@ -88,6 +98,8 @@ class Source:
         self.testname = name + "_test"
         self.testfile = '/'.join((self.outdir, self.testname + ".ttl"))
         self.datasetfile = None
+        # digests of the inputs the output was made from, see save_inputs()
+        self.inputsfile = '/'.join((self.outdir, self.name + '_inputs.json'))
 
         # if raw data dir doesn't exist, create it
         if not os.path.exists(self.rawdir):
@@ -95,6 +107,7 @@ class Source:
             raw_pth = os.path.abspath(self.rawdir)
             LOG.info("creating raw directory for %s at %s", self.name, raw_pth)
         # else:  # raw data dir does  exist. maybe should consider what is in it?
+        self.store = ContentStore(self.rawdir)
 
         # if output dir doesn't exist, create it
         if not os.path.exists(self.outdir):
@@ -116,9 +129,14 @@ class Source:
             self.graph = RDFGraph(are_bnodes_skized, graph_id)
 
         elif graph_type == 'streamed_graph':
-            # need to expand on export formats
-            dest_file = open(out_pth + '/' + name + '.nt', 'w')   # where is the close?
-            self.graph = StreamedGraph(are_bnodes_skized, dest_file)
+            graph_id = ':MONARCH_' + str(self.name) + "_" + \
+                datetime.now().isoformat(' ').split()[0]
+
+            # triples are spooled under the output dir until write()
+            # and deduplicated there, as an rdf_graph would
+            LOG.info("Creating streamed graph  %s", graph_id)
+            self.graph = StreamedGraph(
+                are_bnodes_skized, graph_id, dedup=True, tmpdir=out_pth)
             # leave test files as turtle (better human readibility)
         else:
             LOG.error(
@@ -151,7 +169,9 @@ class Source:
             license_url=self.license_url,    # only _OUR_ lic
             data_rights=self.data_rights,    # tries to point to others lics
             graph_type=graph_type,
-            file_handle=file_handle
+            file_handle=file_handle,
+            distribution_type=self.distribution_type(
+                self.ARGV.get('dest_fmt') or 'turtle')
         )
 
     def fetch(self, is_dl_forced=False):
@@ -186,32 +206,23 @@ class Source:
         :return: None
 
         """
-        fmt_ext = {
-            'rdfxml': 'xml',
-            'turtle': 'ttl',
-            'nt': 'nt',         # ntriples
-            'nquads': 'nq',
-            'n3': 'n3'          # notation3
-        }
-
         # make the regular graph output file
         dest = None
         if self.name is not None:
-            dest = '/'.join((self.outdir, self.name))
-            if fmt in fmt_ext:
-                dest = '.'.join((dest, fmt_ext.get(fmt)))
-            else:
-                dest = '.'.join((dest, fmt))
+            dest = self.outfile_name(fmt)
             LOG.info("Setting outfile to %s", dest)
 
             # make the dataset_file name, always format as turtle
-            self.datasetfile = '/'.join(
-                (self.outdir, self.name + '_dataset.ttl'))
+            self.datasetfile = self.datasetfile_name()
             LOG.info("Setting dataset file to %s", self.datasetfile)
         else:
             LOG.warning("No output file set. Using stdout")
             stream = 'stdout'
 
+        # whatever the output was made from before, it is not recorded yet
+        if os.path.exists(self.inputsfile):
+            os.remove(self.inputsfile)
+
         graph_util = GraphUtils(None)
 
         # the  _dataset description is always turtle
@@ -223,7 +234,10 @@ class Source:
             graph_util.write(self.testgraph, 'turtle', filename=self.testfile)
 
         if write_metadata_in_main_graph:
-            self.graph = self.graph + self.dataset.get_graph()
+            if self.graph_type == 'streamed_graph':
+                self.graph += self.dataset.get_graph()
+            else:
+                self.graph = self.graph + self.dataset.get_graph()
 
         # print graph out
         if stream is None:
@@ -234,7 +248,129 @@ class Source:
             LOG.error("I don't understand our stream.")
             return
 
-        graph_util.write(self.graph, fmt, filename=outfile)
+        graph_util.write(
+            self.graph, fmt, filename=outfile,
+            jobs=self.ARGV.get('write_jobs') or 1,
+            keep_shards=self.ARGV.get('keep_shards') or False,
+            compress=self.ARGV.get('compress'))
+
+        if self.graph_type == 'streamed_graph':
+            # release the spooled triples
+            self.graph.close()
+            self.dataset.get_graph().close()
+
+    def outfile_name(self, fmt='turtle'):
+        """
+        :param fmt: serialization format
+        :return: str path write() puts the main graph in, 'out/<name>.<ext>'
+        """
+        return '.'.join(
+            ('/'.join((self.outdir, self.name)), self.distribution_type(fmt)))
+
+    def written_outfile(self, fmt='turtle'):
+        """
+        :param fmt: serialization format
+        :return: str path the main graph was last written to, the shard
+            directory's manifest when written with ARGV['keep_shards']
+        """
+        outfile = self.outfile_name(fmt)
+        manifest = os.path.join(outfile + '.d', ShardedWriter.MANIFEST)
+        if not os.path.exists(outfile) and os.path.exists(manifest):
+            return manifest
+        return outfile
+
+    def distribution_type(self, fmt='turtle'):
+        """
+        :param fmt: serialization format
+        :return: str file extension of the main graph, i.e. 'ttl' or 'nt.gz'
+            when written with ARGV['compress']
+        """
+        fmt_ext = {
+            'rdfxml': 'xml',
+            'turtle': 'ttl',
+            'nt': 'nt',         # ntriples
+            'nquads': 'nq',
+            'n3': 'n3'          # notation3
+        }
+        ext = fmt_ext.get(fmt, fmt)
+        if self.ARGV.get('compress') is not None:
+            ext += '.' + Compression.EXTENSIONS[self.ARGV['compress']]
+        return ext
+
+    def input_digests(self):
+        """
+        sha256 of everything the output of this ingest depends on:
+        the files in its raw directory (from the ContentStore manifest
+        where it is current), the translation tables, curie map,
+        the ingest's own module and the dipper version.
+
+        :return: dict of path (or 'dipper') to digest
+        """
+        digests = {'dipper': dipper.__version__}
+        for dirpath, dirnames, filenames in os.walk(self.rawdir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename == ContentStore.MANIFEST or \
+                        filename.endswith(('.part', '.link', '.tmp')):
+                    continue
+                path = '/'.join((dirpath, filename))
+                digests[path] = self.store.digest(path)
+
+        pkg_dir = os.path.dirname(os.path.abspath(dipper.__file__))
+        tt_dir = os.path.join(os.path.dirname(pkg_dir), 'translationtable')
+        for path in (
+                os.path.join(tt_dir, 'GLOBAL_TERMS.yaml'),
+                os.path.join(tt_dir, self.name + '.yaml'),
+                os.path.join(pkg_dir, 'curie_map.yaml'),
+                getfile(self.__class__)):
+            if os.path.exists(path):
+                digests[os.path.relpath(path, os.path.dirname(pkg_dir))] = \
+                    ContentStore.file_sha256(path)
+        return digests
+
+    def inputs_unchanged(self, fmt='turtle', params=None):
+        """
+        True when the inputs recorded by save_inputs() are unchanged
+        and the output written from them is still in place,
+        i.e. parsing again would only reproduce the existing output.
+
+        :param fmt: serialization format of the output
+        :param params: dict of any other options the output depends on
+        :return: bool
+        """
+        if not os.path.exists(self.inputsfile):
+            return False
+        with open(self.inputsfile, 'r') as reader:
+            try:
+                saved = json.load(reader)
+            except ValueError:
+                return False
+        outfiles = (self.written_outfile(fmt), self.datasetfile_name())
+        if saved.get('outfiles') != list(outfiles) or \
+                not all(os.path.exists(outfile) for outfile in outfiles) or \
+                saved.get('params') != (params or {}):
+            return False
+        if saved.get('inputs') != self.input_digests():
+            return False
+        self.triple_count = saved.get('triples', 0)
+        return True
+
+    def save_inputs(self, fmt='turtle', params=None):
+        """
+        Record the digests of the inputs alongside the output just written,
+        see inputs_unchanged()
+        """
+        saved = {
+            'outfiles': [self.written_outfile(fmt), self.datasetfile_name()],
+            'params': params or {},
+            'inputs': self.input_digests(),
+            'triples': len(self.graph)}
+        with open(self.inputsfile + '.tmp', 'w') as writer:
+            json.dump(saved, writer, indent=2, sort_keys=True)
+        os.replace(self.inputsfile + '.tmp', self.inputsfile)
+
+    def datasetfile_name(self):
+        return '/'.join((self.outdir, self.name + '_dataset.ttl'))
 
     def whoami(self):
         '''
@@ -359,35 +495,40 @@ class Source:
         Given a set of files for this source, it will go fetch them, and
         set a default version by date.  If you need to set the version number
         by another method, then it can be set again.
+
+        Files are fetched concurrently (see DownloadManager for the limits)
+        unless a delay between them is asked for.
         :param is_dl_forced - boolean
         :param files dict - override instance files dict
+        :param delay - seconds to wait before each fetch (one file at a time)
         :return: None
         """
 
-        fstat = None
         if files is None:
             files = self.files
 
-        for src_key in files:
-            headers = None
+        workers = 1 if delay else self.downloader.max_workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetched = [
+                executor.submit(self._get_file, files[src_key], is_dl_forced, delay)
+                for src_key in files]
+
+        # record the provenance afterwards, graphs are not thread safe
+        for src_key, future in zip(files, fetched):
             filesource = files[src_key]
+            cache_response = future.result()
 
             if 'clean' in filesource:
                 cleaned_file_iri = filesource['clean']
             else:
                 cleaned_file_iri = filesource['url']
-
-            # attempt to fetch from a web cache
             remote_file = '/'.join((self.DIPPERCACHE, self.name, filesource['file']))
-            local_file = '/'.join((self.rawdir, filesource['file']))
 
-            cache_response = self.fetch_from_url(remote_file, local_file, is_dl_forced)
+            # if the key 'clean' exists in the sources `files` dict
+            # expose that instead of the longer url
+            self.dataset.set_ingest_source(cleaned_file_iri)
 
             if cache_response:
-                LOG.info(
-                    "Found File '%s/%s' in DipperCache", self.name, filesource['file'])
-                self.dataset.set_ingest_source(cleaned_file_iri)
-
                 if remote_file in self.remote_file_timestamps:
                     # Here the timestamp on the file in DipperCache is a best effort
                     # representation of the earliest time the file
@@ -399,26 +540,6 @@ class Source:
                     self.dataset.graph.addTriple(
                         cleaned_file_iri, self.globaltt['retrieved_on'], timestamp)
             else:
-                LOG.warning(
-                    "File %s/%s absent from DipperCache", self.name, filesource['file'])
-
-                if 'headers' in filesource:
-                    headers = filesource['headers']
-                LOG.info("Getting %s", src_key)
-                # if the key 'clean' exists in the sources `files` dict
-                # expose that instead of the longer url
-                self.dataset.set_ingest_source(cleaned_file_iri)
-
-                LOG.info('Fetching %s in %i seconds', cleaned_file_iri, delay)
-
-                time.sleep(delay)
-
-                if not self.fetch_from_url(
-                        filesource['url'],
-                        '/'.join((self.rawdir, filesource['file'])),
-                        is_dl_forced, headers):
-                    LOG.warning('FAILED FETCH of %s', filesource['url'])
-
                 fstat = os.stat('/'.join((self.rawdir, filesource['file'])))
                 self.dataset.graph.addTriple(
                     self.dataset.version_level_curie, self.globaltt["Source (dct)"],
@@ -429,64 +550,80 @@ class Source:
                 self.dataset.graph.addTriple(
                     cleaned_file_iri, self.globaltt['retrieved_on'], filedate)
 
+    def _get_file(self, filesource, is_dl_forced, delay=0):
+        """
+        Fetch one file of get_files(), from DipperCache if it is there
+        or else from its source.
+        :return: True if the file came from DipperCache
+        """
+        remote_file = '/'.join((self.DIPPERCACHE, self.name, filesource['file']))
+        local_file = '/'.join((self.rawdir, filesource['file']))
+
+        # attempt to fetch from a web cache
+        if self.fetch_from_url(remote_file, local_file, is_dl_forced):
+            LOG.info(
+                "Found File '%s/%s' in DipperCache", self.name, filesource['file'])
+            return True
+
+        LOG.warning("File %s/%s absent from DipperCache", self.name, filesource['file'])
+        LOG.info('Fetching %s in %i seconds', filesource['url'], delay)
+        time.sleep(delay)
+
+        if not self.fetch_from_url(
+                filesource['url'], local_file, is_dl_forced, filesource.get('headers')):
+            LOG.warning('FAILED FETCH of %s', filesource['url'])
+        return False
+
     def fetch_from_url(
             self, remoteurl, localfile=None, is_dl_forced=False, headers=None):
         """
-        Given a remote url and a local filename, attempt to determine
-        if the remote file is newer; if it is,
-        fetch the remote file and save it to the specified localfile,
-        reporting the basic file information once it is downloaded
+        Given a remote url and a local filename, fetch the remote file
+        if it is newer than the local one (a conditional GET over http)
+        and save it to the specified localfile,
+        reporting the basic file information once it is downloaded.
+        The file is recorded in the source's ContentStore,
+        whose ETag for it makes the request conditional.
+        Interrupted downloads are resumed and failures retried,
+        see DownloadManager.
         :param remoteurl: URL of remote file to fetch
         :param localfile: pathname of file to save locally
 
         :return: bool
 
         """
+        if localfile is None:
+            LOG.error('Local filename is required')
+            exit(-1)
+        if headers is None:
+            headers = self._get_default_request_headers()
 
-        response = None
-        rmt_check = self.check_if_remote_is_newer(remoteurl, localfile, headers)
-        if (is_dl_forced is True) or (localfile is None) or (
-                rmt_check is not None and rmt_check):
-            if headers is None:
-                headers = self._get_default_request_headers()
-            try:
-                request = urllib.request.Request(remoteurl, headers=headers)
-                response = urllib.request.urlopen(request)
-            except urllib.error.HTTPError as httpErr:
-                # raise Exception(httpErr.read())
-                LOG.error('NETWORK issue %s\n\tFor: %s', httpErr.read(), remoteurl)
-                return False  # allows re try (e.g. not found in Cache)
-            except urllib.error.URLError as urlErr:
-                LOG.error('URLError %s\n\tFor: %s', urlErr, remoteurl)
-                return False
-            if localfile is not None:
-                with open(localfile, 'wb') as binwrite:
-                    while True:
-                        chunk = response.read(CHUNK)
-                        if not chunk:
-                            break
-                        binwrite.write(chunk)
-
-                LOG.info("Finished.  Wrote file to %s", localfile)
-                if self.compare_local_remote_bytes(remoteurl, localfile, headers):
-                    LOG.debug("local file is same size as remote after download")
-                else:
-                    raise Exception(
-                        "Error downloading file: "
-                        "local file size  != remote file size")
-
-                fstat = os.stat(localfile)
-                LOG.info("file size: %s", fstat[ST_SIZE])
-                LOG.info(
-                    "file created: %s",
-                    time.asctime(time.localtime(fstat[ST_CTIME])))
-                response.close()
-            else:
-                LOG.error('Local filename is required')
-                exit(-1)
-
-        else:
-            LOG.info("Using existing file %s", localfile)
+        # http servers answer conditional requests, others need asking first
+        if not is_dl_forced and remoteurl.split(':')[0].lower() not in ('http', 'https'):
+            rmt_check = self.check_if_remote_is_newer(remoteurl, localfile, headers)
+            if rmt_check is None or not rmt_check:
+                LOG.info("Using existing file %s", localfile)
+                return True
+            is_dl_forced = True
+
+        result = self.downloader.download(
+            remoteurl, localfile, headers, is_dl_forced, self.store.etag(localfile))
+        if result['status'] == 'failed':
+            return False
+        entry = self.store.entry(localfile)
+        if result['status'] == 'downloaded' or entry is None or 'url' not in entry:
+            self.store.add(
+                localfile, remoteurl, result['etag'], result['last_modified'])
+        if result['last_modified'] is not None:
+            # naive UTC, as check_if_remote_is_newer() records them
+            self.remote_file_timestamps[remoteurl] = \
+                result['last_modified'].astimezone(timezone.utc).replace(tzinfo=None)
+
+        if result['status'] == 'downloaded':
+            fstat = os.stat(localfile)
+            LOG.info("file size: %s", fstat[ST_SIZE])
+            LOG.info(
+                "file created: %s",
+                time.asctime(time.localtime(fstat[ST_CTIME])))
         return True
 
     # TODO: rephrase as mysql-dump-xml specific format
@@ -653,9 +790,10 @@ class Source:
         with open(filename, 'r', encoding=encoding, newline=r'\n') as filereader:
             contents = filereader.read()
         contents = re.sub(r'\r', '', contents)
-        with open(filename, "w") as filewriter:
-            filewriter.truncate()
+        # replace rather than overwrite, the file may be linked into the ContentStore
+        with open(filename + '.tmp', "w") as filewriter:
             filewriter.write(contents)
+        os.replace(filename + '.tmp', filename)
 
     @staticmethod
     def open_and_parse_yaml(yamlfile):
@@ -668,9 +806,8 @@ class Source:
         # ??? what if the yaml file does not contain a dict datastructure?
         mapping = dict()
         if os.path.exists(os.path.join(os.path.dirname(__file__), yamlfile)):
-            map_file = open(os.path.join(os.path.dirname(__file__), yamlfile), 'r')
-            mapping = yaml.safe_load(map_file)
-            map_file.close()
+            mapping = TableSnapshot.load_yaml(
+                os.path.join(os.path.dirname(__file__), yamlfile))
         else:
             LOG.warning("file: %s not found", yamlfile)
 
@@ -733,9 +870,8 @@ class Source:
                                    localtt_file), 'w') as write_yaml:
                 print('---\n# %s.yaml\n"": ""  # example' % name, file=write_yaml)
         finally:
-            with open(os.path.join(os.path.dirname(__file__),
-                                   localtt_file), 'r') as read_yaml:
-                localtt = yaml.safe_load(read_yaml)
+            localtt = TableSnapshot.load_yaml(
+                os.path.join(os.path.dirname(__file__), localtt_file))
 
         # inverse local translation.
         # note: keeping this invertable will be work.
@@ -823,6 +959,53 @@ class Source:
 
         return (exp ^ got) & exp == set()
 
+    def column_getter(self, src_key, header=None, fields=None):
+        '''
+        Work out once where the columns of self.files[src_key]['columns']
+        are in a row, instead of `row[col.index('name')]` for every field
+        of every row.
+
+            param:  src_key  key into self.files
+            param:  header  list, the header as received (checked against the
+                            expected columns), defaults to the expected columns
+            param:  fields  list, names of the columns wanted (default all)
+
+            return: function from a row to a tuple of the fields' values
+        '''
+        columns = self.files[src_key]['columns']
+        if header is None:
+            header = columns
+        else:
+            self.check_fileheader(columns, header, src_key)
+        if fields is None:
+            fields = columns
+        indices = [header.index(field) for field in fields]
+        if len(indices) == 1:
+            index = indices[0]
+            return lambda row: (row[index],)
+        return itemgetter(*indices)
+
+    def read_records(self, src_key, reader, fields=None, has_header=True):
+        '''
+        Iterate over rows from a reader (i.e. csv.reader) as namedtuples
+        with an attribute per column. The header is checked only once.
+
+            param:  src_key  key into self.files
+            param:  reader  iterator of lists, its first row is the header
+                            unless has_header is False
+            param:  fields  list, names of the columns wanted (default all),
+                            they need to be valid python identifiers
+
+            return: generator of namedtuples
+        '''
+        if fields is None:
+            fields = self.files[src_key]['columns']
+        header = next(reader) if has_header else None
+        get_fields = self.column_getter(src_key, header, fields)
+        make_record = namedtuple('Record', fields)._make
+        for row in reader:
+            yield make_record(get_fields(row))
+
     def command_args(self):
         '''
             To make arbitrary variables from dipper-etl.py's calling enviroment
@@ -1,7 +1,6 @@
 import logging
 import gzip
 
-import pandas as pd
 from dipper.sources.Source import Source, USER_AGENT
 from dipper.sources.Ensembl import Ensembl
 
@@ -17,6 +16,7 @@ DEFAULT_TAXA = ['9606', '10090', '7955', '7227', '6239', '4932', '10116']
 #   11.0        https://version-11-0.string-db.org
 VERSION = '11.0'
 YEAR = '2018'
+CHUNK_ROWS = 1000000  # protein links read at a time
 
 
 class StringDB(Source):
@@ -40,7 +40,8 @@ class StringDB(Source):
                  are_bnodes_skolemized,
                  data_release_version=None,
                  tax_ids=None,
-                 version=None):
+                 version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -50,7 +51,8 @@ class StringDB(Source):
             ingest_url=STRING,
             ingest_logo='source-string.png',
             license_url=None,
-            data_rights=STRING+'/cgi/access.pl?footer_active_subpage=licensing'
+            data_rights=STRING+'/cgi/access.pl?footer_active_subpage=licensing',
+            argv=argv
             # file_handle=None
         )
 
@@ -137,6 +139,7 @@ class StringDB(Source):
         Returns:
             :return None
         """
+        import pandas as pd
         if limit is not None:
             LOG.info("Only parsing first %d rows", limit)
 
@@ -147,8 +150,6 @@ class StringDB(Source):
             string_file_path = '/'.join((
                 self.rawdir, protein_paths[taxon]['file']))
             p2gene_map = dict()
-            with gzip.open(string_file_path, 'rb') as reader:
-                dataframe = pd.read_csv(reader, sep=r'\s+')
 
             if taxon in self.id_map_files:
                 LOG.info("Using string provided id_map files")
@@ -180,42 +181,74 @@ class StringDB(Source):
             LOG.info(
                 "Fetching protein protein interactions for taxon %s", taxon)
 
-            self._process_protein_links(dataframe, p2gene_map, taxon, limit)
+            gene_frame = self._gene_frame(p2gene_map)
+            filtered_out_count = 0
+            # the larger taxa run to GBs, read them a chunk at a time
+            with gzip.open(string_file_path, 'rb') as reader:
+                for dataframe in pd.read_csv(
+                        reader, sep=r'\s+', chunksize=CHUNK_ROWS,
+                        usecols=['protein1', 'protein2', 'combined_score'],
+                        nrows=None if limit is None else limit + 1):
+                    filtered_out_count += self._process_protein_links(
+                        dataframe, gene_frame, taxon, limit)
+
+            LOG.info(
+                "Finished parsing p-p interactions for %s, "
+                "%i rows filtered out based on checking ensembl proteins",
+                taxon, filtered_out_count)
+
+    @staticmethod
+    def _gene_frame(p2gene_map):
+        """
+        :param p2gene_map: dict of protein id to a list of gene curies
+        :return: DataFrame of 'protein', 'gene' with a row for each gene
+        """
+        import pandas as pd
+        genes = pd.Series(p2gene_map, dtype=object).explode().dropna()
+        return pd.DataFrame({'protein': genes.index, 'gene': genes.values})
 
     def _process_protein_links(
             self, dataframe, p2gene_map, taxon, limit=None, rank_min=700):
-        filtered_df = dataframe[dataframe['combined_score'] > rank_min]
-        filtered_out_count = 0
-        for index, row in filtered_df.iterrows():
-            # Check if proteins are in same species
-            protein1 = row['protein1'].replace('{}.'.format(taxon), '')
-            protein2 = row['protein2'].replace('{}.'.format(taxon), '')
-            gene1_curies = None
-            gene2_curies = None
-            try:
-                # Keep orientation the same since RO!"interacts with" is symmetric
-                # TEC: symeteric expansion is the job of post processing not ingest
-                if protein1 >= protein2:
-                    gene1_curies = p2gene_map[protein1]
-                    gene2_curies = p2gene_map[protein2]
-                else:
-                    gene1_curies = p2gene_map[protein2]
-                    gene2_curies = p2gene_map[protein1]
-            except KeyError:
-                filtered_out_count += 1
-
-            if gene1_curies is not None and gene2_curies is not None:
-                for gene1 in gene1_curies:
-                    for gene2 in gene2_curies:
-                        self.graph.addTriple(
-                            gene1, self.globaltt['interacts with'], gene2)
-                if limit is not None and index >= limit:
-                    break
-
-        LOG.info(
-            "Finished parsing p-p interactions for %s, "
-            "%i rows filtered out based on checking ensembl proteins",
-            taxon, filtered_out_count)
+        """
+        Add gene 'interacts with' gene for the protein links scoring over rank_min
+
+        :param dataframe: DataFrame of STRING's protein1, protein2, combined_score
+        :param p2gene_map: dict of protein id to a list of gene curies,
+            or that as a DataFrame from _gene_frame()
+        :param taxon: str NCBITaxon number STRING prefixes protein ids with
+        :param limit: int last row (index) of the dataframe to process
+        :return: int links dropped for a protein without a gene
+        """
+        import pandas as pd
+        if not isinstance(p2gene_map, pd.DataFrame):
+            p2gene_map = self._gene_frame(p2gene_map)
+        links = dataframe[dataframe['combined_score'] > rank_min]
+        if limit is not None:
+            links = links[links.index <= limit]
+        protein1 = links['protein1'].str.replace(taxon + '.', '', regex=False)
+        protein2 = links['protein2'].str.replace(taxon + '.', '', regex=False)
+
+        # Keep orientation the same since RO!"interacts with" is symmetric
+        # TEC: symeteric expansion is the job of post processing not ingest
+        forward = protein1 >= protein2
+        pairs = pd.DataFrame({
+            'protein1': protein1.where(forward, protein2),
+            'protein2': protein2.where(forward, protein1)})
+        known = pairs['protein1'].isin(p2gene_map['protein']) & \
+            pairs['protein2'].isin(p2gene_map['protein'])
+        pairs = pairs[known].merge(
+            p2gene_map.rename(columns={'protein': 'protein1', 'gene': 'gene1'}),
+            on='protein1'
+        ).merge(
+            p2gene_map.rename(columns={'protein': 'protein2', 'gene': 'gene2'}),
+            on='protein2'
+        ).drop_duplicates(['gene1', 'gene2'])
+
+        interacts_with = self.globaltt['interacts with']
+        for (gene1, gene2) in zip(pairs['gene1'], pairs['gene2']):
+            self.graph.addTriple(gene1, interacts_with, gene2)
+
+        return int((~known).sum())
 
     def _get_file_paths(self, tax_ids, file_type):
         """
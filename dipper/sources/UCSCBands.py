@@ -202,7 +202,8 @@ class UCSCBands(Source):
             graph_type,
             are_bnodes_skolemized,
             data_release_version=None,
-            tax_ids=None):
+            tax_ids=None,
+            argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -213,6 +214,7 @@ class UCSCBands(Source):
             ingest_logo='source-ucscbands.png',
             license_url=None,
             data_rights='http://genome.ucsc.edu/license/',
+            argv=argv,
             # file_handle=None
         )
 
@@ -76,7 +76,8 @@ class UDP(Source):
             self,
             graph_type,
             are_bnodes_skolemized,
-            data_release_version=None
+            data_release_version=None,
+            argv=None
     ):
         super().__init__(
             graph_type=graph_type,
@@ -86,6 +87,7 @@ class UDP(Source):
             ingest_title='Undiagnosed Diseases Program',
             ingest_url='https://rarediseases.info.nih.gov/',
             ingest_logo='source-udp.png',
+            argv=argv,
             # license_url=None,
             # data_rights=None,
             # file_handle=None
@@ -134,7 +134,8 @@ class WormBase(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -144,7 +145,8 @@ class WormBase(Source):
             ingest_url='http://www.wormbase.org',
             ingest_logo='source-wormbase.png',
             # license_url=None,
-            data_rights='https://wormbase.org/about/citing_wormbase#012--10'
+            data_rights='https://wormbase.org/about/citing_wormbase#012--10',
+            argv=argv
             # file_handle=None
         )
 
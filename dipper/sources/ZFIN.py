@@ -4,7 +4,6 @@ import logging
 import os
 import yaml
 
-from intermine.webservice import Service
 from dipper.utils import pysed
 from dipper.sources.Source import Source
 from dipper.models.assoc.Association import Assoc
@@ -16,6 +15,7 @@ from dipper.models.GenomicFeature import makeChromID
 from dipper.models.GenomicFeature import Feature
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
+from dipper.utils.IntKeyMap import IntKeyMap, ZdbKeys
 
 LOG = logging.getLogger(__name__)
 ZFDL = 'http://zfin.org/downloads'
@@ -155,7 +155,8 @@ class ZFIN(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -165,7 +166,8 @@ class ZFIN(Source):
             ingest_url='https://zfin.org',
             ingest_logo="source-zfin.png",
             license_url=None,
-            data_rights='http://zfin.org/warranty.html'
+            data_rights='http://zfin.org/warranty.html',
+            argv=argv
             # file_handle=None
         )
 
@@ -175,9 +177,9 @@ class ZFIN(Source):
         self.fish_parts = {}
         self.geno_alleles = {}
         # to hold any label for a given id
-        self.id_label_map = {}
+        self.id_label_map = IntKeyMap(codec=ZdbKeys())
         # to hold the mappings between genotype and background
-        self.genotype_backgrounds = {}
+        self.genotype_backgrounds = IntKeyMap(codec=ZdbKeys())
         self.extrinsic_id_to_enviro_id_hash = {}
         # to hold the parts that are introduced from a construct
         self.transgenic_parts = {}
@@ -2565,6 +2567,7 @@ class ZFIN(Source):
         #     http://www.intermine.org/wiki/PythonClient
 
         # The following two lines will be needed in every python script:
+        from intermine.webservice import Service
         service = Service("http://zebrafishmine.org/service")
 
         # Get a new query on the class (table) you will be querying:
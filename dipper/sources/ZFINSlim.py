@@ -33,7 +33,8 @@ class ZFINSlim(Source):
     def __init__(self,
                  graph_type,
                  are_bnodes_skolemized,
-                 data_release_version=None):
+                 data_release_version=None,
+                 argv=None):
         super().__init__(
             graph_type=graph_type,
             are_bnodes_skized=are_bnodes_skolemized,
@@ -44,6 +45,7 @@ class ZFINSlim(Source):
             ingest_logo="source-zfin.png",
             license_url=None,
             data_rights='http://zfin.org/warranty.html',
+            argv=argv,
             # file_handle=None
         )
         self.dataset.set_citation(
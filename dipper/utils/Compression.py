@@ -0,0 +1,130 @@
+import io
+import os
+import zlib
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+LOG = logging.getLogger(__name__)
+
+EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+BLOCK_SIZE = 4 * 1024 * 1024     # uncompressed bytes per gzip member
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def available(method):
+    """
+    :param method: str 'gzip' or 'zstd'
+    :return: bool if output can be compressed this way here
+    """
+    if method == 'zstd':
+        try:
+            import zstandard  # noqa: F401 pylint: disable=unused-import
+        except ImportError:
+            return False
+        return True
+    return method in EXTENSIONS
+
+
+def open_writer(destination, method, threads=None, closefd=True):
+    """
+    A binary file like object compressing what is written to it
+    onto destination.
+
+    :param destination: str path or binary file like object
+    :param method: str 'gzip' or 'zstd' (the latter needs the zstandard package)
+    :param threads: int compressing blocks concurrently, by default one per cpu
+    :param closefd: bool close destination along with the writer (e.g. not stdout)
+    """
+    if threads is None:
+        threads = os.cpu_count() or 1
+    if isinstance(destination, str):
+        destination = open(destination, 'wb')
+    elif not closefd:
+        destination = _KeepOpen(destination)
+    if method == 'gzip':
+        return ParallelGzipWriter(destination, threads)
+    if method == 'zstd':
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=threads)
+        return compressor.stream_writer(destination)
+    raise ValueError('Unknown compression: {}'.format(method))
+
+
+def _gzip_member(block, level):
+    # wbits 31: a complete gzip member with header and crc32 trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """
+    Writes gzip as a series of independent members of BLOCK_SIZE each,
+    compressed by a pool of threads (zlib releases the GIL) while the
+    caller keeps writing. Concatenated members are a valid gzip file
+    (RFC 1952) that gzip, zcat and python's gzip module read as one.
+    """
+
+    def __init__(self, fileobj, threads=1, level=GZIP_LEVEL):
+        super().__init__()
+        self.fileobj = fileobj
+        self.level = level
+        self.threads = threads
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        self.pending = deque()      # blocks being compressed, in order
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= BLOCK_SIZE:
+            self._submit(bytes(self.buffer[:BLOCK_SIZE]))
+            del self.buffer[:BLOCK_SIZE]
+        return len(data)
+
+    def _submit(self, block):
+        self.pending.append(self.pool.submit(_gzip_member, block, self.level))
+        # bound the memory held, blocks are written out in order
+        while len(self.pending) > 2 * self.threads:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.buffer or not self.pending:
+                self._submit(bytes(self.buffer))
+                self.buffer = bytearray()
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+        finally:
+            self.pool.shutdown()
+            self.fileobj.close()
+            super().close()
+
+
+class _KeepOpen(io.RawIOBase):
+    """
+    Passes writes through, closing only flushes
+    """
+
+    def __init__(self, fileobj):
+        super().__init__()
+        self.fileobj = fileobj
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+    def close(self):
+        if not self.closed:
+            self.fileobj.flush()
+            super().close()
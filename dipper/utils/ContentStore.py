@@ -0,0 +1,216 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+LOG = logging.getLogger(__name__)
+CHUNK = 1024 * 1024  # hash files in 1M chunks
+
+
+class ContentStore:
+    """
+    Content addressed store for the raw files of a source.
+
+    Each fetched file is kept once under 'raw/.sha256/<ab>/<digest>',
+    and the file a source reads, 'raw/<source>/<file>', is a hard link to it;
+    so identical downloads (NCBI's gene_info for NCBIGene and AnimalQTLdb, say)
+    take the space of one.
+
+    A manifest, 'raw/<source>/MANIFEST.json', records for each file
+    where it came from (url, etag, last_modified), when (fetched_at),
+    and its size, mtime and sha256. While a file's size and mtime
+    still match the manifest its digest is taken from there,
+    so unchanged inputs are recognized without re-reading them.
+
+    An object no file links to any more (its st_nlink is 1) is superseded;
+    it is removed when the file replacing it is added, or by gc().
+    """
+
+    MANIFEST = 'MANIFEST.json'
+
+    def __init__(self, rawdir, root=None):
+        """
+        :param rawdir: str directory a source fetches its files into
+        :param root: str directory holding the stored objects,
+            by default '.sha256' beside rawdir
+        """
+        self.rawdir = rawdir
+        if root is None:
+            root = os.path.join(os.path.dirname(os.path.normpath(rawdir)), '.sha256')
+        self.root = root
+        self.manifest_file = os.path.join(rawdir, self.MANIFEST)
+        self.lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def add(self, localfile, url=None, etag=None, last_modified=None):
+        """
+        Move a freshly fetched file into the store, leaving a link in its place,
+        and record it in the manifest
+
+        :param localfile: str path to a file within rawdir
+        :param url: str where the file was fetched from
+        :param etag: str the remote file's ETag
+        :param last_modified: datetime the remote file's Last-Modified
+        :return: str hex sha256 of the file, None if it is not within rawdir
+        """
+        key = self._key(localfile)
+        if key is None:
+            return None
+        digest = self.file_sha256(localfile)
+        objfile = self.object_path(digest)
+        with self.lock:
+            superseded = self.manifest.get(key, {}).get('sha256')
+            if not os.path.exists(objfile):
+                os.makedirs(os.path.dirname(objfile), exist_ok=True)
+                self._link(localfile, objfile)
+            elif not os.path.samefile(localfile, objfile):
+                # keep the object's mtime, other sources' manifests record it
+                LOG.info("%s is already stored as %s", localfile, digest)
+                self._link(objfile, localfile)
+            fstat = os.stat(localfile)
+            self.manifest[key] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': None if last_modified is None
+                else last_modified.isoformat(),
+                'fetched_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'size': fstat.st_size,
+                'mtime': fstat.st_mtime,
+                'sha256': digest}
+            self._save_manifest()
+            if superseded is not None and superseded != digest:
+                self._remove_unlinked(self.object_path(superseded))
+        return digest
+
+    def gc(self):
+        """
+        Remove the stored objects no file links to any more
+
+        :return: int bytes freed
+        """
+        freed = 0
+        if not os.path.isdir(self.root):
+            return freed
+        with self.lock:
+            for subdir in os.listdir(self.root):
+                subdir = os.path.join(self.root, subdir)
+                for objfile in os.listdir(subdir):
+                    freed += self._remove_unlinked(os.path.join(subdir, objfile))
+                if not os.listdir(subdir):
+                    os.rmdir(subdir)
+        LOG.info("Freed %i bytes from %s", freed, self.root)
+        return freed
+
+    def digest(self, localfile):
+        """
+        Files not (or no longer) as recorded are hashed
+        and their manifest entry brought up to date.
+
+        :param localfile: str path to a file within rawdir
+        :return: str hex sha256 of the file, from the manifest when it is current
+        """
+        entry = self.entry(localfile)
+        if entry is not None and self._is_current(entry, localfile):
+            return entry['sha256']
+        digest = self.file_sha256(localfile)
+        key = self._key(localfile)
+        if key is not None:
+            fstat = os.stat(localfile)
+            with self.lock:
+                entry = dict(self.manifest.get(key, {}))
+                entry.update(size=fstat.st_size, mtime=fstat.st_mtime, sha256=digest)
+                self.manifest[key] = entry
+                self._save_manifest()
+        return digest
+
+    def entry(self, localfile):
+        """
+        :return: dict manifest entry for the file, or None
+        """
+        key = self._key(localfile)
+        if key is None:
+            return None
+        return self.manifest.get(key)
+
+    def etag(self, localfile):
+        """
+        :return: str ETag the file was fetched with, if it is still the same file
+        """
+        entry = self.entry(localfile)
+        if entry is not None and self._is_current(entry, localfile):
+            return entry.get('etag')
+        return None
+
+    def object_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    @staticmethod
+    def file_sha256(filename):
+        sha256 = hashlib.sha256()
+        with open(filename, 'rb') as bin_reader:
+            while True:
+                buff = bin_reader.read(CHUNK)
+                if not buff:
+                    break
+                sha256.update(buff)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _is_current(entry, localfile):
+        if not os.path.exists(localfile):
+            return False
+        fstat = os.stat(localfile)
+        return entry['size'] == fstat.st_size and entry['mtime'] == fstat.st_mtime
+
+    def _key(self, localfile):
+        key = os.path.relpath(localfile, self.rawdir)
+        if key.startswith(os.pardir):
+            return None
+        return key
+
+    @staticmethod
+    def _link(source, target):
+        """
+        (re)point target at the same file as source,
+        copying where the filesystem can not hard link
+        """
+        tmpfile = target + '.link'
+        try:
+            os.link(source, tmpfile)
+        except OSError:
+            shutil.copy2(source, tmpfile)
+        os.replace(tmpfile, target)
+
+    @staticmethod
+    def _remove_unlinked(objfile):
+        """
+        :return: int bytes freed, removing objfile if it is its only link
+        """
+        try:
+            fstat = os.stat(objfile)
+        except FileNotFoundError:
+            return 0
+        if fstat.st_nlink != 1:
+            return 0
+        LOG.info("Removing superseded %s", objfile)
+        os.remove(objfile)
+        return fstat.st_size
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_file):
+            return {}
+        try:
+            with open(self.manifest_file, 'r') as reader:
+                return json.load(reader)
+        except ValueError:
+            LOG.warning('Ignoring unreadable manifest %s', self.manifest_file)
+            return {}
+
+    def _save_manifest(self):
+        tmpfile = self.manifest_file + '.tmp'
+        with open(tmpfile, 'w') as writer:
+            json.dump(self.manifest, writer, indent=2, sort_keys=True)
+        os.replace(tmpfile, self.manifest_file)
@@ -1,5 +1,6 @@
 
 import logging
+from collections import OrderedDict
 
 __author__ = 'condit@sdsc.edu'
 
@@ -10,13 +11,23 @@ class CurieUtil(object):
     '''
     Create compact URI
     '''
-    def __init__(self, curie_map):
+    TRIE_END = ''   # key marking a complete base IRI in prefix_trie
+
+    def __init__(self, curie_map, cache_size=2**18):
         '''
         curie_map format is: curie_prefix -> URI_prefix:
         ie: 'bar': 'http://foo.org/bar_'
 
+        cache_size bounds the number of CURIE expansions remembered by get_uri()
+        (the same few thousand predicates and classes are expanded over and over),
+        the least recently used is forgotten first
+
         '''
         self.curie_map = curie_map
+        self.cache_size = cache_size
+        self.uri_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         if curie_map is not None:  # inverse the map
             if len(set(curie_map.keys())) != len(set(curie_map.values())):
                 LOG.warning("Curie map is NOT one to one!")
@@ -26,6 +37,14 @@ class CurieUtil(object):
             self.uri_map = {}
             for key, value in curie_map.items():
                 self.uri_map[value] = key
+
+            # character trie over the base IRIs for longest prefix matching
+            self.prefix_trie = {}
+            for base_iri, prefix in self.uri_map.items():
+                node = self.prefix_trie
+                for char in base_iri:
+                    node = node.setdefault(char, {})
+                node[self.TRIE_END] = prefix
         return
 
     def get_curie(self, uri):
@@ -36,15 +55,48 @@ class CurieUtil(object):
             return f'{prefix}:{uri[len(key):len(uri)]}'
         return None
 
+    def get_curies(self, uris):
+        '''Get CURIEs for an iterable of URIs (None where there is no prefix)'''
+        return [self.get_curie(uri) for uri in uris]
+
     def get_curie_prefix(self, uri):
-        ''' Return the CURIE's prefix:'''
-        for key, value in self.uri_map.items():
-            if uri.startswith(key):  # no... need the longest match not the first match
-                return value
-        return None
+        ''' Return the CURIE's prefix: whose base IRI is the longest match'''
+        node = self.prefix_trie
+        prefix = node.get(self.TRIE_END)
+        for char in uri:
+            node = node.get(char)
+            if node is None:
+                break
+            if self.TRIE_END in node:
+                prefix = node[self.TRIE_END]
+        return prefix
 
     def get_uri(self, curie):
-        ''' Get a URI from a CURIE '''
+        ''' Get a URI from a CURIE (memoized)'''
+        try:
+            iri = self.uri_cache[curie]
+        except KeyError:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+            self.uri_cache.move_to_end(curie)
+            return iri
+
+        iri = self._expand(curie)
+        if len(self.uri_cache) >= self.cache_size:
+            self.uri_cache.popitem(last=False)
+        self.uri_cache[curie] = iri
+        return iri
+
+    def cache_info(self):
+        ''' hit/miss counters of the get_uri() cache, for profiling '''
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self.uri_cache),
+            'maxsize': self.cache_size}
+
+    def _expand(self, curie):
         if curie is None:
             return None
         parts = curie.split(':')
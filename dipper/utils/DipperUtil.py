@@ -1,6 +1,10 @@
+import hashlib
 import logging
 import unicodedata
+from urllib.parse import urlencode
 import requests
+from dipper import config
+from dipper.utils.ResponseCache import ResponseCache, RateLimiter
 
 __author__ = 'nlw'
 LOG = logging.getLogger(__name__)
@@ -13,7 +17,116 @@ SESSION.mount('http://', ADAPTER)
 EUTIL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
 ESEARCH = EUTIL + '/esearch.fcgi'
 ESUMMARY = EUTIL + '/esummary.fcgi'
+EFETCH = EUTIL + '/efetch.fcgi'
 EREQ = {'email': 'info@monarchinitiative.org', 'tool': 'Dipper'}
+EUTILS_CACHE = 'raw/eutils'
+_EUTILS = None  # see DipperUtil.eutils()
+
+
+class EUtils:
+    """
+    NCBI E-utilities client which keeps to their request rate
+    (three a second, ten with an api_key),
+    posts lists of ids in batches and keeps every response on disk,
+    so reruns and other users of the same cache do not ask again.
+    """
+
+    BATCH = 500     # ids per esummary/efetch request, terms per esearch_any
+    RETMAX = 10000  # most uids an esearch returns
+
+    def __init__(self, cachedir=EUTILS_CACHE, ttl=30 * 86400, api_key=None):
+        """
+        :param cachedir: str directory for the responses, None to not keep them
+        :param ttl: int seconds before a response is asked for again
+        :param api_key: str NCBI api key, allows a higher rate
+        """
+        self.cache = None if cachedir is None else ResponseCache(cachedir, ttl)
+        self.limiter = RateLimiter(3 if api_key is None else 10)
+        self.params = dict(EREQ)
+        if api_key is not None:
+            self.params['api_key'] = api_key
+
+    def request(self, url, params, refresh=False):
+        """
+        :param url: str one of the E-utilities
+        :param params: dict of the query
+        :param refresh: bool ask again even if there is a cached response
+        :return: the decoded json response, or the text if not asked for json
+        """
+        query = dict(self.params, **params)
+        key = hashlib.sha1(
+            (url + '?' + urlencode(sorted(query.items()), doseq=True)).encode()
+        ).hexdigest()
+        if self.cache is not None and not refresh:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
+        self.limiter.wait()
+        # POST, the id lists would not fit in a url
+        request = SESSION.post(url, data=query)
+        LOG.info('fetching: %s %s', url, params.get('term', ''))
+        request.raise_for_status()
+        if query.get('retmode') == 'json':
+            response = request.json()
+        else:
+            response = request.text
+        if self.cache is not None:
+            self.cache.put(key, response)
+        return response
+
+    def esearch(self, db, term, **params):
+        """
+        :param params: other esearch parameters, e.g. retmax=100
+        :return: dict esearchresult
+        """
+        req = dict(params, db=db, retmode='json', term=term)
+        result = self.request(ESEARCH, req)['esearchresult']
+        # Occasionally eutils returns the json blob
+        # {'ERROR': 'Invalid db name specified: taxonomy'}
+        if 'ERROR' in result:
+            result = self.request(ESEARCH, req, refresh=True)['esearchresult']
+        return result
+
+    def esearch_any(self, db, terms):
+        """
+        :param terms: list of search terms, OR'ed together a batch at a time
+        :return: list of the uids matching any of them
+        """
+        uids = []
+        for batch in self._batches(terms):
+            result = self.esearch(db, ' OR '.join(batch), retmax=self.RETMAX)
+            uids.extend(result['idlist'])
+        return uids
+
+    def esummary(self, db, ids):
+        """
+        :param ids: list of uids
+        :return: dict of uid to its document summary
+        """
+        summaries = {}
+        for batch in self._batches(ids):
+            data = self.request(
+                ESUMMARY, {'db': db, 'retmode': 'json', 'id': ','.join(batch)})
+            if 'result' in data:
+                for uid in batch:
+                    if uid in data['result']:
+                        summaries[uid] = data['result'][uid]
+        return summaries
+
+    def efetch(self, db, ids, **params):
+        """
+        :param ids: list of uids
+        :param params: other efetch parameters, e.g. report='xml'
+        :return: list of the responses, one for each batch of ids
+        """
+        return [
+            self.request(EFETCH, dict(params, db=db, id=','.join(batch)))
+            for batch in self._batches(ids)]
+
+    def _batches(self, ids):
+        ids = [str(uid) for uid in ids]
+        return [ids[i:i + self.BATCH] for i in range(0, len(ids), self.BATCH)]
 
 
 class DipperUtil:
@@ -43,6 +156,17 @@ class DipperUtil:
         '''
         return "".join(ch for ch in string if unicodedata.category(ch)[0] != "C")
 
+    @staticmethod
+    def eutils():
+        """
+        :return: the EUtils client shared by this process
+        """
+        global _EUTILS
+        if _EUTILS is None:
+            _EUTILS = EUtils(
+                api_key=config.get_config().get('keys', {}).get('ncbi') or None)
+        return _EUTILS
+
     @staticmethod
     def get_ncbi_taxon_num_by_label(label):
         """
@@ -52,60 +176,55 @@ class DipperUtil:
         :return:
 
         """
-        req = {'db': 'taxonomy', 'retmode': 'json', 'term': label}
-        req.update(EREQ)
+        return DipperUtil.get_taxon_nums_by_labels([label]).get(label)
 
-        request = SESSION.get(ESEARCH, params=req)
-        LOG.info('fetching: %s', request.url)
-        request.raise_for_status()
-        result = request.json()['esearchresult']
-
-        # Occasionally eutils returns the json blob
-        # {'ERROR': 'Invalid db name specified: taxonomy'}
-        if 'ERROR' in result:
-            request = SESSION.get(ESEARCH, params=req)
-            LOG.info('fetching: %s', request.url)
-            request.raise_for_status()
-            result = request.json()['esearchresult']
-
-        tax_num = None
-        if 'count' in result and str(result['count']) == '1':
-            tax_num = result['idlist'][0]
-        else:
-            # TODO throw errors
-            LOG.warning('ESEARCH for taxon label "%s"  returns %s', label, str(result))
+    @staticmethod
+    def get_taxon_nums_by_labels(labels):
+        """
+        NCBI Taxon ids for some labels, for those which have a unique hit
 
-        return tax_num
+        :param labels: list of taxon labels
+        :return: dict of label to taxon number
+        """
+        tax_nums = {}
+        for label in labels:
+            result = DipperUtil.eutils().esearch('taxonomy', label)
+            if 'count' in result and str(result['count']) == '1':
+                tax_nums[label] = result['idlist'][0]
+            else:
+                # TODO throw errors
+                LOG.warning(
+                    'ESEARCH for taxon label "%s"  returns %s', label, str(result))
+        return tax_nums
 
     @staticmethod
     def get_homologene_by_gene_num(gene_num):
-        # first, get the homologene id from the gene id
-        # gene_id = '1264'  for testing
-        req = {
-            'db': 'homologene',
-            'retmode': 'json',
-            'term': str(gene_num) + "[Gene ID]",
-            # 'usehistory': None  # y/n
-            # 'rettype':  [uilist|count]
-        }
-        req.update(EREQ)
-        ereq = requests.get(ESEARCH, params=req)
-        homologene_ids = ereq.json()['esearchresult']['idlist']
-        if len(homologene_ids) != 1:
-            return
-        hid = homologene_ids[0]
-        # now, fetch the homologene record
-        req = {'db': 'homologene', 'id': hid, 'retmode': 'json'}
-        req.update(EREQ)
-        request = SESSION.get(ESUMMARY, params=req)
-        data = request.json()
-
-        if 'result' in data and hid in data['result']:
-            homologs = data['result'][hid]
-        else:
-            homologs = None
+        return DipperUtil.get_homologene_by_gene_nums([gene_num]).get(gene_num)
+
+    @staticmethod
+    def get_homologene_by_gene_nums(gene_nums):
+        """
+        HomoloGene records of genes which are in exactly one of them
 
-        return homologs
+        :param gene_nums: list of NCBI gene numbers
+        :return: dict of gene number to its HomoloGene document summary
+        """
+        eutils = DipperUtil.eutils()
+        # first, the homologene ids of any of the genes, many at a time
+        homologene_ids = eutils.esearch_any(
+            'homologene', [str(gene_num) + '[Gene ID]' for gene_num in gene_nums])
+        homologs = eutils.esummary('homologene', sorted(set(homologene_ids)))
+        # then, which genes each of the records holds
+        gene_hids = {}
+        for (hid, homolog) in homologs.items():
+            for member in homolog.get('homologenedatalist', []):
+                gene_hids.setdefault(str(member.get('geneid')), set()).add(hid)
+        homologenes = {}
+        for gene_num in gene_nums:
+            hids = gene_hids.get(str(gene_num), ())
+            if len(hids) == 1:
+                homologenes[gene_num] = homologs[next(iter(hids))]
+        return homologenes
 
     @staticmethod
     def is_id_in_mondo(curie, mondo_min):
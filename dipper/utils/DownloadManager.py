@@ -0,0 +1,167 @@
+import os
+import time
+import logging
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from email.utils import formatdate, parsedate_to_datetime
+
+LOG = logging.getLogger(__name__)
+CHUNK = 1024 * 1024  # copy downloads in 1M chunks
+
+
+class IncompleteDownload(OSError):
+    pass
+
+
+class DownloadManager:
+    """
+    Fetch remote files over HTTP(S) (or FTP) with
+        - at most `per_host` concurrent requests to any one host
+          (callers supply the threads, e.g. from a ThreadPoolExecutor
+          of `max_workers`)
+        - conditional GETs: If-None-Match / If-Modified-Since the local copy,
+          so an unchanged file costs a single 304 and no separate probe
+        - downloads written to '<file>.part' and resumed with a Range request
+          after an interruption, only replacing the local file when complete
+        - retries with exponential backoff on network errors, 5xx and 429
+    """
+
+    RETRY_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_workers=8, per_host=2, retries=3, backoff=2.0, timeout=120):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.host_slots = {}
+        self.lock = threading.Lock()
+
+    def download(self, url, localfile, headers=None, is_dl_forced=False, etag=None):
+        """
+        :param url: remote file
+        :param localfile: path to save it to
+        :param headers: dict of request headers
+        :param is_dl_forced: bool fetch even if the local copy is current
+        :param etag: str ETag of the local copy, if known
+        :return: dict with 'status' one of 'downloaded', 'not_modified' or 'failed'
+            and the 'etag', 'last_modified' (datetime) and 'size' of the remote file
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                with self._host_slot(url):
+                    return self._download(url, localfile, headers, is_dl_forced, etag)
+            except urllib.error.HTTPError as err:
+                if err.code not in self.RETRY_CODES or attempt == self.retries:
+                    LOG.error('HTTP %s for: %s', err.code, url)
+                    return {'status': 'failed', 'error': str(err)}
+                error = err
+            except (urllib.error.URLError, OSError) as err:
+                if attempt == self.retries:
+                    LOG.error('%s\n\tFor: %s', err, url)
+                    return {'status': 'failed', 'error': str(err)}
+                error = err
+            wait = self.backoff * 2 ** attempt
+            LOG.warning('%s fetching %s, retrying in %.0f sec', error, url, wait)
+            time.sleep(wait)
+
+    def _host_slot(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_slots[host]
+
+    def _download(self, url, localfile, headers, is_dl_forced, etag):
+        req_headers = dict(headers) if headers is not None else {}
+        if not is_dl_forced and os.path.exists(localfile):
+            if etag is not None:
+                req_headers['If-None-Match'] = etag
+            req_headers['If-Modified-Since'] = formatdate(
+                os.stat(localfile).st_mtime, usegmt=True)
+
+        partfile = localfile + '.part'
+        offset = 0
+        if os.path.exists(partfile):
+            # the .part's mtime is the Last-Modified of what it holds
+            offset = os.path.getsize(partfile)
+            req_headers['Range'] = 'bytes={}-'.format(offset)
+            req_headers['If-Range'] = formatdate(
+                os.stat(partfile).st_mtime, usegmt=True)
+
+        request = urllib.request.Request(url, headers=req_headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as err:
+            if err.code == 304:
+                LOG.info("Remote file unchanged, using existing %s", localfile)
+                return self._result('not_modified', err.headers, localfile)
+            if err.code == 416 and offset:
+                os.remove(partfile)
+                raise IncompleteDownload('stale partial download of ' + url)
+            raise
+
+        with response:
+            if offset and response.getcode() != 206:
+                offset = 0  # the range was ignored, start over
+            size = response.headers.get('Content-Length')
+            if size is not None and size != '':
+                size = int(size) + offset
+            else:
+                size = None
+            last_modified = self._last_modified(response.headers)
+
+            if offset:
+                LOG.info("Resuming %s at byte %i", url, offset)
+            else:
+                LOG.info("Fetching %s", url)
+            try:
+                with open(partfile, 'ab' if offset else 'wb') as binwrite:
+                    while True:
+                        chunk = response.read(CHUNK)
+                        if not chunk:
+                            break
+                        binwrite.write(chunk)
+                got = os.path.getsize(partfile)
+                if size is not None and got != size:
+                    raise IncompleteDownload(
+                        'got {} of {} bytes from {}'.format(got, size, url))
+            except BaseException:
+                # without a Last-Modified there is nothing to validate a resume with
+                if last_modified is None and os.path.exists(partfile):
+                    os.remove(partfile)
+                raise
+            finally:
+                if last_modified is not None:
+                    self._set_mtime(partfile, last_modified)
+
+            os.replace(partfile, localfile)
+            LOG.info("Finished.  Wrote %i bytes to %s", got, localfile)
+            return self._result('downloaded', response.headers, localfile)
+
+    def _result(self, status, headers, localfile):
+        size = None
+        if os.path.exists(localfile):
+            size = os.path.getsize(localfile)
+        return {
+            'status': status,
+            'etag': headers.get('ETag') if headers is not None else None,
+            'last_modified': self._last_modified(headers),
+            'size': size}
+
+    @staticmethod
+    def _last_modified(headers):
+        if headers is None or headers.get('Last-Modified') is None:
+            return None
+        try:
+            return parsedate_to_datetime(headers.get('Last-Modified'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _set_mtime(path, last_modified):
+        if os.path.exists(path):
+            stamp = last_modified.timestamp()
+            os.utime(path, (stamp, stamp))
@@ -1,20 +1,48 @@
+import sys
 import logging
 import hashlib
 
-from xml.sax import SAXParseException
 from collections import defaultdict
-from rdflib import URIRef, ConjunctiveGraph, util as rdflib_util
+from rdflib import URIRef, Graph
 from rdflib.namespace import DC, RDF, OWL
 
 from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils.OntologySnapshot import OntologySnapshot
+from dipper.utils import ShardedWriter, Compression
 
 __author__ = 'nlw'
 
 LOG = logging.getLogger(__name__)
 
 
+# where the properties we use are declared
+GH = 'https://raw.githubusercontent.com'
+OBO = 'http://purl.obolibrary.org/obo'
+PROPERTY_ONTOLOGIES = [
+    OBO + '/sepio.owl',
+    OBO + '/geno.owl',
+    OBO + '/iao.owl',
+    OBO + '/ero.owl',
+    OBO + '/pco.owl',
+    OBO + '/xco.owl',
+    OBO + '/ro.owl',
+    GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
+]
+PROPERTY_TYPES = ('ObjectProperty', 'AnnotationProperty', 'DatatypeProperty')
+
+
+def _declared_properties(ontology_graph):
+    return {
+        ptype: sorted(
+            str(prop) for prop in ontology_graph.subjects(RDF['type'], OWL[ptype])
+            if isinstance(prop, URIRef))
+        for ptype in PROPERTY_TYPES}
+
+
 class GraphUtils:
 
+    property_types = None   # see get_property_types()
+
     def __init__(self, curie_map):
         self.curie_map = curie_map
         self.cu = CurieUtil(curie_map)
@@ -22,12 +50,19 @@ class GraphUtils:
         return
 
     @staticmethod
-    def write(graph, fileformat=None, filename=None):
+    def write(
+            graph, fileformat=None, filename=None, jobs=1, keep_shards=False,
+            compress=None):
         """
         A basic graph writer (to stdout) for any of the sources.
         this will write raw triples in rdfxml, unless specified.
         to write turtle, specify format='turtle'
         an optional file can be supplied instead of stdout
+
+        With more than one job, rdflib graphs in nt or nquads are written
+        in shards by parallel processes, see ShardedWriter.write()
+        With compress ('gzip' or 'zstd') the serialization is compressed,
+        by a pool of threads, as it is written
         :return: None
 
         """
@@ -35,14 +70,31 @@ class GraphUtils:
         filewriter = None
         if fileformat is None:
             fileformat = 'turtle'
+        if jobs > 1 and isinstance(graph, Graph):
+            if fileformat in ShardedWriter.SHARD_FORMATS:
+                ShardedWriter.write(
+                    graph, fileformat, filename, jobs, keep_shards, compress)
+                return
+            LOG.info("Writing %s in a single process, only nt and nquads are"
+                     " written in parallel", fileformat)
         if filename is not None:
-
-            with open(filename, 'wb') as filewriter:
-                LOG.info("Writing triples in %s to %s", fileformat, filename)
+            LOG.info("Writing triples in %s to %s", fileformat, filename)
+            if compress is None:
+                filewriter = open(filename, 'wb')
+            else:
+                filewriter = Compression.open_writer(filename, compress)
+        elif compress is not None:
+            filewriter = Compression.open_writer(
+                sys.stdout.buffer, compress, closefd=False)
+
+        if filewriter is None:
+            # straight out rather than as one string
+            graph.serialize(sys.stdout.buffer, format=fileformat)
+            sys.stdout.buffer.flush()
+        else:
+            with filewriter:
                 # rdflib serialize
                 graph.serialize(filewriter, format=fileformat)
-        else:
-            print(graph.serialize(fileformat).decode())
         return
 
     @staticmethod
@@ -52,6 +104,9 @@ class GraphUtils:
         :param graph: RDFLib.graph
         :return: set, set of properties
         """
+        # our graphs keep count as they go
+        if hasattr(graph, 'predicate_counts'):
+            return set(graph.predicate_counts)
         # collapse to single list
         property_set = list()
         for row in graph.predicates():
@@ -60,55 +115,37 @@ class GraphUtils:
         return set(property_set)
 
     @staticmethod
-    def add_property_axioms(graph, properties):
-        ontology_graph = ConjunctiveGraph()
-        GH = 'https://raw.githubusercontent.com'
-        OBO = 'http://purl.obolibrary.org/obo'
-        ontologies = [
-            OBO + '/sepio.owl',
-            OBO + '/geno.owl',
-            OBO + '/iao.owl',
-            OBO + '/ero.owl',
-            OBO + '/pco.owl',
-            OBO + '/xco.owl',
-            OBO + '/ro.owl',
-            GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
-        ]
-
-        # random timeouts can waste hours. (too many redirects?)
-        # there is a timeout param in urllib.request,
-        # but it is not exposed by rdflib.parsing
-        # so retry once on URLError
-        for ontology in ontologies:
-            LOG.info("parsing: " + ontology)
-            try:
-                ontology_graph.parse(
-                    ontology, format=rdflib_util.guess_format(ontology))
-            except SAXParseException as e:
-                LOG.error(e)
-                LOG.error('Retrying as turtle: ' + ontology)
-                ontology_graph.parse(ontology, format="turtle")
-            except OSError as e:  # URLError:
-                # simple retry
-                LOG.error(e)
-                LOG.error('Retrying: ' + ontology)
-                ontology_graph.parse(
-                    ontology, format=rdflib_util.guess_format(ontology))
-
-        # Get object properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['ObjectProperty']),
-            graph, OWL['ObjectProperty'], properties)
-
-        # Get annotation properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['AnnotationProperty']),
-            graph, OWL['AnnotationProperty'], properties)
-
-        # Get data properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['DatatypeProperty']),
-            graph, OWL['DatatypeProperty'], properties)
+    def get_property_types(offline=False):
+        """
+        Which properties the ontologies we use declare to be
+        Object, Annotation or Datatype properties.
+        Looked up once per process from a local index of each ontology,
+        which is only rebuilt when the ontology changes (see OntologySnapshot)
+
+        :param offline: bool use the local index without checking for new versions
+        :return: dict of property type (e.g. 'ObjectProperty') to a set of URIRefs
+        """
+        if GraphUtils.property_types is None:
+            property_types = {ptype: set() for ptype in PROPERTY_TYPES}
+            for ontology in PROPERTY_ONTOLOGIES:
+                snapshot = OntologySnapshot(ontology, offline=offline)
+                declared = snapshot.extract('properties', _declared_properties)
+                if declared is None:
+                    continue
+                for ptype in PROPERTY_TYPES:
+                    property_types[ptype].update(URIRef(iri) for iri in declared[ptype])
+            GraphUtils.property_types = property_types
+        return GraphUtils.property_types
+
+    @staticmethod
+    def add_property_axioms(graph, properties, offline=False):
+        property_types = GraphUtils.get_property_types(offline)
+        properties = set(properties)
+
+        # Get object properties, annotation properties and data properties
+        for ptype in PROPERTY_TYPES:
+            graph = GraphUtils.add_property_to_graph(
+                property_types[ptype], graph, OWL[ptype], properties)
 
         for row in graph.predicates(DC['source'], OWL['AnnotationProperty']):
             if row == RDF['type']:
@@ -170,6 +207,10 @@ class GraphUtils:
         # exist is accessed
         counts = defaultdict(lambda: defaultdict(int))
         for this_g in [graph1, graph2]:
+            if hasattr(this_g, 'predicate_counts'):
+                for (this_p, count) in this_g.predicate_counts.items():
+                    counts[this_p][str(this_g.identifier)] += count
+                continue
             for this_p in this_g.predicates():
                 counts[this_p][str(this_g.identifier)] = \
                     counts[this_p][str(this_g.identifier)] + 1
@@ -190,6 +231,9 @@ class GraphUtils:
         # dict of dicts that acts sensibly when a key that doesn't
         # exist is accessed
         counts = defaultdict(int)
+        if hasattr(graph, 'predicate_counts'):
+            counts.update(graph.predicate_counts)
+            return counts
         for this_p in graph.predicates():
             counts[this_p] = counts[this_p] + 1
         return counts
@@ -0,0 +1,186 @@
+import re
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+_DELETED = object()
+
+
+class IntKeys:
+    """
+    Key codec for IntKeyMap: numeric keys, optionally behind a fixed prefix,
+    i.e. '12345' (MGI's _object_key) or 'MGI:12345'.
+    """
+
+    DIGITS = re.compile(r'(0|[1-9][0-9]{0,17})\Z')
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+
+    def encode(self, key):
+        """
+        :return: int the key stands for, None if it is not of this form
+        """
+        if not isinstance(key, str) or not key.startswith(self.prefix):
+            return None
+        digits = key[len(self.prefix):]
+        if self.DIGITS.match(digits) is None:
+            return None
+        return int(digits)
+
+    def decode(self, num):
+        return self.prefix + str(num)
+
+
+class ZdbKeys:
+    """
+    IntKeyMap key codec for ZFIN ids, 'ZFIN:ZDB-GENE-980526-166',
+    packing the id's type, date and serial number into one integer
+    """
+
+    ZDB_ID = re.compile(r'ZFIN:ZDB-([A-Z]+)-([0-9]{6})-(0|[1-9][0-9]{0,7})\Z')
+
+    def __init__(self):
+        self.types = []     # 'GENE', 'ALT', 'FISH', ... in order of appearance
+        self.type_nums = {}
+
+    def encode(self, key):
+        if not isinstance(key, str):
+            return None
+        match = self.ZDB_ID.match(key)
+        if match is None:
+            return None
+        (zdb_type, date, serial) = match.groups()
+        if zdb_type not in self.type_nums:
+            self.type_nums[zdb_type] = len(self.types)
+            self.types.append(zdb_type)
+        return self.type_nums[zdb_type] << 48 | int(date) << 28 | int(serial)
+
+    def decode(self, num):
+        return 'ZFIN:ZDB-{}-{:06d}-{}'.format(
+            self.types[num >> 48], num >> 28 & 0xFFFFF, num & 0xFFFFFFF)
+
+
+class IntKeyMap(MutableMapping):
+    """
+    Compact dict replacement for string values under (very) many keys
+    which a codec can encode as integers (see IntKeys).
+
+    Keys are kept as a sorted array of integers and the values utf-8 encoded,
+    one after another, in a single byte array; about 20 bytes plus the value
+    per entry against a couple of hundred for a dict of strings.
+    Recent writes collect in a small dict which is merged into the arrays
+    once it grows past a fraction of them.
+
+    Keys the codec can not encode and values that are not strings
+    are kept in an ordinary dict, so any key or value still works.
+    Iteration is in key order rather than insertion order.
+    Overwritten values are not reclaimed.
+    """
+
+    MIN_PENDING = 2 ** 14   # merge no more often than this many new entries
+
+    def __init__(self, items=None, codec=None):
+        self.codec = codec if codec is not None else IntKeys()
+        self.ints = array('q')        # the keys, encoded and sorted
+        self.starts = array('Q')      # of each value in blob
+        self.lengths = array('I')
+        self.blob = bytearray()
+        self.pending = {}
+        self.other = {}
+        if items is not None:
+            self.update(items)
+
+    def __getitem__(self, key):
+        num = self.codec.encode(key)
+        if num is None or key in self.other:
+            return self.other[key]
+        if num in self.pending:
+            value = self.pending[num]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        idx = bisect_left(self.ints, num)
+        if idx < len(self.ints) and self.ints[idx] == num:
+            start = self.starts[idx]
+            return self.blob[start:start + self.lengths[idx]].decode(
+                'utf-8', 'surrogatepass')
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        num = self.codec.encode(key)
+        if num is None or key in self.other:
+            return key in self.other
+        if num in self.pending:
+            return self.pending[num] is not _DELETED
+        idx = bisect_left(self.ints, num)
+        return idx < len(self.ints) and self.ints[idx] == num
+
+    def __setitem__(self, key, value):
+        num = self.codec.encode(key)
+        if num is None:
+            self.other[key] = value
+            return
+        if isinstance(value, str):
+            self.other.pop(key, None)
+            self.pending[num] = value
+            if len(self.pending) >= max(self.MIN_PENDING, len(self.ints) // 16):
+                self._merge()
+        else:
+            self.other[key] = value
+            self.pending[num] = _DELETED
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self.other:
+            del self.other[key]
+        else:
+            self.pending[self.codec.encode(key)] = _DELETED
+
+    def __iter__(self):
+        self._merge()
+        decode = self.codec.decode
+        for num in self.ints:
+            yield decode(num)
+        for key in list(self.other):
+            yield key
+
+    def __len__(self):
+        self._merge()
+        return len(self.ints) + len(self.other)
+
+    def __repr__(self):
+        return '{}({} entries)'.format(self.__class__.__name__, len(self))
+
+    def _merge(self):
+        """
+        Fold the pending writes into the sorted arrays,
+        copying the runs of untouched entries between them wholesale
+        """
+        if not self.pending:
+            return
+        keys = array('q')
+        starts = array('Q')
+        lengths = array('I')
+        last = 0
+        for num in sorted(self.pending):
+            idx = bisect_left(self.ints, num, last)
+            keys.extend(self.ints[last:idx])
+            starts.extend(self.starts[last:idx])
+            lengths.extend(self.lengths[last:idx])
+            last = idx
+            if idx < len(self.ints) and self.ints[idx] == num:
+                last += 1   # replaced or deleted
+            value = self.pending[num]
+            if value is not _DELETED:
+                encoded = value.encode('utf-8', 'surrogatepass')
+                keys.append(num)
+                starts.append(len(self.blob))
+                lengths.append(len(encoded))
+                self.blob.extend(encoded)
+        keys.extend(self.ints[last:])
+        starts.extend(self.starts[last:])
+        lengths.extend(self.lengths[last:])
+        (self.ints, self.starts, self.lengths) = (keys, starts, lengths)
+        self.pending = {}
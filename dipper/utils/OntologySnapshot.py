@@ -0,0 +1,181 @@
+import os
+import json
+import logging
+from collections import defaultdict
+from urllib.parse import urlsplit
+from xml.sax import SAXParseException
+
+from rdflib import ConjunctiveGraph, URIRef, RDFS, util as rdflib_util
+
+from dipper.utils.ContentStore import ContentStore
+from dipper.utils.DownloadManager import DownloadManager
+
+LOG = logging.getLogger(__name__)
+SNAPSHOT_DIR = 'raw/ontologies'
+
+
+class OntologySnapshot:
+    """
+    A local copy of an ontology, and lookups extracted from it.
+
+    The copy is only fetched again when the remote file has changed
+    (a conditional GET), and each lookup is extracted once per version
+    of the file, kept beside it as '<file>.<name>.json'.
+    Offline, whatever is on disk is used without asking.
+    """
+
+    downloader = DownloadManager()
+
+    def __init__(self, url, snapdir=SNAPSHOT_DIR, offline=False, store=None):
+        """
+        :param url: str where the ontology is published
+        :param snapdir: str directory to keep it in
+        :param offline: bool never go to the network
+        :param store: ContentStore of snapdir, when one is already open
+        """
+        self.url = url
+        self.offline = offline
+        self.localfile = os.path.join(snapdir, os.path.basename(urlsplit(url).path))
+        os.makedirs(snapdir, exist_ok=True)
+        self.store = store if store is not None else ContentStore(snapdir)
+        self.is_fetched = False
+
+    def fetch(self):
+        """
+        Bring the local copy up to date, once per snapshot
+
+        :return: bool if there is a local copy
+        """
+        if not self.offline and not self.is_fetched:
+            result = self.downloader.download(
+                self.url, self.localfile, etag=self.store.etag(self.localfile))
+            if result['status'] == 'downloaded':
+                self.store.add(
+                    self.localfile, self.url, result['etag'], result['last_modified'])
+            elif result['status'] == 'failed':
+                LOG.warning('Could not update %s from %s', self.localfile, self.url)
+            self.is_fetched = True
+        return os.path.exists(self.localfile)
+
+    def graph(self):
+        """
+        :return: the ontology parsed by rdflib
+        """
+        self.fetch()
+        graph = ConjunctiveGraph()
+        LOG.info("parsing: %s", self.localfile)
+        try:
+            graph.parse(self.localfile, format=rdflib_util.guess_format(self.url))
+        except SAXParseException as err:
+            LOG.error(err)
+            LOG.error('Retrying as turtle: %s', self.localfile)
+            graph = ConjunctiveGraph()
+            graph.parse(self.localfile, format='turtle')
+        return graph
+
+    def extract(self, name, function):
+        """
+        :param name: str for the lookup
+        :param function: of the ontology's rdflib graph to something json serializable
+        :return: function's value for the current version of the ontology,
+            None if there is neither a local copy nor a lookup made earlier
+        """
+        lookupfile = '{}.{}.json'.format(self.localfile, name)
+        lookup = None
+        if os.path.exists(lookupfile):
+            with open(lookupfile, 'r') as reader:
+                lookup = json.load(reader)
+
+        if not self.fetch():
+            if lookup is None:
+                LOG.error('No copy of %s to extract %s from', self.url, name)
+                return None
+            LOG.warning('Using %s without its ontology', lookupfile)
+            return lookup['value']
+
+        digest = self.store.digest(self.localfile)
+        if lookup is not None and lookup['sha256'] == digest:
+            return lookup['value']
+
+        lookup = {'url': self.url, 'sha256': digest, 'value': function(self.graph())}
+        with open(lookupfile + '.tmp', 'w') as writer:
+            json.dump(lookup, writer)
+        os.replace(lookupfile + '.tmp', lookupfile)
+        return lookup['value']
+
+    def terms(self):
+        """
+        :return: OntologyTerms of the current version of the ontology,
+            empty if there is no copy of it
+        """
+        lookup = self.extract('terms', terms_of)
+        if lookup is None:
+            lookup = {'labels': {}, 'parents': {}}
+        return OntologyTerms(lookup)
+
+
+def terms_of(graph):
+    """
+    The labels and the named superclasses of an ontology's terms, by IRI
+
+    :param graph: rdflib graph of the ontology
+    :return: dict {'labels': {iri: label}, 'parents': {iri: [iri]}}
+    """
+    labels = {}
+    for (term, label) in graph.subject_objects(RDFS['label']):
+        if isinstance(term, URIRef):
+            # terms with more than one label keep all of them
+            labels.setdefault(str(term), []).append(str(label))
+    parents = defaultdict(set)
+    for (term, parent) in graph.subject_objects(RDFS['subClassOf']):
+        if isinstance(term, URIRef) and isinstance(parent, URIRef):
+            parents[str(term)].add(str(parent))
+    return {
+        'labels': {term: sorted(names) for (term, names) in labels.items()},
+        'parents': {term: sorted(iris) for (term, iris) in parents.items()},
+    }
+
+
+class OntologyTerms:
+    """
+    Labels and subclass hierarchy of an ontology, as extracted by terms_of()
+    """
+
+    def __init__(self, lookup):
+        self.labels = lookup['labels']
+        self.parents = lookup['parents']
+        self._children = None
+
+    def label(self, iri):
+        """
+        :return: str the term's label, None unless it has exactly one
+        """
+        names = self.labels.get(iri, ())
+        return names[0] if len(names) == 1 else None
+
+    def children(self, iri):
+        """
+        :return: list of the term's direct subclasses
+        """
+        if self._children is None:
+            self._children = defaultdict(list)
+            for (term, parents) in sorted(self.parents.items()):
+                for parent in parents:
+                    self._children[parent].append(term)
+        return self._children.get(iri, [])
+
+    def ancestors(self, iri):
+        """
+        :return: set of the term's superclasses, direct or not (rdfs:subClassOf+)
+        """
+        found = set()
+        todo = list(self.parents.get(iri, ()))
+        while todo:
+            term = todo.pop()
+            if term not in found:
+                found.add(term)
+                todo.extend(self.parents.get(term, ()))
+        return found
+
+    def is_subclass_of(self, iri, ancestor):
+        return ancestor in self.ancestors(iri)
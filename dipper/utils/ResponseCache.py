@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import logging
+import threading
+from urllib.parse import quote
+
+LOG = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Web API responses kept on disk as json, one file per key,
+    so a rerun only asks the API for what is missing or has expired.
+    Safe to share between threads.
+    """
+
+    def __init__(self, cachedir, ttl=None):
+        """
+        :param cachedir: str directory to keep the responses in
+        :param ttl: int seconds a response stays fresh, by default forever
+        """
+        self.cachedir = cachedir
+        self.ttl = ttl
+        os.makedirs(cachedir, exist_ok=True)
+
+    def get(self, key):
+        """
+        :return: the response stored under key, None if absent or expired
+        """
+        path = self.path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'r') as reader:
+                return json.load(reader)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            LOG.warning('Ignoring unreadable cached response %s', path)
+            return None
+
+    def put(self, key, response):
+        """
+        :param response: json serializable
+        """
+        path = self.path(key)
+        tmpfile = '{}.{}.tmp'.format(path, threading.get_ident())
+        with open(tmpfile, 'w') as writer:
+            json.dump(response, writer)
+        os.replace(tmpfile, path)
+
+    def path(self, key):
+        return os.path.join(self.cachedir, quote(str(key), safe='') + '.json')
+
+
+class RateLimiter:
+    """
+    Token bucket: on average no more than `rate` calls a second,
+    in bursts of at most `burst`. Safe to share between threads.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        :param rate: float calls per second
+        :param burst: int calls allowed back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Block until a call is allowed
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.stamp = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
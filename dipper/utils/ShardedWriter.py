@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import zlib
+import shutil
+import hashlib
+import logging
+import tempfile
+import multiprocessing
+
+# importing nt also registers the '_rdflib_nt_escape' error handler
+from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.plugins.serializers.nquads import _nq_row
+
+from dipper.utils import Compression
+
+LOG = logging.getLogger(__name__)
+
+SHARD_FORMATS = {'nt': 'nt', 'nquads': 'nq'}   # line based, so shards concatenate
+CHUNK_ROWS = 10000
+MANIFEST = 'MANIFEST.json'
+
+_GRAPH = None   # the graph being written, inherited by the forked workers
+_SUBJECTS = None    # and its subjects, split into shards
+
+
+def shard_of(subject, shards):
+    """
+    :param subject: rdflib node
+    :param shards: int
+    :return: int the shard all of the subject's triples go to,
+        the same in every process and every run
+    """
+    return zlib.crc32(subject.encode('utf-8', 'surrogatepass')) % shards
+
+
+def write(graph, fmt, filename=None, jobs=2, keep_shards=False, compress=None):
+    """
+    Serialize an rdflib graph as N-Triples or N-Quads, partitioned by
+    subject into `jobs` shards written in parallel worker processes.
+    The distinct subjects are listed once, each worker then only looks up
+    the triples of the subjects in its shard.
+
+    The shards are concatenated into filename (or stdout),
+    or with keep_shards left as '<filename>.d/part-NNNNN.<ext>'
+    beside a manifest of their triple counts and sha256 digests.
+    Compressed, each worker compresses its own shard; concatenated gzip
+    members, as zstd frames, are themselves a valid compressed file.
+
+    :param graph: rdflib (Conjunctive)Graph
+    :param fmt: str 'nt' or 'nquads'
+    :param filename: str path to write to, None for stdout
+    :param jobs: int worker processes and shards
+    :param keep_shards: bool leave the shards instead of concatenating them
+    :param compress: str 'gzip' or 'zstd', None to write them uncompressed
+    :return: dict the manifest
+    """
+    global _GRAPH, _SUBJECTS
+
+    if filename is None:
+        sharddir = tempfile.mkdtemp(prefix='dipper-shards-')
+    else:
+        sharddir = filename + '.d'
+        if os.path.exists(sharddir):
+            shutil.rmtree(sharddir)
+        os.makedirs(sharddir)
+    ext = SHARD_FORMATS[fmt]
+    if compress is not None:
+        ext += '.' + Compression.EXTENSIONS[compress]
+    tasks = [
+        (shard, fmt, compress,
+         os.path.join(sharddir, 'part-{:05d}.{}'.format(shard, ext)))
+        for shard in range(jobs)]
+
+    LOG.info("Writing %s in %i shards to %s", fmt, jobs, sharddir)
+    _SUBJECTS = [[] for _ in range(jobs)]
+    for subject in set(graph.subjects()):
+        _SUBJECTS[shard_of(subject, jobs)].append(subject)
+    _GRAPH = graph
+    try:
+        if 'fork' in multiprocessing.get_all_start_methods():
+            with multiprocessing.get_context('fork').Pool(jobs) as pool:
+                shards = pool.map(_write_shard, tasks)
+        else:
+            # workers could not see the graph, write the shards in turn
+            shards = [_write_shard(task) for task in tasks]
+    finally:
+        _GRAPH = None
+        _SUBJECTS = None
+
+    manifest = {
+        'format': fmt,
+        'compression': compress,
+        'triples': sum(shard['triples'] for shard in shards),
+        'shards': shards}
+
+    if keep_shards and filename is not None:
+        with open(os.path.join(sharddir, MANIFEST), 'w') as writer:
+            json.dump(manifest, writer, indent=1)
+        if os.path.exists(filename):
+            os.remove(filename)     # do not leave a stale single file beside them
+        return manifest
+
+    if filename is None:
+        _concatenate(sharddir, shards, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    else:
+        with open(filename + '.tmp', 'wb') as writer:
+            _concatenate(sharddir, shards, writer)
+        os.replace(filename + '.tmp', filename)
+    shutil.rmtree(sharddir)
+    return manifest
+
+
+def _concatenate(sharddir, shards, destination):
+    for shard in shards:
+        with open(os.path.join(sharddir, shard['file']), 'rb') as reader:
+            shutil.copyfileobj(reader, destination)
+
+
+def _rows(graph, fmt, subjects):
+    """
+    The encoded lines of the subjects' triples,
+    as rdflib's own serializers make them
+    """
+    if fmt == 'nt':
+        for subject in subjects:
+            for triple in graph.triples((subject, None, None)):
+                yield _nt_row(triple).encode('ascii', '_rdflib_nt_escape')
+    else:
+        for context in graph.contexts():
+            for subject in subjects:
+                for triple in context.triples((subject, None, None)):
+                    yield _nq_row(triple, context.identifier).encode('utf-8', 'replace')
+
+
+def _write_shard(task):
+    (shard, fmt, compress, path) = task
+    digest = hashlib.sha256()    # of the content, before any compression
+    count = 0
+    chunk = []
+    if compress is None:
+        writer = open(path, 'wb')
+    else:
+        writer = Compression.open_writer(path, compress, threads=1)
+    with writer:
+        for row in _rows(_GRAPH, fmt, _SUBJECTS[shard]):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_ROWS:
+                count += _flush(chunk, writer, digest)
+        count += _flush(chunk, writer, digest)
+    return {
+        'file': os.path.basename(path), 'triples': count,
+        'sha256': digest.hexdigest()}
+
+
+def _flush(chunk, writer, digest):
+    data = b''.join(chunk)
+    writer.write(data)
+    digest.update(data)
+    count = len(chunk)
+    chunk.clear()
+    return count
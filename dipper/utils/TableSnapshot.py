@@ -0,0 +1,111 @@
+'''
+    One binary snapshot of the yaml tables read at startup:
+    translationtable/*.yaml, dipper/curie_map.yaml and resources/test_ids.yaml
+
+    It is compiled on first use, recompiled when any of the tables it holds
+    changes (by mtime and size), and read once per process.
+    `python -m dipper.utils.TableSnapshot` compiles it ahead of time.
+'''
+import os
+import glob
+import pickle
+import logging
+import threading
+import yaml
+
+LOG = logging.getLogger(__name__)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+SNAPSHOT = os.path.join(ROOT, 'translationtable', '.compiled.pickle')
+TABLES = (
+    os.path.join(ROOT, 'translationtable', '*.yaml'),
+    os.path.join(ROOT, 'dipper', 'curie_map.yaml'),
+    os.path.join(ROOT, 'resources', 'test_ids.yaml'),
+)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_TABLES = None    # {path: (mtime_ns, size, pickled table)}, as in the snapshot
+_LOCK = threading.Lock()
+
+
+def load_yaml(path):
+    """
+    The content of a yaml file, as yaml.safe_load would give it,
+    from the snapshot where it is current there.
+    Each call returns its own copy, to change as the caller pleases.
+
+    :param path: str yaml file
+    """
+    global _TABLES
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _LOCK:
+        if _TABLES is None:
+            _TABLES = _read()
+        entry = _TABLES.get(path)
+        if entry is None or entry[:2] != stamp:
+            _TABLES = compile_tables(_TABLES, path)
+            entry = _TABLES[path]
+    return pickle.loads(entry[2])
+
+
+def compile_tables(tables=None, *extra):
+    """
+    Bring the snapshot up to date, parsing only the tables that changed
+
+    :param tables: dict the snapshot as it was read, by default from disk
+    :param extra: str paths of other yaml files to hold
+    :return: dict the snapshot as written
+    """
+    if tables is None:
+        tables = _read()
+    paths = set(extra) | set(tables)
+    for pattern in TABLES:
+        paths.update(glob.glob(pattern))
+
+    compiled = {}
+    changed = 0
+    for path in sorted(paths):
+        if not os.path.exists(path):
+            continue    # gone, so no longer held
+        stamp = _stamp(path)
+        entry = tables.get(path)
+        if entry is None or entry[:2] != stamp:
+            with open(path, 'r') as reader:
+                table = yaml.load(reader, Loader=YAML_LOADER)
+            entry = stamp + (pickle.dumps(table, pickle.HIGHEST_PROTOCOL),)
+            changed += 1
+        compiled[path] = entry
+
+    if changed or len(compiled) != len(tables):
+        LOG.info("Compiled %i of %i tables into %s", changed, len(compiled), SNAPSHOT)
+        tmpfile = '{}.{}.tmp'.format(SNAPSHOT, os.getpid())
+        try:
+            with open(tmpfile, 'wb') as writer:
+                pickle.dump(compiled, writer, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpfile, SNAPSHOT)
+        except OSError as err:
+            # e.g. installed read only; held for this process all the same
+            LOG.warning('Could not write %s: %s', SNAPSHOT, err)
+    return compiled
+
+
+def _read():
+    try:
+        with open(SNAPSHOT, 'rb') as reader:
+            return pickle.load(reader)
+    except FileNotFoundError:
+        return {}
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as err:
+        LOG.warning('Ignoring unreadable %s: %s', SNAPSHOT, err)
+        return {}
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    compile_tables()
@@ -0,0 +1,168 @@
+import os
+import gzip
+import logging
+import sqlite3
+from collections.abc import Mapping
+
+LOG = logging.getLogger(__name__)
+BATCH = 100000  # rows per insert
+INSERT = 'INSERT OR REPLACE INTO idmap VALUES (?, ?, ?)'
+
+
+class UniProtIdMap(Mapping):
+    """
+    UniProtKB accession to 1:1 gene id ('NCBIGene:...' or failing that 'ENSEMBL:...'),
+    read from a sqlite index of UniProt's idmapping_selected.tab.gz.
+
+    The index is built in one pass over the (10GB+) mapping file for all taxa,
+    so any subset of taxa, for any ingest, is served by the same index.
+    It records the sha256 of the file it was built from,
+    see open() for reusing it until the mapping file changes.
+    """
+
+    def __init__(self, indexfile, tax_ids=None):
+        """
+        :param indexfile: str path to an index made by build()
+        :param tax_ids: list of NCBITaxon numbers to restrict lookups to,
+            by default all
+        """
+        self.indexfile = indexfile
+        self.cxn = sqlite3.connect(indexfile)
+        self.tax_ids = None
+        where = ''
+        if tax_ids is not None:
+            self.tax_ids = tuple(sorted(set(int(tax) for tax in tax_ids)))
+            where = ' AND taxon IN ({})'.format(','.join('?' * len(self.tax_ids)))
+        self.lookup_sql = 'SELECT gene FROM idmap WHERE uniprot = ?' + where
+
+    @classmethod
+    def open(cls, mapfile, columns, digest, indexfile, tax_ids=None):
+        """
+        Open the index, first (re)building it if it was not made from this mapping file
+
+        :param mapfile: str path to idmapping_selected.tab.gz
+        :param columns: list of the mapping file's column names
+        :param digest: str hex sha256 of the mapping file
+        :param indexfile: str path to the index
+        :param tax_ids: list of NCBITaxon numbers to restrict lookups to
+        """
+        if cls.index_digest(indexfile) != digest:
+            cls.build(mapfile, columns, digest, indexfile)
+        return cls(indexfile, tax_ids)
+
+    @staticmethod
+    def index_digest(indexfile):
+        """
+        :return: str sha256 of the mapping file the index was built from,
+            None without a (complete) index
+        """
+        if not os.path.exists(indexfile):
+            return None
+        cxn = sqlite3.connect(indexfile)
+        try:
+            row = cxn.execute("SELECT value FROM meta WHERE key = 'sha256'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        finally:
+            cxn.close()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def build(mapfile, columns, digest, indexfile):
+        """
+        One pass over the mapping file, keeping the accessions
+        with a single EntrezGene or else a single Ensembl gene id.
+        The index is written aside and moved into place once complete.
+        """
+        LOG.info("Indexing UniProt id mappings in %s as %s", mapfile, indexfile)
+        uniprot_col = columns.index('UniProtKB-AC')
+        geneid_col = columns.index('GeneID (EntrezGene)')
+        taxon_col = columns.index('NCBI-taxon')
+        ensembl_col = columns.index('Ensembl')
+
+        tmpfile = indexfile + '.tmp'
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+        cxn = sqlite3.connect(tmpfile)
+        cxn.execute('PRAGMA journal_mode = OFF')
+        cxn.execute('PRAGMA synchronous = OFF')
+        cxn.execute(
+            'CREATE TABLE idmap ('
+            'uniprot TEXT PRIMARY KEY, taxon INTEGER, gene TEXT) WITHOUT ROWID')
+        cxn.execute(
+            'CREATE TABLE taxa ('
+            'taxon INTEGER PRIMARY KEY, mapped INTEGER, unmapped INTEGER)')
+        cxn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+
+        taxa = {}   # taxon: [mapped, unmapped]
+        rows = []
+        with gzip.open(mapfile, 'rt', newline='') as reader:
+            for line in reader:
+                row = line.rstrip('\r\n').split('\t')
+                try:
+                    taxon = int(row[taxon_col])
+                except (IndexError, ValueError):
+                    LOG.warning('Skipping malformed line: %s', line[:80])
+                    continue
+                counts = taxa.setdefault(taxon, [0, 0])
+                geneid = row[geneid_col].strip()
+                ensembl = row[ensembl_col].strip()
+                # neither empty nor a list
+                if geneid != '' and ';' not in geneid:
+                    gene = 'NCBIGene:' + geneid
+                elif ensembl != '' and ';' not in ensembl:
+                    gene = 'ENSEMBL:' + ensembl
+                else:
+                    counts[1] += 1
+                    continue
+                counts[0] += 1
+                rows.append((row[uniprot_col].strip(), taxon, gene))
+                if len(rows) >= BATCH:
+                    cxn.executemany(INSERT, rows)
+                    rows = []
+        cxn.executemany(INSERT, rows)
+        cxn.executemany(
+            'INSERT INTO taxa VALUES (?, ?, ?)',
+            ((taxon, mapped, unmapped) for (taxon, (mapped, unmapped)) in taxa.items()))
+        # last, this is what marks the index complete
+        cxn.execute("INSERT INTO meta VALUES ('sha256', ?)", (digest,))
+        cxn.commit()
+        cxn.close()
+        os.replace(tmpfile, indexfile)
+        LOG.info("Indexed UniProt id mappings for %i taxa", len(taxa))
+
+    def unmapped(self):
+        """
+        :return: int accessions (of the taxa) without a 1:1 gene id
+        """
+        return self._count('unmapped')
+
+    def close(self):
+        self.cxn.close()
+
+    def __getitem__(self, uniprot):
+        params = (uniprot,) if self.tax_ids is None else (uniprot,) + self.tax_ids
+        row = self.cxn.execute(self.lookup_sql, params).fetchone()
+        if row is None:
+            raise KeyError(uniprot)
+        return row[0]
+
+    def __iter__(self):
+        sql = 'SELECT uniprot FROM idmap'
+        params = ()
+        if self.tax_ids is not None:
+            sql += ' WHERE taxon IN ({})'.format(','.join('?' * len(self.tax_ids)))
+            params = self.tax_ids
+        for (uniprot,) in self.cxn.execute(sql, params):
+            yield uniprot
+
+    def __len__(self):
+        return self._count('mapped')
+
+    def _count(self, column):
+        sql = 'SELECT coalesce(sum({}), 0) FROM taxa'.format(column)
+        params = ()
+        if self.tax_ids is not None:
+            sql += ' WHERE taxon IN ({})'.format(','.join('?' * len(self.tax_ids)))
+            params = self.tax_ids
+        return self.cxn.execute(sql, params).fetchone()[0]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dipper.graph.RDFGraph import RDFGraph  # noqa: E402
+from dipper.graph.StreamedGraph import StreamedGraph  # noqa: E402
+from dipper.utils.GraphUtils import GraphUtils  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+LOG = logging.getLogger(__name__)
+
+
+def add_triples(graph, count):
+    """
+    Roughly the mix of triples a gene ingest makes:
+    a type, a label, a typed literal and a relation per subject
+    """
+    for num in range(count // 4):
+        gene = 'NCBIGene:' + str(num)
+        graph.addTriple(gene, 'rdf:type', 'SO:0000704')
+        graph.addTriple(gene, 'rdfs:label', 'gene ' + str(num), True)
+        graph.addTriple(gene, 'faldo:position', str(num * 100), True, 'xsd:integer')
+        graph.addTriple(gene, 'RO:0002162', 'NCBITaxon:9606')
+
+
+def main():
+    """
+    Time adding and writing triples with each graph backend
+    and report the peak memory (maxrss) of the process
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--graph', '-g', type=str, default='streamed_graph',
+        help='rdf_graph or streamed_graph')
+    parser.add_argument(
+        '--triples', '-n', type=int, default=1000000, help='number of triples')
+    parser.add_argument(
+        '--fmt', '-f', type=str, default='nt', help='output format')
+    parser.add_argument(
+        '--output', '-o', type=str, default=os.devnull, help='output file')
+    args = parser.parse_args()
+
+    if args.graph == 'rdf_graph':
+        graph = RDFGraph(True, ':MONARCH_bench')
+    else:
+        graph = StreamedGraph(True, ':MONARCH_bench', dedup=True)
+
+    start = time.perf_counter()
+    add_triples(graph, args.triples)
+    LOG.info("Added %d triples in %.1f sec", len(graph), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    GraphUtils.write(graph, args.fmt, args.output)
+    LOG.info("Wrote %s in %.1f sec", args.fmt, time.perf_counter() - start)
+
+    LOG.info(
+        "Peak memory: %d MB",
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024)
+
+
+if __name__ == "__main__":
+    main()
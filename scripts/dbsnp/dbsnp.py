@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import argparse
-import requests
 import xml.etree.ElementTree as ET
+from dipper.utils.DipperUtil import DipperUtil
 
 
 """
@@ -24,7 +24,6 @@ Output: tab delimited file with additional columns variant type, and observed al
 
 def main():
 
-    EFETCH_BASE = "http://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
     NS = '{http://www.ncbi.nlm.nih.gov/SNP/docsum}'
 
     parser = argparse.ArgumentParser(description='description')
@@ -48,13 +47,9 @@ def main():
     for snp_chunk in chunked_list:
         rs_list = [rs.split(' ')[2] for rs in snp_chunk]
 
-        params = {
-            'id': rs_list,
-            'report': 'xml',
-            'db': 'snp'
-        }
-        eutils_request = requests.get(EFETCH_BASE, params)
-        root = ET.fromstring(eutils_request.content)
+        # rate limited and cached, shared with dipper's other E-utilities users
+        (response,) = DipperUtil.eutils().efetch('snp', rs_list, report='xml')
+        root = ET.fromstring(response)
         for snp in snp_chunk:
             info = snp.split(' ')
             chromosome = info[0]
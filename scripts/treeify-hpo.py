@@ -1,22 +1,24 @@
-from dipper.graph.RDFGraph import RDFGraph
-from rdflib.namespace import RDFS
+from dipper.utils.OntologySnapshot import OntologySnapshot
+from rdflib.namespace import RDFS, OWL
 from dipper.utils.CurieUtil import CurieUtil
 from dipper import curie_map
-from rdflib import URIRef
+from rdflib import URIRef, Namespace
+from collections import defaultdict
 import copy
 import json
 from collections import OrderedDict
 
+OBOINOWL = Namespace("http://www.geneontology.org/formats/oboInOwl#")
+LAYPERSON = URIRef("http://purl.obolibrary.org/obo/hp.owl#layperson")
+
 def main():
 
-    hpo = RDFGraph()
+    # hp.owl is only downloaded and parsed again when it has changed
+    hpo = OntologySnapshot("http://purl.obolibrary.org/obo/hp.owl").extract(
+        'tree', get_hpo_lookup)
     root = "HP:0000118"
     hpo_terms = OrderedDict()
 
-    hpo.parse("http://purl.obolibrary.org/obo/hp.owl", format='xml')
-    hpo.bind_all_namespaces()
-    hpo.bind("oboInOwl", "http://www.geneontology.org/formats/oboInOwl#")
-
     tree = {}
     tree[root] = {}
     path = []
@@ -32,46 +34,55 @@ def main():
                 key, value['label'], "|".join(value['lay_person']), value['parents']
             ))
 
-def hpo_to_tree(cls, hpo_terms, hpo_graph, tree, path):
+def get_hpo_lookup(hpo_graph):
+    """
+    What hpo_to_tree() needs of hp.owl, keyed by curie
+    """
+    curie_util = CurieUtil(curie_map.get())
+
+    def to_curie(iri):
+        return curie_util.get_curie(iri).replace("OBO:HP_", "HP:")
+
+    lookup = {
+        'label': {},
+        'parents': defaultdict(int),
+        'children': defaultdict(list),
+        'lay_person': defaultdict(list)}
+    for (term, label) in hpo_graph.subject_objects(RDFS.label):
+        if isinstance(term, URIRef) and curie_util.get_curie(term) is not None:
+            lookup['label'][to_curie(term)] = str(label)
+    for (term, parent) in hpo_graph.subject_objects(RDFS.subClassOf):
+        if not isinstance(term, URIRef) or curie_util.get_curie(term) is None:
+            continue
+        lookup['parents'][to_curie(term)] += 1
+        if isinstance(parent, URIRef) and curie_util.get_curie(parent) is not None:
+            lookup['children'][to_curie(parent)].append(to_curie(term))
+    for axiom in hpo_graph.subjects(OBOINOWL.hasSynonymType, LAYPERSON):
+        for term in hpo_graph.objects(axiom, OWL.annotatedSource):
+            for synonym in hpo_graph.objects(axiom, OWL.annotatedTarget):
+                lookup['lay_person'][to_curie(term)].append(str(synonym))
+    return lookup
+
+
+def hpo_to_tree(cls, hpo_terms, hpo, tree, path):
     tree_path = copy.copy(path)
     tree_path.append(cls)
-    curie_util = CurieUtil(curie_map.get())
     if cls not in hpo_terms:
         hpo_terms[cls] = {
-            'label': hpo_graph.label(URIRef(curie_util.get_uri(cls)))
+            'label': hpo['label'].get(cls),
+            'parents': hpo['parents'].get(cls, 0),
+            'lay_person': hpo['lay_person'].get(cls, [])
         }
-        parents = hpo_graph.objects(URIRef(curie_util.get_uri(cls)), RDFS.subClassOf)
-        hpo_terms[cls]['parents'] = len(list(parents))
-
-        lay_person = get_lay_person(cls, hpo_graph)
-        hpo_terms[cls]["lay_person"] = lay_person
 
     # Traverse the tree to get to the input class
     position = tree[tree_path[0]]
     for term in tree_path[1:]:
         position = position[term]
 
-    for sub_class in hpo_graph.subjects(RDFS.subClassOf, URIRef(curie_util.get_uri(tree_path[-1]))):
-        curie = curie_util.get_curie(sub_class).replace("OBO:HP_", "HP:")
+    for curie in hpo['children'].get(tree_path[-1], []):
         position[curie] = {}
-        hpo_to_tree(curie, hpo_terms, hpo_graph, tree, tree_path)
-
-
-def get_lay_person(cls, hpo_graph):
-    lay_synonyms = []
-    lay_person_query = """
-        SELECT ?lp
-        WHERE {{
-            ?bnode owl:annotatedSource {0} .
-            ?bnode oboInOwl:hasSynonymType <http://purl.obolibrary.org/obo/hp.owl#layperson> .
-            ?bnode owl:annotatedTarget ?lp .
-        }}
-    """.format(cls)
-    query_result = hpo_graph.query(lay_person_query)
-    if len(list(query_result)) > 0:
-        for res in query_result:
-            lay_synonyms.append(str(res[0]))
-    return lay_synonyms
+        hpo_to_tree(curie, hpo_terms, hpo, tree, tree_path)
+
 
 if __name__ == "__main__":
     main()
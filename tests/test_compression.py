@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+import logging
+from unittest.mock import patch
+from rdflib import URIRef
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.models.Dataset import Dataset
+from dipper.sources.Source import Source
+from dipper.utils import Compression
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.graph = RDFGraph(True, 'test')
+        for num in range(100):
+            gene = 'NCBIGene:' + str(num)
+            self.graph.addTriple(gene, 'rdf:type', 'SO:0000704')
+            self.graph.addTriple(
+                gene, 'rdfs:label', 'gene ' + str(num), object_is_literal=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @patch.object(Compression, 'BLOCK_SIZE', 1000)
+    def test_parallel_gzip_members(self):
+        data = os.urandom(500).hex().encode() * 20
+        stream = io.BytesIO()
+        stream.close = lambda: None   # to look at it afterwards
+        with Compression.open_writer(stream, 'gzip', threads=3) as writer:
+            for start in range(0, len(data), 777):
+                writer.write(data[start:start + 777])
+        compressed = stream.getvalue()
+        self.assertGreater(compressed.count(b'\x1f\x8b\x08'), 10)   # members
+        self.assertEqual(gzip.decompress(compressed), data)
+
+    def _nt_lines(self):
+        stream = io.BytesIO()
+        self.graph.serialize(stream, format='nt')
+        return set(stream.getvalue().decode().splitlines()) - {''}
+
+    def test_write_gzip(self):
+        for jobs in (1, 3):     # serialized once, or in shards
+            filename = os.path.join(self.tmpdir, 'test{}.nt.gz'.format(jobs))
+            GraphUtils.write(self.graph, 'nt', filename, jobs=jobs, compress='gzip')
+            with gzip.open(filename, 'rt') as reader:
+                lines = set(reader.read().splitlines()) - {''}
+            self.assertEqual(lines, self._nt_lines())
+
+    def test_dataset_distribution(self):
+        dataset = Dataset(
+            'fakeingest', '20201001', 'fakeingest', 'title', 'http://fake.org',
+            ingest_logo='logo.png', distribution_type='nt.gz')
+        distribution = URIRef(
+            dataset.curie_map['MonarchArchive'] + '20201001/rdf/fakeingest.nt.gz')
+        graph = dataset.get_graph()
+        self.assertIn(
+            (distribution, URIRef('http://purl.org/dc/terms/downloadURL'),
+             URIRef(dataset.download_url)), graph)
+        self.assertTrue(dataset.download_url.endswith('/fakeingest.nt.gz'))
+        self.assertIn(
+            (distribution, URIRef('http://purl.org/dc/terms/format'),
+             URIRef('https://www.w3.org/TR/n-triples/')), graph)
+
+    def test_source_distribution(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        try:
+            source = Source(
+                name='hgnc', ingest_title='HGNC', ingest_url='https://example.org/',
+                ingest_logo='source-hgnc.png',
+                argv={'dest_fmt': 'nt', 'compress': 'gzip'})
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(source.dataset.download_url.endswith('/hgnc.nt.gz'))
+        self.assertEqual(source.outfile_name('nt'), 'out/hgnc.nt.gz')
+        self.assertEqual(Source.ARGV, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+from datetime import datetime, timezone
+from dipper.utils.ContentStore import ContentStore
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class ContentStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.rawdir = os.path.join(self.tmpdir, 'raw')
+        for name in ('NCBIGene', 'AnimalQTLdb'):
+            os.makedirs(os.path.join(self.rawdir, name))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _fetch(self, source, filename, content):
+        localfile = os.path.join(self.rawdir, source, filename)
+        with open(localfile, 'w') as writer:
+            writer.write(content)
+        return localfile
+
+    def test_identical_files_stored_once(self):
+        ncbi = ContentStore(os.path.join(self.rawdir, 'NCBIGene'))
+        aqtl = ContentStore(os.path.join(self.rawdir, 'AnimalQTLdb'))
+        first = self._fetch('NCBIGene', 'gene_info.gz', 'gene info')
+        second = self._fetch('AnimalQTLdb', 'gene_info.gz', 'gene info')
+        stamp = datetime(2019, 8, 1, tzinfo=timezone.utc)
+        digest = ncbi.add(first, 'https://example.org/gene_info.gz', '"abc"', stamp)
+        self.assertEqual(aqtl.add(second), digest)
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertTrue(os.path.samefile(first, ncbi.object_path(digest)))
+        self.assertEqual(os.listdir(os.path.join(self.rawdir, '.sha256')), [digest[:2]])
+
+        reloaded = ContentStore(os.path.join(self.rawdir, 'NCBIGene'))
+        entry = reloaded.entry(first)
+        self.assertEqual(entry['url'], 'https://example.org/gene_info.gz')
+        self.assertEqual(entry['size'], len('gene info'))
+        self.assertEqual(entry['last_modified'], stamp.isoformat())
+        self.assertEqual(reloaded.etag(first), '"abc"')
+
+    def test_digest_from_manifest_until_changed(self):
+        store = ContentStore(os.path.join(self.rawdir, 'NCBIGene'))
+        localfile = self._fetch('NCBIGene', 'gene_info.gz', 'gene info')
+        digest = store.add(localfile)
+        store.file_sha256 = None   # must not be needed
+        self.assertEqual(store.digest(localfile), digest)
+        del store.file_sha256
+
+        # a re-download replaces the link, leaving the stored object intact
+        os.remove(localfile)
+        self._fetch('NCBIGene', 'gene_info.gz', 'new gene info')
+        self.assertNotEqual(store.digest(localfile), digest)
+        self.assertIsNone(store.etag(localfile))
+        with open(store.object_path(digest)) as reader:
+            self.assertEqual(reader.read(), 'gene info')
+
+    def test_superseded_objects_removed(self):
+        ncbi = ContentStore(os.path.join(self.rawdir, 'NCBIGene'))
+        aqtl = ContentStore(os.path.join(self.rawdir, 'AnimalQTLdb'))
+        localfile = self._fetch('NCBIGene', 'gene_info.gz', 'gene info')
+        old = ncbi.add(localfile)
+        aqtl.add(self._fetch('AnimalQTLdb', 'gene_info.gz', 'gene info'))
+        os.remove(localfile)
+        new = ncbi.add(self._fetch('NCBIGene', 'gene_info.gz', 'new gene info'))
+        # still linked from AnimalQTLdb
+        self.assertTrue(os.path.exists(ncbi.object_path(old)))
+
+        os.remove(localfile)
+        newer = ncbi.add(self._fetch('NCBIGene', 'gene_info.gz', 'newer gene info'))
+        self.assertFalse(os.path.exists(ncbi.object_path(new)))
+        self.assertTrue(os.path.exists(ncbi.object_path(newer)))
+
+        os.remove(os.path.join(self.rawdir, 'AnimalQTLdb', 'gene_info.gz'))
+        self.assertEqual(ncbi.gc(), len('gene info'))
+        self.assertFalse(os.path.exists(ncbi.object_path(old)))
+        self.assertEqual(
+            os.listdir(os.path.join(self.rawdir, '.sha256')), [newer[:2]])
+
+    def test_outside_rawdir(self):
+        store = ContentStore(os.path.join(self.rawdir, 'NCBIGene'))
+        localfile = self._fetch('AnimalQTLdb', 'gene_info.gz', 'gene info')
+        self.assertIsNone(store.add(localfile))
+        self.assertEqual(store.manifest, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
+import io
+import gzip
+import os
+import json
+import shutil
+import tempfile
 import unittest
 import logging
+import urllib.parse
+from unittest.mock import patch
 from dipper.sources.CTD import CTD
 from dipper.graph.RDFGraph import RDFGraph
 from dipper.utils.TestUtils import TestUtils
+from dipper.utils.ContentStore import ContentStore
 
 logging.basicConfig()
 logging.getLogger().setLevel(logging.WARNING)
@@ -61,5 +70,109 @@ class CTDTestCase(unittest.TestCase):
             triples, self.source.graph))
 
 
+class CTDBatchQueryTestCase(unittest.TestCase):
+    """
+    Batch queries are fetched concurrently and resumed where they failed
+    """
+
+    def setUp(self):
+        self.source = CTD('rdf_graph', True)
+        self.source.rawdir = tempfile.mkdtemp()
+        self.source.store = ContentStore(self.source.rawdir)
+        with open(os.path.join(
+                self.source.rawdir, 'CTD_chemicals_diseases.tsv.gz'), 'w') as writer:
+            writer.write('chemicals and diseases')
+        self.queried = []
+        self.failing = True
+
+    def tearDown(self):
+        shutil.rmtree(self.source.rawdir)
+
+    def _urlopen(self, req):
+        pubs = urllib.parse.parse_qs(req.data.decode())['inputTerms'][0].split('|')
+        self.queried.append(pubs)
+        if '3' in pubs and self.failing:
+            raise IOError('connection reset')
+        rows = ''.join(
+            '{}\tdisease\tMESH:D0{}\t\ttherapeutic\tchem\tD1\t\t\t\n'.format(pub, pub)
+            for pub in pubs)
+        return io.BytesIO(('# Input\tDiseaseName\n' + rows).encode())
+
+    @patch('dipper.sources.CTD.BATCH_SIZE', 2)
+    def test_resume(self):
+        pubs = {'1', '2', '3', '4', '5'}
+        with patch('urllib.request.urlopen', self._urlopen):
+            self.assertRaises(
+                IOError, self.source._fetch_disambiguating_assoc, pubs)
+        self.assertEqual(len(self.queried), 3)
+
+        self.queried = []
+        self.failing = False
+        with patch('urllib.request.urlopen', self._urlopen):
+            file_path = self.source._fetch_disambiguating_assoc(pubs)
+        self.assertEqual(self.queried, [['3', '4']])
+        with open(file_path) as reader:
+            lines = reader.readlines()
+        self.assertEqual(lines[0], '# Input\tDiseaseName\n')
+        self.assertEqual([line.split('\t')[0] for line in lines[1:]], [
+            '1', '2', '3', '4', '5'])
+
+        # a new chemical-disease file starts over
+        with open(os.path.join(
+                self.source.rawdir, 'CTD_chemicals_diseases.tsv.gz'), 'a') as writer:
+            writer.write(' and more')
+        self.queried = []
+        with patch('urllib.request.urlopen', self._urlopen):
+            self.source._fetch_disambiguating_assoc(pubs)
+        self.assertEqual(len(self.queried), 3)
+
+    @patch('dipper.sources.CTD.BATCH_SIZE', 2)
+    def test_stale_batches_removed(self):
+        batchdir = os.path.join(self.source.rawdir, 'batchquery')
+        self.failing = False
+        with patch('urllib.request.urlopen', self._urlopen):
+            self.source._fetch_disambiguating_assoc({'1', '2', '3'})
+            self.assertEqual(len(os.listdir(batchdir)), 3)
+            self.source._fetch_disambiguating_assoc({'1', '2', '4'})
+        with open(os.path.join(batchdir, 'MANIFEST.json')) as reader:
+            names = [batch['file'] for batch in json.load(reader)['batches']]
+        self.assertEqual(
+            sorted(os.listdir(batchdir)), sorted(names + ['MANIFEST.json']))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.source.rawdir, 'pub_list.txt')))
+
+    @patch('dipper.sources.CTD.BATCH_SIZE', 2)
+    def test_limited_run_keeps_batches(self):
+        batchdir = os.path.join(self.source.rawdir, 'batchquery')
+        self.failing = False
+        with patch('urllib.request.urlopen', self._urlopen):
+            full_path = self.source._fetch_disambiguating_assoc({'1', '2', '3', '4'})
+            full_batches = sorted(os.listdir(batchdir))
+            limited_path = self.source._fetch_disambiguating_assoc(
+                {'1', '3'}, limited=True)
+        self.assertNotEqual(limited_path, full_path)
+        with open(full_path) as reader:
+            self.assertEqual(len(reader.readlines()), 5)
+        with open(limited_path) as reader:
+            self.assertEqual(len(reader.readlines()), 3)
+        self.assertTrue(set(full_batches) < set(os.listdir(batchdir)))
+
+        # and a full run again only has to ask about what it had asked before
+        self.queried = []
+        with patch('urllib.request.urlopen', self._urlopen):
+            self.source._fetch_disambiguating_assoc({'1', '2', '3', '4'})
+        self.assertEqual(self.queried, [])
+        self.assertEqual(sorted(os.listdir(batchdir)), full_batches)
+
+    def test_short_row(self):
+        with gzip.open(os.path.join(
+                self.source.rawdir, 'CTD_chemicals_diseases.tsv.gz'), 'wt') as writer:
+            writer.write('# Report created: Tue Oct 01 2019\n')
+            writer.write('chem\tC1\t\tdisease\tMESH:D1\ttherapeutic\n')
+        self.assertRaisesRegex(
+            Exception, 'row length', self.source._parse_ctd_file,
+            None, 'chemical_disease_associations')
+
+
 if __name__ == '__main__':
     unittest.main()
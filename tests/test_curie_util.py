@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.utils.CurieUtil import CurieUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class CurieUtilTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.curie_map = {
+            '': 'https://monarchinitiative.org/',
+            'OBO': 'http://purl.obolibrary.org/obo/',
+            'HP': 'http://purl.obolibrary.org/obo/HP_',
+            'MONARCH': 'https://monarchinitiative.org/MONARCH_',
+        }
+        self.cu = CurieUtil(self.curie_map, cache_size=3)
+
+    def tearDown(self):
+        self.cu = None
+
+    def test_get_uri_is_memoized(self):
+        for _ in range(3):
+            self.assertEqual(
+                self.cu.get_uri('HP:0000118'),
+                'http://purl.obolibrary.org/obo/HP_0000118')
+        self.assertEqual(
+            self.cu.cache_info(), {'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 3})
+        self.assertIsNone(self.cu.get_uri('NOPE:1'))
+        self.assertIsNone(self.cu.get_uri(None))
+
+    def test_cache_is_bounded(self):
+        for num in range(10):
+            self.cu.get_uri('HP:{}'.format(num))
+        self.assertLessEqual(self.cu.cache_info()['size'], 3)
+        self.assertEqual(self.cu.get_uri('HP:1'), 'http://purl.obolibrary.org/obo/HP_1')
+
+    def test_cache_keeps_recently_used(self):
+        for curie in ('HP:1', 'HP:2', 'HP:3', 'HP:1', 'HP:4'):
+            self.cu.get_uri(curie)
+        self.assertEqual(list(self.cu.uri_cache), ['HP:3', 'HP:1', 'HP:4'])
+        self.cu.get_uri('HP:1')
+        self.assertEqual(self.cu.cache_info()['hits'], 2)
+
+    def test_get_curie_longest_match(self):
+        self.assertEqual(
+            self.cu.get_curie('http://purl.obolibrary.org/obo/HP_0000118'),
+            'HP:0000118')
+        self.assertEqual(
+            self.cu.get_curie('http://purl.obolibrary.org/obo/GO_0008150'),
+            'OBO:GO_0008150')
+        self.assertEqual(
+            self.cu.get_curie('https://monarchinitiative.org/MONARCH_b1'),
+            'MONARCH:b1')
+        self.assertEqual(
+            self.cu.get_curie('https://monarchinitiative.org/.well-known/genid/b1'),
+            ':.well-known/genid/b1')
+        self.assertIsNone(self.cu.get_curie('http://example.org/x'))
+
+    def test_get_curies(self):
+        self.assertEqual(
+            self.cu.get_curies([
+                'http://purl.obolibrary.org/obo/HP_1', 'http://example.org/x']),
+            ['HP:1', None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import logging
+from email.utils import formatdate
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from dipper.utils.DownloadManager import DownloadManager
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+CONTENT = b''.join(b'line %d\n' % num for num in range(1000))
+LAST_MODIFIED = 1500000000
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """
+    Serves CONTENT, honoring Range and If-Modified-Since;
+    the first response of each run is cut short when `flaky` is set
+    """
+    flaky = False
+    requests = []
+
+    def do_GET(self):
+        RangeHandler.requests.append(dict(self.headers))
+        if self.headers.get('If-Modified-Since') == formatdate(
+                LAST_MODIFIED, usegmt=True):
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get('Range') is not None:
+            start = int(self.headers['Range'][len('bytes='):-1])
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = CONTENT[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', formatdate(LAST_MODIFIED, usegmt=True))
+        self.end_headers()
+        if RangeHandler.flaky:
+            RangeHandler.flaky = False
+            body = body[:100]
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloadManagerTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), RangeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:{}/file.txt'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.local = os.path.join(self.tmpdir, 'file.txt')
+        self.downloader = DownloadManager(backoff=0, timeout=10)
+        RangeHandler.requests = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_download_then_not_modified(self):
+        result = self.downloader.download(self.url, self.local)
+        self.assertEqual(result['status'], 'downloaded')
+        with open(self.local, 'rb') as fetched:
+            self.assertEqual(fetched.read(), CONTENT)
+        self.assertEqual(os.stat(self.local).st_mtime, LAST_MODIFIED)
+
+        result = self.downloader.download(self.url, self.local)
+        self.assertEqual(result['status'], 'not_modified')
+        result = self.downloader.download(self.url, self.local, is_dl_forced=True)
+        self.assertEqual(result['status'], 'downloaded')
+
+    def test_resume_partial_download(self):
+        RangeHandler.flaky = True
+        result = self.downloader.download(self.url, self.local)
+        self.assertEqual(result['status'], 'downloaded')
+        with open(self.local, 'rb') as fetched:
+            self.assertEqual(fetched.read(), CONTENT)
+        self.assertEqual(RangeHandler.requests[-1]['Range'], 'bytes=100-')
+        self.assertFalse(os.path.exists(self.local + '.part'))
+
+    def test_unreachable_host_fails(self):
+        result = self.downloader.download('http://127.0.0.1:1/file.txt', self.local)
+        self.assertEqual(result['status'], 'failed')
+        self.assertFalse(os.path.exists(self.local))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import shutil
+import tempfile
+import unittest
+import logging
+from unittest.mock import patch
+from dipper.utils import DipperUtil as dipper_util
+from dipper.utils.DipperUtil import DipperUtil, EUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class EUtilsTestCase(unittest.TestCase):
+    """
+    E-utilities requests are batched and asked only once
+    """
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.posts = []
+        self.session = patch.object(dipper_util.SESSION, 'post', self._post)
+        self.session.start()
+        self.client = patch.object(
+            dipper_util, '_EUTILS', EUtils(self.cachedir, api_key='key'))
+        self.client.start()
+
+    def tearDown(self):
+        self.client.stop()
+        self.session.stop()
+        shutil.rmtree(self.cachedir)
+
+    def _post(self, url, data):
+        self.posts.append((url.split('/')[-1], data))
+        if url.endswith('esearch.fcgi'):
+            hits = set()
+            for term in data['term'].split(' OR '):
+                hits.update({
+                    '1264[Gene ID]': ['3838'], '12819[Gene ID]': ['3838'],
+                    '4[Gene ID]': ['1', '2'],
+                    'Homo sapiens': ['9606']}.get(term, []))
+            return FakeResponse({'esearchresult': {
+                'count': str(len(hits)), 'idlist': sorted(hits)}})
+        genes = {'3838': [1264, 12819], '1': [4], '2': [4, 5]}
+        return FakeResponse({'result': {
+            uid: {'uid': uid, 'homologenedatalist': [
+                {'geneid': gene} for gene in genes.get(uid, [])]}
+            for uid in data['id'].split(',')}})
+
+    def test_homologene(self):
+        homologs = DipperUtil.get_homologene_by_gene_nums([1264, 12819, 4])
+        self.assertEqual(sorted(homologs), [1264, 12819])
+        self.assertEqual(homologs[1264]['uid'], '3838')
+        self.assertIs(homologs[1264], homologs[12819])
+        self.assertEqual(
+            [util for (util, data) in self.posts], ['esearch.fcgi', 'esummary.fcgi'])
+        self.assertEqual(
+            self.posts[0][1]['term'],
+            '1264[Gene ID] OR 12819[Gene ID] OR 4[Gene ID]')
+        self.assertEqual(self.posts[0][1]['api_key'], 'key')
+
+        # answered from the cache
+        self.posts = []
+        self.assertEqual(
+            DipperUtil.get_homologene_by_gene_nums([1264, 12819, 4]), homologs)
+        self.assertEqual(self.posts, [])
+
+    def test_taxon_labels(self):
+        self.assertEqual(
+            DipperUtil.get_taxon_nums_by_labels(['Homo sapiens', 'Gallus']),
+            {'Homo sapiens': '9606'})
+        self.assertIsNone(DipperUtil.get_ncbi_taxon_num_by_label('Gallus'))
+
+    def test_api_key_from_config(self):
+        conf = {'keys': {'ncbi': 'ncbikey'}}
+        with patch.object(dipper_util, '_EUTILS', None), \
+                patch('dipper.config.get_config', return_value=conf):
+            self.assertEqual(DipperUtil.eutils().params['api_key'], 'ncbikey')
+
+    @patch.object(EUtils, 'BATCH', 2)
+    def test_batches(self):
+        summaries = dipper_util._EUTILS.esummary('gene', range(5))
+        self.assertEqual(sorted(summaries), ['0', '1', '2', '3', '4'])
+        self.assertEqual(
+            [data['id'] for (util, data) in self.posts], ['0,1', '2,3', '4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
+import io
 import unittest
 import logging
 import rdflib
 from dipper.utils import GraphUtils
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
 
 logging.basicConfig(level=logging.WARNING)
 LOG = logging.getLogger(__name__)
@@ -61,5 +64,59 @@ class GraphUtilsTestCase(unittest.TestCase):
             "didn't get correct count for 'name' (graph 2)")
 
 
+class PredicateCountsTestCase(unittest.TestCase):
+    """
+    Our graphs count their predicates as triples come and go
+    """
+
+    def _add(self, graph):
+        graph.addTriple('NCBIGene:1', 'RO:0002434', 'NCBIGene:2')
+        graph.addTriple('NCBIGene:1', 'RO:0002434', 'NCBIGene:2')
+        graph.addTriple('NCBIGene:1', 'RO:0002434', 'NCBIGene:3')
+        graph.addTriple('NCBIGene:1', 'rdfs:label', 'A1BG', object_is_literal=True)
+
+    def test_rdf_graph(self):
+        graph = RDFGraph()
+        self._add(graph)
+        interacts = graph._getnode('RO:0002434')
+        label = graph._getnode('rdfs:label')
+        self.assertEqual(graph.predicate_counts, {interacts: 2, label: 1})
+        self.assertEqual(
+            GraphUtils.GraphUtils.count_predicates(graph),
+            GraphUtils.GraphUtils.count_predicates(rdflib.Graph() + graph))
+
+        other = RDFGraph()
+        other.addTriple('NCBIGene:4', 'RO:0002434', 'NCBIGene:5')
+        graph += other
+        self.assertEqual(graph.predicate_counts[interacts], 3)
+        graph.remove((None, interacts, None))
+        graph.remove((None, label, None))
+        self.assertEqual(graph.predicate_counts, {})
+        self.assertEqual(GraphUtils.GraphUtils.get_properties_from_graph(graph), set())
+
+    def test_rdf_graph_ntriples(self):
+        graph = RDFGraph()
+        self._add(graph)
+        graph.add_ntriples(io.BytesIO(
+            b'<http://x.org/a> <http://x.org/p> <http://x.org/b> .\n'
+            b'<http://x.org/a> <http://x.org/p> <http://x.org/b> .\n'))
+        self.assertEqual(graph.predicate_counts[rdflib.URIRef('http://x.org/p')], 1)
+        self.assertEqual(len(graph), 4)
+
+    def test_streamed_graph(self):
+        graph = StreamedGraph()
+        self._add(graph)
+        graph.add_ntriples([
+            '<http://x.org/a> <http://x.org/p> <http://x.org/b> .\n'])
+        self.assertEqual(
+            GraphUtils.GraphUtils.get_properties_from_graph(graph), {
+                'http://purl.obolibrary.org/obo/RO_0002434',
+                'http://www.w3.org/2000/01/rdf-schema#label',
+                'http://x.org/p'})
+        self.assertEqual(
+            graph.predicate_counts['http://purl.obolibrary.org/obo/RO_0002434'], 3)
+        graph.close()
+
+
 if __name__ == '__main__':
     unittest.main()
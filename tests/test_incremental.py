@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+from dipper.sources.Source import Source
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class IncrementalTestCase(unittest.TestCase):
+    """
+    A source's output is reused only while its inputs are unchanged
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.source = Source(
+            name='hgnc', ingest_title='HGNC', ingest_url='https://example.org/',
+            ingest_logo='source-hgnc.png')
+        self.rawfile = '/'.join((self.source.rawdir, 'hgnc.txt'))
+        with open(self.rawfile, 'w') as writer:
+            writer.write('HGNC:5\tA1BG\n')
+        self.params = {'limit': None}
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self):
+        self.source.graph.addTriple('HGNC:5', 'rdfs:label', 'A1BG', True)
+        self.source.write('turtle')
+        self.source.save_inputs('turtle', self.params)
+
+    def test_unchanged_inputs(self):
+        self.assertFalse(self.source.inputs_unchanged('turtle', self.params))
+        self._write()
+        self.assertTrue(self.source.inputs_unchanged('turtle', self.params))
+        self.assertEqual(self.source.triple_count, 1)
+        self.assertIn(self.rawfile, self.source.input_digests())
+
+    def test_changed_inputs(self):
+        self._write()
+        self.assertFalse(self.source.inputs_unchanged('nt', self.params))
+        self.assertFalse(self.source.inputs_unchanged('turtle', {'limit': 10}))
+
+        with open(self.rawfile, 'a') as writer:
+            writer.write('HGNC:37133\tA1BG-AS1\n')
+        self.assertFalse(self.source.inputs_unchanged('turtle', self.params))
+
+    def test_missing_output(self):
+        self._write()
+        os.remove(self.source.outfile_name('turtle'))
+        self.assertFalse(self.source.inputs_unchanged('turtle', self.params))
+
+    def test_kept_shards(self):
+        self.source.ARGV = {'write_jobs': 2, 'keep_shards': True}
+        self.source.graph.addTriple('HGNC:5', 'rdfs:label', 'A1BG', True)
+        self.source.write('nt')
+        self.source.save_inputs('nt', self.params)
+        self.assertFalse(os.path.exists(self.source.outfile_name('nt')))
+        self.assertTrue(self.source.inputs_unchanged('nt', self.params))
+
+        shutil.rmtree(self.source.outfile_name('nt') + '.d')
+        self.assertFalse(self.source.inputs_unchanged('nt', self.params))
+
+    def test_write_forgets_inputs(self):
+        self._write()
+        self.source.write('turtle')
+        self.assertFalse(os.path.exists(self.source.inputsfile))
+
+
+if __name__ == '__main__':
+    unittest.main()
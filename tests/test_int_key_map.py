@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from unittest.mock import patch
+from dipper.utils.IntKeyMap import IntKeyMap, IntKeys, ZdbKeys
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class IntKeyMapTestCase(unittest.TestCase):
+
+    @patch.object(IntKeyMap, 'MIN_PENDING', 4)   # merge along the way
+    def test_behaves_like_dict(self):
+        idmap = IntKeyMap(codec=IntKeys('MGI:'))
+        expect = {}
+        for num in (97, 3, 1000, 12, 3, 5, 50000, 7, 97, 8):
+            key = 'MGI:' + str(num)
+            idmap[key] = expect[key] = 'label ' + str(num * 2)
+        for key in ('MGI:1000', 'MGI:8'):
+            del idmap[key]
+            del expect[key]
+        # keys or values it can not pack still work
+        for (key, value) in (
+                ('_:b0', 'bnode'), ('MGI:007', 'leading zero'),
+                ('MGI:12', None), ('MGI:99', 'µ-crystallin'), (42, 'int')):
+            idmap[key] = expect[key] = value
+
+        self.assertEqual(dict(idmap), expect)
+        self.assertEqual(len(idmap), len(expect))
+        self.assertNotIn('MGI:1000', idmap)
+        self.assertIsNone(idmap.get('MGI:8'))
+        self.assertIsNone(idmap['MGI:12'])
+        self.assertRaises(KeyError, idmap.__delitem__, 'MGI:8')
+
+        idmap['MGI:12'] = 'again'
+        self.assertEqual(idmap['MGI:12'], 'again')
+        self.assertEqual(
+            list(idmap)[:4], ['MGI:3', 'MGI:5', 'MGI:7', 'MGI:12'])
+
+    def test_zdb_keys(self):
+        codec = ZdbKeys()
+        for key in (
+                'ZFIN:ZDB-GENE-980526-166', 'ZFIN:ZDB-ALT-000000-0',
+                'ZFIN:ZDB-FISH-150901-99999999'):
+            self.assertEqual(codec.decode(codec.encode(key)), key)
+        for key in (
+                'ZFIN:ZDB-GENE-980526-0166', 'ZDB-GENE-980526-166',
+                '_:ZFINZDBGENE', 'ZFIN:ZDB-FISH-150901-999999999'):
+            self.assertIsNone(codec.encode(key))
+        self.assertLess(
+            codec.encode('ZFIN:ZDB-GENE-980526-166'),
+            codec.encode('ZFIN:ZDB-GENE-990415-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
+import io
 import unittest
 import logging
 import os
+from rdflib import Graph
+from rdflib.compare import isomorphic
 from tests.test_source import SourceTestCase
 from dipper.sources.MGI import MGI
 from dipper.utils.TestUtils import TestUtils
@@ -52,5 +55,46 @@ class EvidenceTestCase(unittest.TestCase):
             expected_triples, self.mgi.graph))
 
 
+class ParallelViewsTestCase(unittest.TestCase):
+    """
+    Views processed in worker processes give the same graph
+    as when processed in turn
+    """
+
+    views = ['_view_a', '_view_b', '_view_c']
+
+    def _make_view(self, mgi, num):
+        def view(limit):
+            for key, mgiid in sorted(mgi.idhash['marker'].items()):
+                mgi.graph.addTriple(mgiid, 'rdfs:label', 'marker ' + key + num, True)
+                mgi.graph.addTriple(mgiid, 'rdf:type', 'SO:0000704')
+        return view
+
+    def _parse(self, graph_type, jobs):
+        mgi = MGI(graph_type, True)
+        mgi.idhash['marker'] = {str(key): 'MGI:' + str(key) for key in range(50)}
+        for num, view in enumerate(self.views):
+            setattr(mgi, view, self._make_view(mgi, str(num)))
+        if jobs > 1:
+            mgi._process_views_in_parallel(self.views, None, jobs)
+        else:
+            for view in self.views:
+                mgi._process_view(view, None)
+        return mgi.graph
+
+    def test_same_graph(self):
+        expected = self._parse('rdf_graph', 1)
+        self.assertEqual(len(expected), 200)
+        graph = self._parse('rdf_graph', 2)
+        self.assertTrue(isomorphic(expected, graph))
+
+        graph = self._parse('streamed_graph', 2)
+        output = io.BytesIO()
+        graph.serialize(output, format='nt')
+        self.assertTrue(isomorphic(
+            expected, Graph().parse(data=output.getvalue().decode(), format='nt')))
+        graph.close()
+
+
 if __name__ == '__main__':
     unittest.main()
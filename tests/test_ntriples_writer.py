@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import logging
+from dipper.graph.NTriplesWriter import NTriplesWriter
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class NTriplesWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.statements = [
+            '<http://x.org/s{}> <http://x.org/p> "{}" .'.format(num % 7, num)
+            for num in range(50)]
+
+    def tearDown(self):
+        pass
+
+    def test_spool_keeps_order_and_duplicates(self):
+        writer = NTriplesWriter(buffer_size=8)
+        for statement in self.statements + self.statements[:5]:
+            writer.add(statement)
+        self.assertEqual(len(writer), 55)
+        output = io.BytesIO()
+        writer.write_to(output, 'nt')
+        self.assertEqual(
+            output.getvalue().decode().splitlines(),
+            self.statements + self.statements[:5])
+        writer.close()
+
+    def test_dedup_merges_sorted_runs(self):
+        writer = NTriplesWriter(buffer_size=8, dedup=True)
+        writer.MAX_RUNS = 3  # force intermediate merges
+        for statement in self.statements + list(reversed(self.statements)):
+            writer.add(statement)
+        output = io.BytesIO()
+        self.assertEqual(writer.write_to(output, 'turtle'), 50)
+        self.assertEqual(len(writer), 50)
+        self.assertEqual(
+            output.getvalue().decode().splitlines(), sorted(self.statements))
+        writer.close()
+
+    def test_nquads_adds_graph(self):
+        writer = NTriplesWriter()
+        writer.add(self.statements[0])
+        output = io.BytesIO()
+        writer.write_to(output, 'nquads', 'http://x.org/graph')
+        self.assertEqual(
+            output.getvalue().decode(),
+            '<http://x.org/s0> <http://x.org/p> "0" <http://x.org/graph> .\n')
+        self.assertRaises(ValueError, writer.write_to, output, 'nquads')
+        self.assertRaises(ValueError, writer.write_to, output, 'rdfxml')
+        writer.close()
+
+    def test_file_handle(self):
+        handle = io.StringIO()
+        writer = NTriplesWriter(handle, buffer_size=100)
+        for statement in self.statements:
+            writer.add(statement)
+        self.assertEqual(handle.getvalue(), '')
+        writer.flush()
+        self.assertEqual(handle.getvalue().splitlines(), self.statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+from unittest.mock import patch
+from rdflib import URIRef
+from rdflib.namespace import RDF, OWL
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.GraphUtils import GraphUtils, _declared_properties
+from dipper.utils.OntologySnapshot import OntologySnapshot
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+URL = 'http://purl.obolibrary.org/obo/ro.ttl'
+RO = 'http://purl.obolibrary.org/obo/RO_'
+ONTOLOGY = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+<http://purl.obolibrary.org/obo/RO_0002434> a owl:ObjectProperty .
+<http://purl.obolibrary.org/obo/RO_0002558> a owl:ObjectProperty .
+<http://purl.obolibrary.org/obo/IAO_0000115> a owl:AnnotationProperty .
+"""
+SO = 'http://purl.obolibrary.org/obo/SO_'
+SO_TERMS = """
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix SO: <http://purl.obolibrary.org/obo/SO_> .
+SO:0001564 rdfs:label "gene_variant" .
+SO:0001580 rdfs:subClassOf SO:0001564 ; rdfs:label "coding_sequence_variant" .
+SO:0001583 rdfs:subClassOf SO:0001580, [ a owl:Restriction ] ;
+    rdfs:label "missense_variant" .
+SO:0001627 rdfs:subClassOf SO:0001564 ; rdfs:label "intron_variant", "intronic" .
+"""
+
+
+class FakeDownloader:
+
+    def __init__(self):
+        self.content = ONTOLOGY
+        self.requests = 0
+
+    def download(self, url, localfile, etag=None):
+        self.requests += 1
+        if os.path.exists(localfile) and etag == str(hash(self.content)):
+            return {'status': 'not_modified', 'etag': etag, 'last_modified': None}
+        with open(localfile, 'w') as writer:
+            writer.write(self.content)
+        return {
+            'status': 'downloaded', 'etag': str(hash(self.content)),
+            'last_modified': None}
+
+
+class OntologySnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.snapdir = os.path.join(self.tmpdir, 'ontologies')
+        self.downloader = FakeDownloader()
+        patcher = patch.object(OntologySnapshot, 'downloader', self.downloader)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.extractions = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _properties(self, ontology_graph):
+        self.extractions += 1
+        return _declared_properties(ontology_graph)
+
+    def _extract(self, offline=False):
+        snapshot = OntologySnapshot(URL, self.snapdir, offline)
+        return snapshot.extract('properties', self._properties)
+
+    def test_extracted_once_per_version(self):
+        declared = self._extract()
+        self.assertEqual(declared['ObjectProperty'], [RO + '0002434', RO + '0002558'])
+        self.assertEqual(declared['DatatypeProperty'], [])
+        self.assertEqual(self._extract(), declared)
+        self.assertEqual((self.downloader.requests, self.extractions), (2, 1))
+
+        self.downloader.content += '<{}0002200> a owl:ObjectProperty .\n'.format(RO)
+        self.assertEqual(len(self._extract()['ObjectProperty']), 3)
+        self.assertEqual(self.extractions, 2)
+
+    def test_offline(self):
+        self.assertIsNone(self._extract(offline=True))
+        declared = self._extract()
+        os.remove(os.path.join(self.snapdir, 'ro.ttl'))
+        self.assertEqual(self._extract(offline=True), declared)
+        self.assertEqual((self.downloader.requests, self.extractions), (1, 1))
+
+    def test_terms(self):
+        self.downloader.content = SO_TERMS
+        terms = OntologySnapshot(URL, self.snapdir).terms()
+        self.assertEqual(terms.label(SO + '0001583'), 'missense_variant')
+        self.assertIsNone(terms.label(SO + '0001627'))   # two labels
+        self.assertEqual(terms.parents[SO + '0001583'], [SO + '0001580'])
+        self.assertEqual(
+            terms.ancestors(SO + '0001583'), {SO + '0001580', SO + '0001564'})
+        self.assertTrue(terms.is_subclass_of(SO + '0001583', SO + '0001564'))
+        self.assertFalse(terms.is_subclass_of(SO + '0001564', SO + '0001564'))
+        self.assertEqual(
+            terms.children(SO + '0001564'), [SO + '0001580', SO + '0001627'])
+        self.assertEqual(
+            OntologySnapshot(URL, self.snapdir, offline=True).terms().parents,
+            terms.parents)
+
+    @patch.object(GraphUtils, 'property_types', {
+        'ObjectProperty': {URIRef(RO + '0002434')},
+        'AnnotationProperty': set(), 'DatatypeProperty': set()})
+    def test_add_property_axioms(self):
+        graph = RDFGraph()
+        graph.addTriple('NCBIGene:1', 'RO:0002434', 'NCBIGene:2')
+        properties = GraphUtils.get_properties_from_graph(graph)
+        GraphUtils.add_property_axioms(graph, properties)
+        self.assertIn(
+            (URIRef(RO + '0002434'), RDF['type'], OWL['ObjectProperty']), graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+import logging
+from unittest.mock import patch
+from dipper.sources.PostgreSQLSource import PostgreSQLSource
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+# run the live test against a throwaway database named by libpq's environment, e.g.
+# PGHOST=localhost PGDATABASE=scratch PGUSER=postgres python -m pytest tests/...
+PG_CXN = {
+    'host': os.environ.get('PGHOST'), 'database': os.environ.get('PGDATABASE'),
+    'port': os.environ.get('PGPORT'), 'user': os.environ.get('PGUSER'),
+    'password': os.environ.get('PGPASSWORD')}
+
+
+class FakeCursor:
+
+    def __init__(self, con):
+        self.con = con
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql, file):
+        self.con.statements.append(sql)
+        if 'fail' in sql:
+            file.write(b'partial\n')
+            raise IOError('connection lost')
+        file.write(b'id\tlabel\n')
+        for num in range(3):
+            file.write('{}\trow {}\n'.format(num, num).encode())
+        self.rowcount = 3
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+
+    def __init__(self, minconn, maxconn, **cxn):
+        self.free = [FakeConnection() for num in range(maxconn)]
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        with self.lock:
+            return self.free.pop()   # IndexError past maxconn
+
+    def putconn(self, con):
+        with self.lock:
+            self.free.append(con)
+
+    def closeall(self):
+        self.free = []
+
+
+class PostgreSQLSourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source = PostgreSQLSource.__new__(PostgreSQLSource)  # no __init__
+        self.source.rawdir = tempfile.mkdtemp()
+        self.cxn = {
+            'host': 'localhost', 'database': 'test', 'port': 5432,
+            'user': 'test', 'password': 'test'}
+
+    def tearDown(self):
+        shutil.rmtree(self.source.rawdir)
+
+    def _read(self, name, opener=open):
+        with opener(os.path.join(self.source.rawdir, name), 'rt') as reader:
+            return reader.read()
+
+    @patch('psycopg2.pool.ThreadedConnectionPool', FakePool)
+    def test_concurrent_queries(self):
+        queries = {'q' + str(num): 'SELECT {}'.format(num) for num in range(6)}
+        counts = self.source.fetch_queries_from_pgdb(
+            queries, self.cxn, jobs=3, limit=10, compress=True)
+        self.assertEqual(counts, {qname: 3 for qname in queries})
+        self.assertEqual(
+            self._read('q0.gz', gzip.open), 'id\tlabel\n0\trow 0\n1\trow 1\n2\trow 2\n')
+        self.assertEqual(
+            sorted(os.listdir(self.source.rawdir)),
+            sorted(qname + '.gz' for qname in queries))
+
+    def test_failed_copy_keeps_old_file(self):
+        con = FakeConnection()
+        with open(os.path.join(self.source.rawdir, 'table'), 'w') as writer:
+            writer.write('old\n')
+        self.assertRaises(
+            IOError, self.source.fetch_query_from_pgdb, 'table', 'SELECT fail', con, None)
+        self.assertEqual(self._read('table'), 'old\n')
+        self.assertEqual(os.listdir(self.source.rawdir), ['table'])
+
+        self.assertEqual(
+            self.source.fetch_query_from_pgdb('table', 'SELECT 1', con, None, 2), 3)
+        self.assertIn('SELECT * FROM ( SELECT 1 ) x LIMIT 2', con.statements[-1])
+        self.assertTrue(self._read('table').startswith('id\tlabel\n'))
+
+    @unittest.skipUnless(PG_CXN['database'], 'needs a scratch database, set PGDATABASE')
+    def test_live_copy(self):
+        queries = {
+            'series': 'SELECT n, n * n AS square FROM generate_series(1, 1000) n',
+            'empty': 'SELECT 1 AS one WHERE false'}
+        counts = self.source.fetch_queries_from_pgdb(queries, PG_CXN, jobs=2)
+        self.assertEqual(counts, {'series': 1000, 'empty': 0})
+        self.assertEqual(len(self._read('series').splitlines()), 1001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dipper.utils.ResponseCache import ResponseCache, RateLimiter
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+
+    def test_get_put(self):
+        cache = ResponseCache(self.cachedir)
+        self.assertIsNone(cache.get('100100'))
+        entry = {'entry': {'mimNumber': 100100, 'status': 'live'}}
+        cache.put('100100', entry)
+        cache.put('Homo sapiens/9606', [1, 2])
+        self.assertEqual(ResponseCache(self.cachedir).get('100100'), entry)
+        self.assertEqual(cache.get('Homo sapiens/9606'), [1, 2])
+        self.assertEqual(len(os.listdir(self.cachedir)), 2)
+
+        with open(cache.path('100100'), 'w') as writer:
+            writer.write('{"entry": ')
+        self.assertIsNone(cache.get('100100'))
+
+    def test_expiry(self):
+        cache = ResponseCache(self.cachedir, ttl=60)
+        cache.put('100100', {})
+        self.assertEqual(cache.get('100100'), {})
+        stale = time.time() - 61
+        os.utime(cache.path('100100'), (stale, stale))
+        self.assertIsNone(cache.get('100100'))
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=50, burst=5)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda num: limiter.wait(), range(15)))
+        # the first 5 at once, then 10 more at 50 a second
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 
+import os
+import shutil
+import tempfile
 import unittest
 import logging
+from functools import partial
+from unittest.mock import patch
 from dipper.sources.SGD import SGD
+from dipper.utils.OntologySnapshot import OntologySnapshot
 from dipper.utils.TestUtils import TestUtils
 from dipper.graph.RDFGraph import RDFGraph
 
@@ -10,6 +16,8 @@ logging.basicConfig()
 logging.getLogger().setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+APO_TERMS = 'tests/resources/sgd/apo.owl.terms.json'
+
 
 class SGDTestCase(unittest.TestCase):
     def setUp(self):
@@ -31,10 +39,17 @@ class SGDTestCase(unittest.TestCase):
             'SGDID': 'S000007268',
             'Strain Background': 'Other'}
 
-        return
+        # the APO terms extracted from apo.owl, without going to the network
+        self.snapdir = tempfile.mkdtemp()
+        shutil.copy(APO_TERMS, self.snapdir)
+        self.snapshot = patch(
+            'dipper.sources.SGD.OntologySnapshot',
+            partial(OntologySnapshot, snapdir=self.snapdir, offline=True))
+        self.snapshot.start()
 
     def tearDown(self):
-        return
+        self.snapshot.stop()
+        shutil.rmtree(self.snapdir)
 
     def testSGDParser(self):
         sgd = SGD('rdf_graph', True)
@@ -67,3 +82,7 @@ class SGDTestCase(unittest.TestCase):
         """.format(description)
         # test exact contents of graph
         self.assertTrue(self.test_util.test_graph_equality(triples, sgd.graph))
+
+    def test_without_apo(self):
+        os.remove(os.path.join(self.snapdir, os.path.basename(APO_TERMS)))
+        self.assertRaises(ValueError, SGD, 'rdf_graph', True)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import logging
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils import ShardedWriter
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class ShardedWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.graph = RDFGraph(True, 'test')
+        for num in range(200):
+            gene = 'NCBIGene:' + str(num)
+            self.graph.addTriple(gene, 'rdf:type', 'SO:0000704')
+            self.graph.addTriple(
+                gene, 'rdfs:label', 'gène ' + str(num), object_is_literal=True)
+            self.graph.addTriple(gene, 'RO:0002162', '_:taxon' + str(num % 3))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _serialized(self, fmt):
+        stream = io.BytesIO()
+        self.graph.serialize(stream, format=fmt)
+        return set(stream.getvalue().decode().splitlines()) - {''}
+
+    def test_same_lines_as_rdflib(self):
+        for fmt in ('nt', 'nquads'):
+            filename = os.path.join(self.tmpdir, 'test.' + fmt)
+            GraphUtils.write(self.graph, fmt, filename, jobs=3)
+            with open(filename, 'r') as reader:
+                lines = reader.read().splitlines()
+            self.assertEqual(len(lines), 600)
+            self.assertEqual(set(lines), self._serialized(fmt))
+            self.assertFalse(os.path.exists(filename + '.d'))
+
+    def test_keep_shards(self):
+        filename = os.path.join(self.tmpdir, 'test.nt')
+        GraphUtils.write(self.graph, 'nt', filename, jobs=4, keep_shards=True)
+        self.assertFalse(os.path.exists(filename))
+        with open(os.path.join(filename + '.d', ShardedWriter.MANIFEST)) as reader:
+            manifest = json.load(reader)
+        self.assertEqual(manifest['triples'], 600)
+        self.assertEqual(len(manifest['shards']), 4)
+        subjects = set()
+        for shard in manifest['shards']:
+            with open(os.path.join(filename + '.d', shard['file'])) as reader:
+                lines = reader.read().splitlines()
+            self.assertEqual(len(lines), shard['triples'])
+            shard_subjects = {line.split(' ')[0] for line in lines}
+            # all of a subject's triples are in the one shard
+            self.assertFalse(subjects & shard_subjects)
+            subjects |= shard_subjects
+        self.assertEqual(len(subjects), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
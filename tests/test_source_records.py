@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.sources.Source import Source
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class SourceRecordsTestCase(unittest.TestCase):
+    """
+    Column accessors built from a source's `files[key]['columns']`
+    """
+
+    def setUp(self):
+        self.source = Source.__new__(Source)   # skip __init__'s side effects
+        self.source.files = {
+            'genes': {'columns': ['gene_id', 'gene_label', 'taxon']}}
+
+    def tearDown(self):
+        self.source = None
+
+    def test_column_getter(self):
+        get_fields = self.source.column_getter('genes', fields=('taxon', 'gene_id'))
+        self.assertEqual(get_fields(['a', 'b', 'c']), ('c', 'a'))
+        get_field = self.source.column_getter('genes', fields=('gene_label',))
+        self.assertEqual(get_field(['a', 'b', 'c']), ('b',))
+
+    def test_column_getter_follows_received_header(self):
+        get_fields = self.source.column_getter(
+            'genes', ['taxon', 'extra', 'gene_label', 'gene_id'], ('gene_id', 'taxon'))
+        self.assertEqual(get_fields(['c', 'x', 'b', 'a']), ('a', 'c'))
+        self.assertRaises(
+            AssertionError, self.source.column_getter, 'genes', ['gene_id'])
+
+    def test_read_records(self):
+        rows = iter([['gene_id', 'gene_label', 'taxon'], ['a', 'b', 'c']])
+        records = list(self.source.read_records('genes', rows))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].gene_label, 'b')
+        self.assertEqual(records[0].taxon, 'c')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import sys
+import subprocess
+import unittest
+import logging
+from dipper import source_registry
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+HEAVY = ('pandas', 'ontobio', 'intermine', 'bs4', 'SPARQLWrapper', 'psycopg2', 'pysftp')
+
+
+class SourceRegistryTestCase(unittest.TestCase):
+
+    def test_names(self):
+        sources = source_registry.sources()
+        # by ingest name, lower cased class name, and the odd alias
+        for (name, clsname) in (
+                ('hpoa', 'HPOAnnotations'), ('go', 'GeneOntology'),
+                ('geneontology', 'GeneOntology'), ('stringdb', 'StringDB'),
+                ('string', 'StringDB'), ('ebi', 'EBIGene2Phen'), ('eom', 'EOM')):
+            self.assertEqual(sources[name], clsname)
+        for clsname in source_registry.BASES + tuple(source_registry.EXCLUDED):
+            self.assertNotIn(clsname, sources.values())
+        self.assertEqual(source_registry.ingest_names()['GeneOntology'], 'go')
+
+    def test_imports_only_the_source(self):
+        script = (
+            'import sys\n'
+            'from dipper import source_registry\n'
+            'source_registry.get_class("GO")\n'
+            'print(" ".join(sorted(sys.modules)))\n')
+        modules = subprocess.run(
+            [sys.executable, '-c', script], stdout=subprocess.PIPE, check=True
+        ).stdout.decode().split()
+        self.assertIn('dipper.sources.GeneOntology', modules)
+        for module in ('dipper.sources.ZFIN', 'dipper.sources.WormBase') + HEAVY:
+            self.assertNotIn(module, modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import logging
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.models.Dataset import Dataset
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class StreamedGraphTestCase(unittest.TestCase):
+    """
+    A StreamedGraph should produce the same triples an RDFGraph would
+    """
+
+    triples = [
+        ('MONARCH:a', 'rdf:type', 'owl:Class', None, None),
+        ('MONARCH:a', 'rdfs:label', 'a "quoted"\nlabel', None, None),
+        ('MONARCH:a', 'rdfs:label', 'literal:with colon', True, None),
+        ('MONARCH:a', 'rdfs:seeAlso', 'https://example.org/x', None, None),
+        ('MONARCH:a', 'RO:0002200', 'HP:0000001', False, None),
+        ('MONARCH:a', 'MONARCH:count', 42, True, None),
+        ('MONARCH:a', 'MONARCH:score', '0.5', True, 'xsd:float'),
+        ('_:b1', 'rdf:type', 'owl:Class', None, None),
+        ('MONARCH:a', 'RO:0002200', '_:b1', False, None),
+        ('MONARCH:a', 'rdf:type', 'owl:Class', None, None),   # duplicate
+    ]
+
+    def setUp(self):
+        self.rdfgraph = RDFGraph(True, ':MONARCH_test')
+
+    def tearDown(self):
+        self.rdfgraph = None
+
+    def _load(self, graph):
+        for (sub, pred, obj, is_literal, literal_type) in self.triples:
+            graph.addTriple(sub, pred, obj, is_literal, literal_type)
+
+    def _parse(self, graph, fmt='nt'):
+        output = io.BytesIO()
+        graph.serialize(output, format=fmt)
+        return Graph().parse(data=output.getvalue().decode(), format=fmt)
+
+    def test_same_triples_as_rdfgraph(self):
+        for skized in (True, False):
+            self.rdfgraph = RDFGraph(skized, ':MONARCH_test')
+            self._load(self.rdfgraph)
+            expected = self._parse(self.rdfgraph)
+            with StreamedGraph(skized, ':MONARCH_test', dedup=True) as graph:
+                self._load(graph)
+                self.assertTrue(isomorphic(expected, self._parse(graph)))
+                self.assertTrue(isomorphic(expected, self._parse(graph, 'turtle')))
+                self.assertEqual(len(graph), len(expected))
+
+    def test_close(self):
+        graph = StreamedGraph(True, ':MONARCH_test', buffer_size=2)
+        self._load(graph)
+        graph.close()
+        self.assertEqual(len(graph), len(self.triples))
+        self.assertRaises(ValueError, graph.serialize, io.BytesIO())
+
+    def test_dataset_metadata(self):
+        dataset = Dataset(
+            'test', '201908', 'test', 'Test', 'https://example.org/',
+            ingest_logo='source-test.png', graph_type='streamed_graph')
+        self.assertGreater(len(dataset.get_graph()), 0)
+        graph = StreamedGraph(True, ':MONARCH_test')
+        self._load(graph)
+        graph += dataset.get_graph()
+        self.assertEqual(
+            len(graph), len(self.triples) + len(dataset.get_graph()))
+        self.assertEqual(
+            len(self._parse(graph)),
+            len(self._parse(dataset.get_graph())) + len(self.triples) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -76,3 +76,33 @@ ENSEMBL:ENSG00000001626 RO:0002434 ENSEMBL:ENSG00000004059 .
         dataframe = pd.DataFrame(data=self.test_set_2, columns=self.columns)
         string_db._process_protein_links(dataframe, self.protein_list, '9606')
         self.assertEqual(len(string_db.graph), 0)
+
+
+class StringProteinLinksTestCase(unittest.TestCase):
+    """
+    protein links mapped to genes without going to Ensembl
+    """
+
+    def test_links_to_genes(self):
+        string_db = StringDB('rdf_graph', True)
+        string_db.graph = RDFGraph(True)
+        prot_map = {
+            'ENSP00000000233': ['NCBIGene:381'],
+            'ENSP00000003084': ['NCBIGene:1080', 'NCBIGene:100'],
+            'ENSP00000005257': ['NCBIGene:5901']}
+        dataframe = pd.DataFrame(data=[
+            ['9606.ENSP00000000233', '9606.ENSP00000003084', 800],
+            ['9606.ENSP00000005257', '9606.ENSP00000000233', 900],
+            ['9606.ENSP00000005257', '9606.ENSP00000003084', 700],  # too low
+            ['9606.ENSP00000000233', '9606.ENSP00000006101', 950],  # unmapped
+        ], columns=['protein1', 'protein2', 'combined_score'])
+
+        filtered = string_db._process_protein_links(dataframe, prot_map, '9606')
+        self.assertEqual(filtered, 1)
+        # oriented by protein id, whichever way round STRING lists them
+        triples = """
+NCBIGene:1080 RO:0002434 NCBIGene:381 .
+NCBIGene:100 RO:0002434 NCBIGene:381 .
+NCBIGene:5901 RO:0002434 NCBIGene:381 .
+        """
+        self.assertTrue(TestUtils().test_graph_equality(triples, string_db.graph))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import logging
+from unittest.mock import patch
+import yaml
+from dipper.utils import TableSnapshot
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class TableSnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.snapshot = os.path.join(self.tmpdir, '.compiled.pickle')
+        for (name, table) in (
+                ('GLOBAL_TERMS', {'gene': 'SO:0000704', 'has taxon': 'RO:0002162'}),
+                ('sgd', {'classical genetics': 'classical genetics'})):
+            self._write(name, table)
+        patchers = (
+            patch.object(TableSnapshot, 'SNAPSHOT', self.snapshot),
+            patch.object(TableSnapshot, 'TABLES', (
+                os.path.join(self.tmpdir, '*.yaml'),)),
+            patch.object(TableSnapshot, '_TABLES', None))
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, table):
+        path = os.path.join(self.tmpdir, name + '.yaml')
+        with open(path, 'w') as writer:
+            yaml.safe_dump(table, writer)
+        return path
+
+    def test_load_yaml(self):
+        path = os.path.join(self.tmpdir, 'GLOBAL_TERMS.yaml')
+        with open(path) as reader:
+            expect = yaml.safe_load(reader)
+        table = TableSnapshot.load_yaml(path)
+        self.assertEqual(table, expect)
+        self.assertTrue(os.path.exists(self.snapshot))
+        # every table was compiled at once
+        self.assertEqual(len(TableSnapshot._TABLES), 2)
+
+        table['gene'] = 'changed'     # callers get their own copy
+        self.assertEqual(TableSnapshot.load_yaml(path), expect)
+
+        # a new process reads the snapshot without parsing the tables
+        with patch.object(TableSnapshot, '_TABLES', None), \
+                patch.object(yaml, 'load', side_effect=AssertionError):
+            self.assertEqual(TableSnapshot.load_yaml(path), expect)
+
+    def test_recompiled_when_changed(self):
+        path = os.path.join(self.tmpdir, 'sgd.yaml')
+        TableSnapshot.load_yaml(path)
+        time.sleep(0.01)
+        self._write('sgd', {'classical genetics': 'forward genetics'})
+        with patch.object(TableSnapshot, '_TABLES', None):
+            self.assertEqual(
+                TableSnapshot.load_yaml(path),
+                {'classical genetics': 'forward genetics'})
+
+        other = self._write('zfin_test_ids', {'gene': ['ZFIN:ZDB-GENE-000112-47']})
+        self.assertEqual(TableSnapshot.load_yaml(other)['gene'][0][:4], 'ZFIN')
+        os.remove(other)
+        TableSnapshot.compile_tables()
+        self.assertEqual(len(TableSnapshot._read()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+import logging
+from dipper.utils.UniProtIdMap import UniProtIdMap
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+COLUMNS = [
+    'UniProtKB-AC', 'UniProtKB-ID', 'GeneID (EntrezGene)', 'NCBI-taxon', 'Ensembl']
+ROWS = [
+    ['P31946', '1433B_HUMAN', '7529', '9606', 'ENSG00000166913'],
+    ['Q9CQV8', '1433B_MOUSE', '54401', '10090', 'ENSMUSG00000018326'],
+    ['Q5XJ10', '1433B_DANRE', '', '7955', 'ENSDARG00000008735'],
+    ['P62258', '1433E_HUMAN', '7531; 100', '9606', ''],
+    ['P0CG48', 'UBC_HUMAN', '7316', '9606', 'ENSG00000150991'],
+    ['P0DP23', 'CALM1_HUMAN', '', '9606', 'ENSG00000198668; ENSG00000143933'],
+]
+
+
+class UniProtIdMapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.mapfile = os.path.join(self.tmpdir, 'idmapping_selected.tab.gz')
+        self.indexfile = os.path.join(self.tmpdir, 'idmapping_selected.sqlite')
+        with gzip.open(self.mapfile, 'wt') as writer:
+            for row in ROWS:
+                writer.write('\t'.join(row) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_taxon_subsets(self):
+        idmap = UniProtIdMap.open(
+            self.mapfile, COLUMNS, 'abc', self.indexfile, ['9606', '7955'])
+        self.assertEqual(idmap['P31946'], 'NCBIGene:7529')
+        self.assertEqual(idmap.get('Q5XJ10'), 'ENSEMBL:ENSDARG00000008735')
+        self.assertNotIn('Q9CQV8', idmap)     # mouse
+        self.assertNotIn('P62258', idmap)     # no 1:1 gene
+        self.assertEqual(len(idmap), 3)
+        self.assertEqual(idmap.unmapped(), 2)
+        self.assertEqual(sorted(idmap), ['P0CG48', 'P31946', 'Q5XJ10'])
+
+        everything = UniProtIdMap(self.indexfile)
+        self.assertEqual(everything['Q9CQV8'], 'NCBIGene:54401')
+        self.assertEqual(len(everything), 4)
+
+    def test_rebuilt_when_mapping_file_changes(self):
+        self.assertIsNone(UniProtIdMap.index_digest(self.indexfile))
+        UniProtIdMap.open(self.mapfile, COLUMNS, 'abc', self.indexfile).close()
+        self.assertEqual(UniProtIdMap.index_digest(self.indexfile), 'abc')
+
+        with gzip.open(self.mapfile, 'wt') as writer:
+            writer.write('\t'.join(ROWS[0]) + '\n')
+        idmap = UniProtIdMap.open(self.mapfile, COLUMNS, 'abc', self.indexfile)
+        self.assertEqual(len(idmap), 4)   # same digest, index reused
+        idmap = UniProtIdMap.open(self.mapfile, COLUMNS, 'def', self.indexfile)
+        self.assertEqual(len(idmap), 1)
+        self.assertFalse(os.path.exists(self.indexfile + '.tmp'))
+
+
+if __name__ == '__main__':
+    unittest.main()